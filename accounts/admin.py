@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, EmailVerificationToken
+from .models import User, EmailVerificationToken, OutboundEmail
 
 class UserAdmin(BaseUserAdmin):
     ordering = ("email",)
@@ -19,3 +19,12 @@ class UserAdmin(BaseUserAdmin):
 
 admin.site.register(User, UserAdmin)
 admin.site.register(EmailVerificationToken)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("to_email", "subject", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to_email", "subject")
+    # pending bodies hold generated passwords and sign-in links
+    exclude = ("body",)
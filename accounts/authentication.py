@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# Everything the permission classes and views read off request.user. Other
+# fields (password, last_login, ...) stay deferred and load on first access,
+# and save() on such an instance only writes the loaded fields.
+CACHED_USER_FIELDS = [
+    "id", "email", "full_name", "role", "employee_id", "department",
+    "supervisor_id", "is_verified", "is_active", "is_staff", "is_superuser",
+]
+
+# claims put in access tokens by RoleClaimsTokenObtainPairSerializer
+TOKEN_USER_CLAIMS = {"role": "role", "email": "email", "name": "full_name", "sup": "supervisor_id"}
+
+
+def user_cache():
+    return caches[getattr(settings, "AUTH_USER_CACHE", "auth_users")]
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_users(user_ids):
+    """Call after queryset.update()/bulk_update() on users, which send no signals."""
+    user_cache().delete_many([user_cache_key(i) for i in user_ids])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _drop_cached_user(sender, instance, **kwargs):
+    user_cache().delete(user_cache_key(instance.pk))
+
+
+def _user_from_values(values: dict) -> User:
+    # from_db expects values in concrete field order
+    names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+    return User.from_db("default", names, [values[n] for n in names])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from the CACHES[AUTH_USER_CACHE]
+    alias (AUTH_USER_CACHE_TTL seconds) instead of a primary-key lookup on
+    every request. Entries are dropped whenever the user row is saved or
+    deleted. That only reaches every worker if the alias is a shared backend,
+    so the TTL defaults to 0 (no caching) unless AUTH_USER_CACHE_BACKEND is set.
+
+    With JWT_TRUST_ROLE_CLAIMS on, a cache miss is served from the token's own
+    role/supervisor claims without touching the database; role changes then
+    take effect when the access token expires.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        ttl = int(getattr(settings, "AUTH_USER_CACHE_TTL", 60) or 0)
+        key = user_cache_key(user_id)
+        values = user_cache().get(key) if ttl else None
+
+        if values is None and getattr(settings, "JWT_TRUST_ROLE_CLAIMS", False) and "role" in validated_token:
+            values = {"id": user_id, "is_active": True}
+            for claim, field in TOKEN_USER_CLAIMS.items():
+                values[field] = validated_token.get(claim)
+            return _user_from_values(values)
+
+        if values is None:
+            values = User.objects.filter(id=user_id).values(*CACHED_USER_FIELDS).first()
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            if ttl:
+                user_cache().set(key, values, ttl)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not values["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return _user_from_values(values)
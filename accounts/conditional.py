@@ -0,0 +1,55 @@
+"""
+Conditional GET for list endpoints.
+
+@conditional_get(scopes) wraps an APIView.get. scopes(request, *args, **kwargs)
+returns the querysets whose rows make up the payload; each costs one
+aggregate query (row count, max id, max updated_at) instead of building the
+response. The ETag hashes those with the user and full path, so a matching
+If-None-Match is answered with 304 before the view runs.
+
+Rows changed with queryset.update() or save(update_fields=...) must also set
+updated_at, or the ETag will not move.
+"""
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from rest_framework.response import Response
+
+
+def scope_version(qs) -> str:
+    agg = {"n": Count("pk"), "m": Max("pk")}
+    if any(f.name == "updated_at" for f in qs.model._meta.concrete_fields):
+        agg["u"] = Max("updated_at")
+    row = qs.order_by().aggregate(**agg)
+    return ":".join(str(row[k]) for k in sorted(row))
+
+
+def make_etag(request, scopes) -> str:
+    parts = [request.get_full_path(), str(request.user.pk)] + [scope_version(qs) for qs in scopes]
+    return '"%s"' % hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:24]
+
+
+def _matches(header: str, etag: str) -> bool:
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def conditional_get(scopes):
+    def decorator(get):
+        @wraps(get)
+        def wrapper(self, request, *args, **kwargs):
+            etag = make_etag(request, scopes(request, *args, **kwargs))
+            if _matches(request.headers.get("If-None-Match", ""), etag):
+                resp = Response(status=304)
+            else:
+                resp = get(self, request, *args, **kwargs)
+                if resp.status_code != 200:
+                    return resp
+            resp["ETag"] = etag
+            resp["Cache-Control"] = "private, no-cache"
+            return resp
+        return wrapper
+    return decorator
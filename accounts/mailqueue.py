@@ -0,0 +1,123 @@
+"""
+Outbound mail queue.
+
+Views call queue_email(), which only inserts an OutboundEmail row. The
+`send_queued_email` management command drains the table: each batch reuses a
+single backend connection, failed sends are retried with exponential backoff
+and given up after EMAIL_QUEUE_MAX_ATTEMPTS.
+
+A batch is claimed in one short transaction that moves its rows'
+next_attempt_at EMAIL_QUEUE_LEASE_SECONDS ahead; no lock is held while
+talking to SMTP, and each row's outcome is saved as soon as it is known. If
+the worker dies mid-batch, the rows it had not finished become due again
+when the lease runs out, and the ones already sent stay SENT.
+
+Bodies carry generated passwords and sign-in links, so they are blanked
+once a row is SENT or FAILED; the rows themselves go with the
+outbound_emails retention policy.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+def queue_email(subject: str, message: str, to_email: str) -> OutboundEmail:
+    return OutboundEmail.objects.create(to_email=to_email, subject=subject, body=message)
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = float(getattr(settings, "EMAIL_QUEUE_BACKOFF_SECONDS", 30) or 30)
+    cap = float(getattr(settings, "EMAIL_QUEUE_BACKOFF_MAX_SECONDS", 3600) or 3600)
+    return timedelta(seconds=min(cap, base * (2 ** max(attempts - 1, 0))))
+
+
+def _claim(batch_size: int) -> list:
+    lease = timedelta(seconds=float(getattr(settings, "EMAIL_QUEUE_LEASE_SECONDS", 600) or 600))
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status="PENDING", next_attempt_at__lte=timezone.now())
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if batch:
+            OutboundEmail.objects.filter(id__in=[m.id for m in batch]).update(
+                next_attempt_at=timezone.now() + lease,
+            )
+    return batch
+
+
+def deliver_pending(batch_size: int = 50) -> dict:
+    """
+    Send one batch of due emails over one connection.
+
+    Returns {"sent", "retry", "failed", "seconds"} for this batch.
+    """
+    max_attempts = int(getattr(settings, "EMAIL_QUEUE_MAX_ATTEMPTS", 5) or 5)
+    stats = {"sent": 0, "retry": 0, "failed": 0, "seconds": 0.0}
+    started = time.monotonic()
+
+    batch = _claim(batch_size)
+    if not batch:
+        return stats
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # nothing can go out this round; count it against every row
+        for m in batch:
+            _mark_failed_attempt(m, e, max_attempts, stats)
+        stats["seconds"] = time.monotonic() - started
+        return stats
+
+    try:
+        for m in batch:
+            msg = EmailMessage(m.subject, m.body, settings.DEFAULT_FROM_EMAIL, [m.to_email], connection=connection)
+            try:
+                msg.send()
+            except Exception as e:
+                _mark_failed_attempt(m, e, max_attempts, stats)
+                continue
+            m.status = "SENT"
+            m.attempts += 1
+            m.sent_at = timezone.now()
+            m.last_error = ""
+            m.body = ""
+            m.save(update_fields=["status", "attempts", "sent_at", "last_error", "body"])
+            stats["sent"] += 1
+    finally:
+        connection.close()
+
+    stats["seconds"] = time.monotonic() - started
+    return stats
+
+
+def _mark_failed_attempt(m: OutboundEmail, error, max_attempts: int, stats: dict):
+    m.attempts += 1
+    m.last_error = str(error)[:2000]
+    if m.attempts >= max_attempts:
+        m.status = "FAILED"
+        m.body = ""
+        stats["failed"] += 1
+    else:
+        m.next_attempt_at = timezone.now() + _backoff(m.attempts)
+        stats["retry"] += 1
+    m.save(update_fields=["status", "attempts", "last_error", "next_attempt_at", "body"])
+
+
+def queue_stats() -> dict:
+    counts = {s: 0 for s, _ in OutboundEmail.STATUS_CHOICES}
+    for row in OutboundEmail.objects.values("status").annotate(c=Count("id")):
+        counts[row["status"]] = row["c"]
+    oldest = OutboundEmail.objects.filter(status="PENDING").aggregate(m=Min("created_at"))["m"]
+    return {
+        "counts": counts,
+        "oldest_pending_age_s": (timezone.now() - oldest).total_seconds() if oldest else None,
+    }
@@ -0,0 +1,80 @@
+import csv
+import os
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import User
+
+# same columns as the bundled "Interns Tracking Sheet"
+SHEET_HEADER = [
+    "No of Interns", "Intern Name", "E-mail", "ID Info", "Role", "Start Date", "Duration of Internship",
+    "Learning Skill (Internship)", "Status", "Previous Skills", "Working On Project", "Progress (1st months)",
+    "Knowledge Gained", "Progress Rating", "Environment (Review By The Interns)",
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def write_sheet(path: Path, rows: int, supervisors: int = 5):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(SHEET_HEADER)
+        w.writerow([""] * 13 + ["☆☆☆☆☆", ""])
+        for n in range(1, rows + 1):
+            w.writerow([
+                n, f"Bench Intern {n}", f"bench.intern{n}@example.com", f"MHG_{n:06d}", "Intern",
+                "Jan 12 2026", "2 Months", "Backend(Using Django Framework)", "Active", "Final Year Student",
+                "Voting System", "Built backend, integrated frontend", "Python, Git, Linux, Database", "★★★★☆",
+                "Interactive, Colaborative, Supportive",
+            ])
+        w.writerow([""] * 15)
+        for s in range(1, supervisors + 1):
+            w.writerow(["Supervisor "] + [""] * 14)
+            w.writerow(["Name: ", f"Bench Supervisor {s}"] + [""] * 13)
+            w.writerow(["email", f"bench.supervisor{s}@example.com"] + [""] * 13)
+            w.writerow(["id info", f"MHG_S{s:04d}"] + [""] * 13)
+            w.writerow(["Position", "ICT Trainer"] + [""] * 13)
+
+
+class Command(BaseCommand):
+    help = "Generate a large intern sheet and time import_users_from_csv against it (changes are rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50000, help="Intern rows in the generated sheet")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing processes")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--keep", action="store_true", help="Commit the imported users instead of rolling back")
+
+    def handle(self, *args, **opts):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bench_sheet.csv"
+            write_sheet(path, opts["rows"])
+            self.stdout.write(f"Generated {opts['rows']} rows ({path.stat().st_size / 1e6:.1f} MB)")
+
+            before = User.objects.count()
+            started = time.monotonic()
+            try:
+                with transaction.atomic():
+                    call_command(
+                        "import_users_from_csv", path=str(path), workers=opts["workers"],
+                        chunk_size=opts["chunk_size"], quiet=True, stdout=StringIO(),
+                    )
+                    created = User.objects.count() - before
+                    elapsed = time.monotonic() - started
+                    if not opts["keep"]:
+                        raise _Rollback()
+            except _Rollback:
+                pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} users in {elapsed:.1f}s = {created / elapsed if elapsed else 0:.0f} users/s "
+            f"(workers={opts['workers']}, chunk={opts['chunk_size']}{'' if opts['keep'] else ', rolled back'})"
+        ))
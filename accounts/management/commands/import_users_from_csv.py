@@ -1,10 +1,17 @@
 import csv
+import os
 import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from accounts.models import User
 
+LOOKUP_CHUNK = 1000
+
 def _clean(s: str) -> str:
     return (s or "").strip()
 
@@ -24,33 +31,123 @@ def _role_from_header_cell(cell: str) -> str | None:
         return "ADMIN"
     return None
 
-def _create_user_from_block(block: dict, role: str, stdout):
+def _row_from_block(block: dict, role: str) -> dict | None:
     email = _clean(block.get("email", "")).lower()
     if not email:
-        return None, "skipped(no email)"
-
-    full_name = _clean(block.get("name", "")) or email.split("@")[0]
-    employee_id = _clean(block.get("id info", "")) or _clean(block.get("employee id", ""))
-    department = _clean(block.get("position", "")) or _clean(block.get("department", ""))
-
-    if User.objects.filter(email=email).exists():
-        return None, "skipped(exists)"
-
-    password = secrets.token_urlsafe(8)
+        return None
+    return {
+        "email": email,
+        "role": role,
+        "full_name": _clean(block.get("name", "")) or email.split("@")[0],
+        "employee_id": _clean(block.get("id info", "")) or _clean(block.get("employee id", "")),
+        "department": _clean(block.get("position", "")) or _clean(block.get("department", "")),
+    }
+
+def parse_rows(rows, on_block=None) -> list[dict]:
+    """
+    Collect user rows from both sheet layouts, in file order:
+    1) block mode ("Supervisor" line followed by "Name: ,x" / "email,x" lines)
+    2) tabular mode (header row with an E-mail column)
+    """
+    parsed = []
+
+    # -------------- 1) BLOCK MODE (Supervisor/Intern blocks) --------------
+    role = None
+    block = {}
+
+    def flush_block():
+        nonlocal block
+        if role and block:
+            if on_block:
+                on_block(role, block)
+            row = _row_from_block(block, role)
+            if row:
+                parsed.append(row)
+        block = {}
 
-    user = User.objects.create_user(
-        email=email,
-        password=password,
-        full_name=full_name,
-        role=role,
-        employee_id=employee_id,
-        department=department,
-        is_verified=True,  # CSV-provisioned users are verified
-    )
+    for r in rows:
+        if not r:
+            continue
+
+        first = _clean(r[0])
+        if not first:
+            continue
+
+        # detect role line: "Supervisor ,,,,,,,"
+        new_role = _role_from_header_cell(first)
+        if new_role:
+            flush_block()
+            role = new_role
+            continue
+
+        # detect key,value lines: "Name: ,Samip Gajurel"
+        if len(r) >= 2:
+            k = _norm_key(r[0])
+            v = _clean(r[1])
+            if k in {"name", "email", "id info", "position", "department", "employee id"}:
+                if v:
+                    block[k] = v
+
+    flush_block()
+
+    # -------------- 2) TABULAR MODE (normal table with headers) --------------
+    # find header row containing email column
+    header_idx = None
+    for i, r in enumerate(rows):
+        joined = " ".join([_clean(x).lower() for x in r])
+        if "e-mail" in joined or "email" in joined:
+            header_idx = i
+            break
+
+    if header_idx is not None:
+        # rebuild DictReader from that point onward
+        text_lines = []
+        for r in rows[header_idx:]:
+            text_lines.append(",".join([x.replace(",", " ") for x in r]))
+
+        for row in csv.DictReader(text_lines):
+            email = (_clean(row.get("E-mail")) or _clean(row.get("Email"))).lower()
+            if not email:
+                continue
 
-    # Print creds like your screenshot
-    stdout.write(f"{email} | {password} | {employee_id or '-'} | {department or '-'}")
-    return user, "created"
+            role_raw = _clean(row.get("Role", "")).lower()
+            if "supervisor" in role_raw:
+                role2 = "SUPERVISOR"
+            elif "admin" in role_raw:
+                role2 = "ADMIN"
+            else:
+                role2 = "INTERN"
+
+            parsed.append({
+                "email": email,
+                "role": role2,
+                "full_name": _clean(row.get("Intern Name") or row.get("Name") or email.split("@")[0]),
+                "employee_id": _clean(row.get("ID Info") or row.get("Employee ID") or ""),
+                "department": _clean(row.get("Department") or ""),
+            })
+
+    return parsed
+
+def existing_emails(emails) -> set[str]:
+    emails = list(emails)
+    found = set()
+    for i in range(0, len(emails), LOOKUP_CHUNK):
+        found.update(User.objects.filter(email__in=emails[i:i + LOOKUP_CHUNK]).values_list("email", flat=True))
+    return found
+
+def _init_hash_worker():
+    # spawn-based pools start with an unconfigured Django
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+        django.setup()
+
+def hash_passwords(passwords: list[str], pool=None, workers: int = 1) -> list[str]:
+    if pool is None or len(passwords) < 2:
+        return [make_password(p) for p in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(pool.map(make_password, passwords, chunksize=chunksize))
 
 class Command(BaseCommand):
     help = "Import users from the Codavatar CSV (block-style + tabular). Prints generated credentials."
@@ -58,8 +155,10 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--path", required=True, help="Path to CSV file")
         parser.add_argument("--dry-run", action="store_true", help="Parse only, do not write DB")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes used for password hashing")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Users hashed + inserted per chunk")
+        parser.add_argument("--quiet", action="store_true", help="Do not print per-user credentials")
 
-    @transaction.atomic
     def handle(self, *args, **opts):
         path = Path(opts["path"])
         if not path.exists():
@@ -67,118 +166,77 @@ class Command(BaseCommand):
             return
 
         dry = opts["dry_run"]
+        started = time.monotonic()
 
         # Read as raw rows
         with path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
             rows = list(csv.reader(f))
 
-        created = 0
+        on_block = (lambda role, block: self.stdout.write(f"[DRY] {role} block -> {block}")) if dry else None
+        parsed = parse_rows(rows, on_block=on_block)
+
+        # one query per LOOKUP_CHUNK emails instead of one per row; first occurrence in the file wins
+        taken = existing_emails({r["email"] for r in parsed})
+        to_create = []
         skipped = 0
+        for r in parsed:
+            if r["email"] in taken:
+                skipped += 1
+                continue
+            taken.add(r["email"])
+            to_create.append(r)
 
-        # -------------- 1) BLOCK MODE (Supervisor/Intern blocks) --------------
-        role = None
-        block = {}
+        if dry:
+            for r in to_create:
+                self.stdout.write(f"[DRY] {r['email']} role={r['role']}")
+            self.stdout.write(self.style.SUCCESS(f"Done. created=0, skipped={skipped}"))
+            self.stdout.write("DRY RUN: no DB changes were committed.")
+            return
 
-        def flush_block():
-            nonlocal created, skipped, block, role
-            if not role:
-                block = {}
-                return
-            if not block:
-                return
-
-            if dry:
-                self.stdout.write(f"[DRY] {role} block -> {block}")
-                block = {}
-                return
-
-            user, status = _create_user_from_block(block, role, self.stdout)
-            if status.startswith("created"):
-                created += 1
-            else:
-                skipped += 1
-            block = {}
+        created = self._create_users(to_create, opts)
 
-        for r in rows:
-            if not r:
-                continue
+        elapsed = time.monotonic() - started
+        rate = created / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. created={created}, skipped={skipped} in {elapsed:.1f}s ({rate:.0f} users/s)"
+        ))
 
-            first = _clean(r[0])
-            if not first:
-                continue
+    def _create_users(self, to_create: list[dict], opts) -> int:
+        workers = opts["workers"]
+        if workers <= 1 or len(to_create) < 2:
+            return self._insert_chunks(to_create, opts, pool=None)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as pool:
+            return self._insert_chunks(to_create, opts, pool=pool)
 
-            # detect role line: "Supervisor ,,,,,,,"
-            new_role = _role_from_header_cell(first)
-            if new_role:
-                flush_block()
-                role = new_role
-                block = {}
-                continue
+    @transaction.atomic
+    def _insert_chunks(self, to_create: list[dict], opts, pool) -> int:
+        total = len(to_create)
+        chunk_size = max(1, opts["chunk_size"])
+        created = 0
 
-            # detect key,value lines: "Name: ,Samip Gajurel"
-            if len(r) >= 2:
-                k = _norm_key(r[0])
-                v = _clean(r[1])
-                if k in {"name", "email", "id info", "position", "department", "employee id"}:
-                    if v:
-                        block[k] = v
-
-        flush_block()
-
-        # -------------- 2) TABULAR MODE (normal table with headers) --------------
-        # find header row containing email column
-        header_idx = None
-        for i, r in enumerate(rows):
-            joined = " ".join([_clean(x).lower() for x in r])
-            if "e-mail" in joined or "email" in joined:
-                header_idx = i
-                break
-
-        if header_idx is not None:
-            # rebuild DictReader from that point onward
-            text_lines = []
-            for r in rows[header_idx:]:
-                text_lines.append(",".join([x.replace(",", " ") for x in r]))
-
-            dict_reader = csv.DictReader(text_lines)
-            for row in dict_reader:
-                email = (_clean(row.get("E-mail")) or _clean(row.get("Email"))).lower()
-                if not email:
-                    continue
-                if User.objects.filter(email=email).exists():
-                    skipped += 1
-                    continue
-
-                role_raw = _clean(row.get("Role", "")).lower()
-                if "supervisor" in role_raw:
-                    role2 = "SUPERVISOR"
-                elif "admin" in role_raw:
-                    role2 = "ADMIN"
-                else:
-                    role2 = "INTERN"
-
-                full_name = _clean(row.get("Intern Name") or row.get("Name") or email.split("@")[0])
-                employee_id = _clean(row.get("ID Info") or row.get("Employee ID") or "")
-                department = _clean(row.get("Department") or "")
-
-                password = secrets.token_urlsafe(8)
-
-                if dry:
-                    self.stdout.write(f"[DRY] {email} role={role2}")
-                    continue
-
-                User.objects.create_user(
-                    email=email,
-                    password=password,
-                    full_name=full_name,
-                    role=role2,
-                    employee_id=employee_id,
-                    department=department,
-                    is_verified=True,
+        for start in range(0, total, chunk_size):
+            chunk = to_create[start:start + chunk_size]
+            passwords = [secrets.token_urlsafe(8) for _ in chunk]
+            hashes = hash_passwords(passwords, pool=pool, workers=opts["workers"])
+
+            User.objects.bulk_create([
+                User(
+                    email=r["email"],
+                    password=h,
+                    full_name=r["full_name"],
+                    role=r["role"],
+                    employee_id=r["employee_id"],
+                    department=r["department"],
+                    is_verified=True,  # CSV-provisioned users are verified
                 )
-                created += 1
-                self.stdout.write(f"{email} | {password} | {employee_id or '-'} | {department or '-'}")
+                for r, h in zip(chunk, hashes)
+            ])
+            created += len(chunk)
 
-        self.stdout.write(self.style.SUCCESS(f"Done. created={created}, skipped={skipped}"))
-        if dry:
-            self.stdout.write("DRY RUN: no DB changes were committed.")
+            if not opts["quiet"]:
+                for r, password in zip(chunk, passwords):
+                    self.stdout.write(f"{r['email']} | {password} | {r['employee_id'] or '-'} | {r['department'] or '-'}")
+            if total > chunk_size:
+                self.stderr.write(f"... {created}/{total} users")
+
+        return created
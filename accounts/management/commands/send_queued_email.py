@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.mailqueue import deliver_pending, queue_stats
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbound emails (verification, password reset, credentials)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50, help="Emails sent per SMTP connection")
+        parser.add_argument("--loop", action="store_true", help="Keep running, polling the queue")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when the queue is empty (--loop)")
+        parser.add_argument("--stats", action="store_true", help="Print queue counts and exit")
+
+    def handle(self, *args, **opts):
+        if opts["stats"]:
+            s = queue_stats()
+            counts = " ".join(f"{k.lower()}={v}" for k, v in s["counts"].items())
+            age = s["oldest_pending_age_s"]
+            self.stdout.write(f"{counts} oldest_pending_age_s={'-' if age is None else round(age, 1)}")
+            return
+
+        totals = {"sent": 0, "retry": 0, "failed": 0}
+        while True:
+            try:
+                batch = deliver_pending(batch_size=opts["batch_size"])
+            except Exception as e:
+                if not opts["loop"]:
+                    raise
+                # e.g. the database restarted: report it, drop the broken connection and keep polling
+                self.stderr.write(f"deliver_pending failed: {e!r}")
+                close_old_connections()
+                time.sleep(opts["interval"])
+                continue
+            for k in totals:
+                totals[k] += batch[k]
+
+            handled = batch["sent"] + batch["retry"] + batch["failed"]
+            if handled:
+                rate = batch["sent"] / batch["seconds"] if batch["seconds"] else 0.0
+                self.stdout.write(
+                    f"sent={batch['sent']} retry={batch['retry']} failed={batch['failed']} "
+                    f"in {batch['seconds']:.2f}s ({rate:.1f} msg/s)"
+                )
+
+            if not opts["loop"]:
+                # drain everything that is due, then stop
+                if handled == opts["batch_size"]:
+                    continue
+                break
+            if handled < opts["batch_size"]:
+                time.sleep(opts["interval"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. sent={totals['sent']} retry={totals['retry']} failed={totals['failed']}"
+        ))
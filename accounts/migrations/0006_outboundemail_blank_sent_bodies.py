@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def blank_bodies(apps, schema_editor):
+    # sent / failed mail no longer keeps its body (passwords, sign-in links)
+    OutboundEmail = apps.get_model("accounts", "OutboundEmail")
+    OutboundEmail.objects.filter(status__in=["SENT", "FAILED"]).exclude(body="").update(body="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_user_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_bodies, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .models import User
 
 class SignupSerializer(serializers.Serializer):
@@ -21,3 +22,14 @@ class UserMeSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "email", "full_name", "role", "employee_id", "department", "supervisor", "is_verified"]
+
+class RoleClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds role/email/name/supervisor claims so clients (and JWT_TRUST_ROLE_CLAIMS) need no lookup."""
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["role"] = user.role
+        token["email"] = user.email
+        token["name"] = user.full_name
+        token["sup"] = user.supervisor_id
+        return token
@@ -1,3 +1,270 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .mailqueue import _claim, deliver_pending, queue_email
+from .models import EmailVerificationToken, OutboundEmail, PasswordResetToken, User
+from .tokens import RESET_PASSWORD, VERIFY_EMAIL, check_signed_token, make_signed_token, new_token
+
+FAST_HASHER = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def throttled(**rates):
+    """override_settings with only the given throttle scopes on, in a fresh in-memory store."""
+    return override_settings(
+        AUTH_THROTTLE_STORE="accounts.throttling.InMemoryStore",
+        AUTH_THROTTLE_RATES={scope: rates.get(scope, "") for scope in settings.AUTH_THROTTLE_RATES},
+        PASSWORD_HASHERS=FAST_HASHER,
+    )
+
+
+class AuthThrottleTests(TestCase):
+    """The login / signup / password throttles (accounts/throttling.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(email="known@example.com", password="right-pass-1", full_name="Known",
+                                 is_verified=True)
+
+    def login(self, email, addr="10.0.0.1", **extra):
+        return self.client.post("/api/token/", {"email": email, "password": "wrong-pass-1"},
+                                content_type="application/json", REMOTE_ADDR=addr, **extra)
+
+    def assertThrottled(self, resp):
+        self.assertEqual(resp.status_code, 429)
+        self.assertGreater(int(resp["Retry-After"]), 0)
+
+    @throttled(login_ip="2/min")
+    def test_ip_scope(self):
+        self.assertEqual(self.login("a@example.com").status_code, 401)
+        self.assertEqual(self.login("b@example.com").status_code, 401)
+        self.assertThrottled(self.login("c@example.com"))
+        # another address has its own bucket
+        self.assertEqual(self.login("c@example.com", addr="10.0.0.2").status_code, 401)
+
+    @throttled(login_email="2/min")
+    def test_email_scope(self):
+        self.login("known@example.com", addr="10.0.0.1")
+        self.login(" Known@Example.com", addr="10.0.0.2")
+        self.assertThrottled(self.login("known@example.com", addr="10.0.0.3"))
+        self.assertEqual(self.login("other@example.com").status_code, 401)
+
+    @throttled(login_ip="1/min")
+    def test_forwarded_for_ignored_without_proxies(self):
+        self.login("a@example.com", HTTP_X_FORWARDED_FOR="1.1.1.1")
+        self.assertThrottled(self.login("a@example.com", HTTP_X_FORWARDED_FOR="2.2.2.2"))
+
+    @throttled(login_ip="1/min")
+    def test_forwarded_for_behind_one_proxy(self):
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            self.assertEqual(self.login("a@example.com", HTTP_X_FORWARDED_FOR="1.1.1.1").status_code, 401)
+            self.assertEqual(self.login("a@example.com", HTTP_X_FORWARDED_FOR="2.2.2.2").status_code, 401)
+            self.assertThrottled(self.login("a@example.com", HTTP_X_FORWARDED_FOR="2.2.2.2"))
+
+    @throttled(login_ip="1/min", signup_ip="1/hour")
+    def test_rejected_before_hashing(self):
+        self.login("known@example.com")
+        self.client.post("/api/accounts/signup/", {
+            "email": "new1@example.com", "full_name": "N", "password": "new-pass-12", "role": "INTERN",
+        }, content_type="application/json", REMOTE_ADDR="10.0.0.1")
+        with mock.patch("django.contrib.auth.base_user.check_password") as check, \
+                mock.patch("django.contrib.auth.base_user.make_password") as make:
+            self.assertThrottled(self.login("known@example.com"))
+            self.assertThrottled(self.client.post("/api/accounts/signup/", {
+                "email": "new2@example.com", "full_name": "N", "password": "new-pass-12", "role": "INTERN",
+            }, content_type="application/json", REMOTE_ADDR="10.0.0.1"))
+        check.assert_not_called()
+        make.assert_not_called()
+        self.assertFalse(User.objects.filter(email="new2@example.com").exists())
+
+    @throttled(password_email="1/hour")
+    def test_rejected_before_the_mail_queue(self):
+        for addr in ("10.0.0.1", "10.0.0.2"):
+            resp = self.client.post("/api/accounts/forgot-password/", {"email": "known@example.com"},
+                                    content_type="application/json", REMOTE_ADDR=addr)
+        self.assertThrottled(resp)
+        self.assertEqual(OutboundEmail.objects.filter(to_email="known@example.com").count(), 1)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHER)
+class SignedTokenTests(TestCase):
+    """The email-link tokens (accounts/tokens.py) and the views that spend them."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="token@example.com", password="old-pass-12", full_name="T")
+
+    def post(self, path, data):
+        return self.client.post(path, data, content_type="application/json")
+
+    def verify(self, token):
+        return self.post("/api/accounts/verify-email/", {"token": token})
+
+    def reset(self, token, password="new-pass-12"):
+        return self.post("/api/accounts/reset-password/", {"token": token, "new_password": password})
+
+    def test_verification_token_works_once(self):
+        token = make_signed_token(self.user, VERIFY_EMAIL)
+        self.assertEqual(check_signed_token(token, VERIFY_EMAIL), self.user)
+        self.assertEqual(self.verify(token).status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_verified)
+        self.assertIsNone(check_signed_token(token, VERIFY_EMAIL))
+        self.assertEqual(self.verify(token).status_code, 400)
+
+    def test_reset_token_dies_with_the_password(self):
+        token = make_signed_token(self.user, RESET_PASSWORD)
+        other = make_signed_token(self.user, RESET_PASSWORD)
+        self.assertEqual(self.reset(token).status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-pass-12"))
+        # the new hash retires this link and every other one issued before it
+        self.assertEqual(self.reset(token, "third-pass-1").status_code, 400)
+        self.assertIsNone(check_signed_token(other, RESET_PASSWORD))
+
+    def test_password_change_elsewhere_retires_reset_token(self):
+        token = make_signed_token(self.user, RESET_PASSWORD)
+        self.user.set_password("changed-pass-1")
+        self.user.save()
+        self.assertIsNone(check_signed_token(token, RESET_PASSWORD))
+
+    @override_settings(EMAIL_VERIFY_TOKEN_MAX_AGE=3600, PASSWORD_RESET_TOKEN_MAX_AGE=600)
+    def test_max_age(self):
+        for purpose, age in ((VERIFY_EMAIL, 3600), (RESET_PASSWORD, 600)):
+            with self.subTest(purpose):
+                with mock.patch("django.core.signing.time.time", return_value=time.time() - age + 60):
+                    fresh = make_signed_token(self.user, purpose)
+                with mock.patch("django.core.signing.time.time", return_value=time.time() - age - 60):
+                    stale = make_signed_token(self.user, purpose)
+                self.assertEqual(check_signed_token(fresh, purpose), self.user)
+                self.assertIsNone(check_signed_token(stale, purpose))
+
+    def test_purposes_do_not_cross(self):
+        verify = make_signed_token(self.user, VERIFY_EMAIL)
+        reset = make_signed_token(self.user, RESET_PASSWORD)
+        self.assertIsNone(check_signed_token(verify, RESET_PASSWORD))
+        self.assertIsNone(check_signed_token(reset, VERIFY_EMAIL))
+        self.assertEqual(self.reset(verify).status_code, 400)
+        self.assertEqual(self.verify(reset).status_code, 400)
+
+    def test_tampered_token(self):
+        token = make_signed_token(self.user, VERIFY_EMAIL)
+        self.assertIsNone(check_signed_token(token[:-1] + ("A" if token[-1] != "A" else "B"), VERIFY_EMAIL))
+
+    def test_legacy_verification_row(self):
+        row = EmailVerificationToken.objects.create(user=self.user, token=new_token())
+        self.assertEqual(self.verify(row.token).status_code, 200)
+        row.refresh_from_db()
+        self.assertTrue(row.used)
+        self.assertEqual(self.verify(row.token).status_code, 400)
+
+    def test_legacy_reset_row(self):
+        row = PasswordResetToken.objects.create(user=self.user, token=new_token())
+        self.assertEqual(self.reset(row.token).status_code, 200)
+        self.assertEqual(self.reset(row.token, "third-pass-1").status_code, 400)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-pass-12"))
+
+    def test_legacy_rows_expire_and_can_be_turned_off(self):
+        old = EmailVerificationToken.objects.create(user=self.user, token=new_token())
+        EmailVerificationToken.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=settings.EMAIL_TOKEN_RETENTION_DAYS + 1))
+        self.assertEqual(self.verify(old.token).status_code, 400)
+        row = PasswordResetToken.objects.create(user=self.user, token=new_token())
+        with override_settings(ACCEPT_LEGACY_DB_TOKENS=False):
+            self.assertEqual(self.reset(row.token).status_code, 400)
+        row.refresh_from_db()
+        self.assertFalse(row.used)
+
+
+class FlakyEmailBackend(EmailBackend):
+    """locmem backend that raises for the addresses in `failing`."""
+    failing = set()
+
+    def send_messages(self, messages):
+        for m in messages:
+            if set(m.to) & self.failing:
+                raise ConnectionError("mailbox unavailable")
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND="accounts.tests.FlakyEmailBackend", EMAIL_QUEUE_MAX_ATTEMPTS=3,
+    EMAIL_QUEUE_BACKOFF_SECONDS=30, EMAIL_QUEUE_BACKOFF_MAX_SECONDS=3600, EMAIL_QUEUE_LEASE_SECONDS=600,
+)
+class MailQueueTests(TestCase):
+    """accounts/mailqueue.py: queue_email() and the send_queued_email batches."""
+
+    def setUp(self):
+        FlakyEmailBackend.failing = set()
+
+    def make_due(self, m):
+        OutboundEmail.objects.filter(pk=m.pk).update(next_attempt_at=timezone.now())
+
+    def assertDueIn(self, m, seconds):
+        m.refresh_from_db()
+        self.assertAlmostEqual((m.next_attempt_at - timezone.now()).total_seconds(), seconds, delta=5)
+
+    def test_queue_then_send(self):
+        m = queue_email("Subject", "secret link", "a@example.com")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(deliver_pending()["sent"], 1)
+        self.assertEqual([(e.subject, e.body, e.to) for e in mail.outbox], [("Subject", "secret link", ["a@example.com"])])
+        m.refresh_from_db()
+        self.assertEqual((m.status, m.attempts, m.body), ("SENT", 1, ""))
+        self.assertIsNotNone(m.sent_at)
+        self.assertEqual(deliver_pending()["sent"], 0)
+
+    def test_retry_with_backoff(self):
+        FlakyEmailBackend.failing = {"bad@example.com"}
+        bad = queue_email("S", "b", "bad@example.com")
+        queue_email("S", "g", "good@example.com")
+
+        stats = deliver_pending()
+        self.assertEqual((stats["sent"], stats["retry"], stats["failed"]), (1, 1, 0))
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts, bad.body), ("PENDING", 1, "b"))
+        self.assertIn("mailbox unavailable", bad.last_error)
+        self.assertDueIn(bad, 30)
+        # not due yet
+        self.assertEqual(deliver_pending()["retry"], 0)
+
+        self.make_due(bad)
+        deliver_pending()
+        self.assertDueIn(bad, 60)
+
+        FlakyEmailBackend.failing = set()
+        self.make_due(bad)
+        self.assertEqual(deliver_pending()["sent"], 1)
+        bad.refresh_from_db()
+        self.assertEqual((bad.status, bad.attempts, bad.last_error), ("SENT", 3, ""))
+
+    def test_failed_after_max_attempts(self):
+        FlakyEmailBackend.failing = {"bad@example.com"}
+        m = queue_email("S", "b", "bad@example.com")
+        for _ in range(2):
+            self.assertEqual(deliver_pending()["retry"], 1)
+            self.make_due(m)
+        self.assertEqual(deliver_pending()["failed"], 1)
+        m.refresh_from_db()
+        self.assertEqual((m.status, m.attempts, m.body), ("FAILED", 3, ""))
+        self.make_due(m)
+        self.assertEqual(deliver_pending(), {"sent": 0, "retry": 0, "failed": 0, "seconds": 0.0})
+        self.assertEqual(mail.outbox, [])
+
+    def test_lease_expiry_reclaims(self):
+        m = queue_email("S", "b", "a@example.com")
+        # a worker claims the row and dies before sending
+        self.assertEqual([c.pk for c in _claim(10)], [m.pk])
+        self.assertDueIn(m, 600)
+        self.assertEqual(_claim(10), [])
+        self.assertEqual(deliver_pending()["sent"], 0)
+        # once the lease runs out another worker picks it up
+        self.make_due(m)
+        self.assertEqual(deliver_pending()["sent"], 1)
+        self.assertEqual(len(mail.outbox), 1)
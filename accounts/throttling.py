@@ -0,0 +1,214 @@
+"""
+Token-bucket throttling for the endpoints that hash a password or send mail
+(login, signup, forgot / reset password).
+
+They are DRF throttle classes, so APIView.initial() runs them before the
+view: a rejected request gets a 429 with Retry-After and never reaches
+PBKDF2 or the mail queue. Each scope in AUTH_THROTTLE_RATES ("login_ip",
+"login_email", ...) is a bucket per client IP or per submitted email:
+"10/min" holds 10 requests and refills at 10 a minute. An empty rate
+turns a scope off.
+
+Buckets and the allowed / rejected counters live in AUTH_THROTTLE_STORE
+(dotted path to a ThrottleStore):
+  * InMemoryStore: a dict in this process; tests and single-process runs;
+  * CacheStore: the CACHES[AUTH_THROTTLE_CACHE] backend, so every worker
+    shares the buckets once that alias points at a shared cache (file,
+    database, memcached ...). The cache API has no compare-and-set, so two
+    workers taking from one bucket at the same instant can each let one
+    request through that the other would have refused.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """"10/min" -> (capacity 10, refill 10/60 per second); None for an empty rate."""
+    if not rate:
+        return None
+    count, period = rate.split("/")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def rates() -> dict:
+    return dict(getattr(settings, "AUTH_THROTTLE_RATES", {}))
+
+
+class ThrottleStore:
+    @staticmethod
+    def _take(state, now, capacity, refill):
+        """-> (new state, seconds to wait; 0 when a token was taken)."""
+        tokens, updated = state if state else (capacity, now)
+        tokens = min(capacity, tokens + (now - updated) * refill)
+        if tokens >= 1:
+            return (tokens - 1, now), 0.0
+        return (tokens, now), (1 - tokens) / refill
+
+    def take(self, key, capacity, refill) -> float:
+        raise NotImplementedError
+
+    def count(self, scope, outcome):
+        raise NotImplementedError
+
+    def stats(self, scopes) -> dict:
+        raise NotImplementedError
+
+    def reset_stats(self, scopes):
+        raise NotImplementedError
+
+
+class InMemoryStore(ThrottleStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._counts = Counter()
+
+    def take(self, key, capacity, refill):
+        now = time.monotonic()
+        with self._lock:
+            self._buckets[key], wait = self._take(self._buckets.get(key), now, capacity, refill)
+            if len(self._buckets) > 10000:
+                # drop the buckets that have refilled completely anyway
+                self._buckets = {
+                    k: s for k, s in self._buckets.items() if s[0] + (now - s[1]) * refill < capacity
+                }
+        return wait
+
+    def count(self, scope, outcome):
+        with self._lock:
+            self._counts[(scope, outcome)] += 1
+
+    def stats(self, scopes):
+        return {s: {"allowed": self._counts[(s, "allowed")], "rejected": self._counts[(s, "rejected")]} for s in scopes}
+
+    def reset_stats(self, scopes):
+        with self._lock:
+            self._counts.clear()
+
+
+class CacheStore(ThrottleStore):
+    def __init__(self):
+        self.cache = caches[getattr(settings, "AUTH_THROTTLE_CACHE", "throttle")]
+
+    def take(self, key, capacity, refill):
+        now = time.time()  # wall clock: shared between processes
+        state, wait = self._take(self.cache.get(f"throttle:{key}"), now, capacity, refill)
+        # a bucket left alone this long is full again, so it can expire
+        self.cache.set(f"throttle:{key}", state, timeout=int(capacity / refill) + 1)
+        return wait
+
+    def _stat_key(self, scope, outcome):
+        return f"throttle:stat:{scope}:{outcome}"
+
+    def count(self, scope, outcome):
+        key = self._stat_key(scope, outcome)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+    def stats(self, scopes):
+        keys = {(s, o): self._stat_key(s, o) for s in scopes for o in ("allowed", "rejected")}
+        found = self.cache.get_many(list(keys.values()))
+        return {s: {o: found.get(keys[(s, o)], 0) for o in ("allowed", "rejected")} for s in scopes}
+
+    def reset_stats(self, scopes):
+        self.cache.delete_many([self._stat_key(s, o) for s in scopes for o in ("allowed", "rejected")])
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ThrottleStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = import_string(getattr(settings, "AUTH_THROTTLE_STORE", "accounts.throttling.CacheStore"))()
+    return _store
+
+
+@receiver(setting_changed)
+def _settings_changed(setting, **kwargs):
+    global _store
+    if setting.startswith("AUTH_THROTTLE_"):
+        _store = None
+
+
+def stats() -> dict:
+    return get_store().stats(sorted(rates()))
+
+
+def reset_stats():
+    get_store().reset_stats(sorted(rates()))
+
+
+# ---------- DRF throttles ----------
+class BucketThrottle(BaseThrottle):
+    scope = None
+
+    def bucket_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        rate = parse_rate(rates().get(self.scope))
+        key = self.bucket_key(request) if rate else None
+        if key is None:
+            return True
+        store = get_store()
+        self._wait = store.take(f"{self.scope}:{key}", *rate)
+        allowed = not self._wait
+        store.count(self.scope, "allowed" if allowed else "rejected")
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class IPThrottle(BucketThrottle):
+    def bucket_key(self, request):
+        # REMOTE_ADDR, or the X-Forwarded-For entry REST_FRAMEWORK NUM_PROXIES hops back
+        return self.get_ident(request)
+
+
+class EmailThrottle(BucketThrottle):
+    def bucket_key(self, request):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None  # the view rejects it without hashing anything
+        # hashed: cache keys should not carry addresses
+        return hashlib.sha1(email.strip().lower().encode("utf-8")).hexdigest()[:20]
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login_ip"
+
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = "login_email"
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = "signup_ip"
+
+
+class PasswordIPThrottle(IPThrottle):
+    scope = "password_ip"
+
+
+class PasswordEmailThrottle(EmailThrottle):
+    scope = "password_email"
@@ -1,8 +1,77 @@
+"""
+Random tokens, and the signed one-time tokens for email links.
+
+make_signed_token(user, purpose) needs no table: it is the user id plus a
+fingerprint of the state the link is meant to change, signed with
+SECRET_KEY and timestamped (django.core.signing). check_signed_token()
+rejects it once it is older than the purpose's max age, or once that state
+has changed: verifying flips is_verified and a reset replaces the password
+hash, so each link works once. The purpose is part of the salt, so a
+verification token is never a valid reset token.
+"""
 import secrets
+
+from django.conf import settings
+from django.core import signing
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .models import User
+
+VERIFY_EMAIL = "verify-email"
+RESET_PASSWORD = "reset-password"
+
+# purpose -> (max age setting, default seconds)
+MAX_AGE = {
+    VERIFY_EMAIL: ("EMAIL_VERIFY_TOKEN_MAX_AGE", 3 * 24 * 3600),
+    RESET_PASSWORD: ("PASSWORD_RESET_TOKEN_MAX_AGE", 2 * 3600),
+}
+
 
 def new_token(nbytes: int = 32) -> str:
     return secrets.token_urlsafe(nbytes)
 
 def now():
     return timezone.now()
+
+
+def _salt(purpose) -> str:
+    return f"accounts.tokens.{purpose}"
+
+
+def _fingerprint(user, purpose) -> str:
+    state = user.password if purpose == RESET_PASSWORD else str(user.is_verified)
+    return salted_hmac(_salt(purpose), f"{user.pk}|{user.email}|{state}").hexdigest()[:20]
+
+
+def max_age(purpose) -> int:
+    setting, default = MAX_AGE[purpose]
+    return int(getattr(settings, setting, default))
+
+
+def is_signed_token(token: str) -> bool:
+    """Signed tokens have ":"-separated parts; the old table tokens (token_urlsafe) never do."""
+    return ":" in token
+
+
+def make_signed_token(user, purpose) -> str:
+    return signing.dumps({"u": user.pk, "f": _fingerprint(user, purpose)}, salt=_salt(purpose))
+
+
+def check_signed_token(token: str, purpose, for_update=False):
+    """
+    The user a token was issued to, or None if it is forged, expired or
+    already used. for_update locks the user row (call inside a transaction)
+    so two requests cannot both spend the same token.
+    """
+    try:
+        data = signing.loads(token, salt=_salt(purpose), max_age=max_age(purpose))
+    except signing.BadSignature:  # includes SignatureExpired
+        return None
+    if not isinstance(data, dict):
+        return None
+    users = User.objects.select_for_update() if for_update else User.objects
+    user = users.filter(pk=data.get("u")).first()
+    if user is None or not constant_time_compare(str(data.get("f", "")), _fingerprint(user, purpose)):
+        return None
+    return user
@@ -3,16 +3,22 @@ from .views import (
     MeView,
     SignupView,
     VerifyEmailView,
+    ForgotPasswordView,
+    ResetPasswordView,
     AdminUsersView,
     AdminDeleteUserView,
+    AdminThrottleStatsView,
 )
 
 urlpatterns = [
     path("me/", MeView.as_view()),
     path("signup/", SignupView.as_view()),
     path("verify-email/", VerifyEmailView.as_view()),
+    path("forgot-password/", ForgotPasswordView.as_view()),
+    path("reset-password/", ResetPasswordView.as_view()),
 
     # ADMIN
     path("admin/users/", AdminUsersView.as_view()),
     path("admin/delete-user/<int:user_id>/", AdminDeleteUserView.as_view()),
+    path("admin/throttle/stats/", AdminThrottleStatsView.as_view()),
 ]
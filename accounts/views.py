@@ -1,41 +1,47 @@
 import csv
 import secrets
+from datetime import timedelta
 from io import TextIOWrapper
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.db import transaction
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from .conditional import conditional_get
+from .mailqueue import queue_email
 from .models import User, EmailVerificationToken, PasswordResetToken
 from .serializers import (
     SignupSerializer, VerifyEmailSerializer, UserMeSerializer,
-    ForgotPasswordSerializer, ResetPasswordSerializer
+    ForgotPasswordSerializer, ResetPasswordSerializer, RoleClaimsTokenObtainPairSerializer
 )
 from .permissions import IsAdmin
-from .tokens import new_token
+from . import throttling
+from .throttling import (
+    LoginEmailThrottle, LoginIPThrottle, PasswordEmailThrottle, PasswordIPThrottle, SignupIPThrottle,
+)
+from .tokens import RESET_PASSWORD, VERIFY_EMAIL, check_signed_token, is_signed_token, make_signed_token
 
 
 def send_verification_email(user: User):
-    token = new_token(16)
-    EmailVerificationToken.objects.create(user=user, token=token)
+    token = make_signed_token(user, VERIFY_EMAIL)
 
     verify_url = f"{settings.FRONTEND_BASE_URL}/verify.html?token={token}"
     subject = "Verify your Codavatar InternTrack account"
     message = f"Hello {user.full_name},\n\nPlease verify your account:\n{verify_url}\n\n- Codavatar Tech"
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+    queue_email(subject, message, user.email)
 
 
-def send_reset_email(user: User, token: str):
+def send_reset_email(user: User):
+    token = make_signed_token(user, RESET_PASSWORD)
     reset_url = f"{settings.FRONTEND_BASE_URL}/reset_password.html?token={token}"
     subject = "Reset your Codavatar InternTrack password"
     message = f"Hello {user.full_name},\n\nReset your password using this link:\n{reset_url}\n\n- Codavatar Tech"
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+    queue_email(subject, message, user.email)
 
 
 def send_credentials_email(user: User, password: str):
@@ -48,7 +54,7 @@ def send_credentials_email(user: User, password: str):
         f"Login: {settings.FRONTEND_BASE_URL}/login.html\n\n"
         f"- Codavatar Tech"
     )
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+    queue_email(subject, message, user.email)
 
 
 class MeView(APIView):
@@ -59,6 +65,7 @@ class MeView(APIView):
 
 class SignupView(APIView):
     permission_classes = []
+    throttle_classes = [SignupIPThrottle]
     def post(self, request):
         ser = SignupSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -82,6 +89,28 @@ class SignupView(APIView):
         return Response({"detail":"Signup successful. Check email for verification link."})
 
 
+def _legacy_token_user(model, token, max_age_days_setting, default_days, lock=False):
+    """
+    The user of an unused EmailVerificationToken / PasswordResetToken row,
+    marking it used. Only links mailed before the switch to signed tokens
+    still need this; see ACCEPT_LEGACY_DB_TOKENS.
+    """
+    if not getattr(settings, "ACCEPT_LEGACY_DB_TOKENS", True):
+        return None
+    days = int(getattr(settings, max_age_days_setting, default_days))
+    rows = model.objects.select_for_update() if lock else model.objects
+    t = (
+        rows.select_related("user")
+        .filter(token=token, used=False, created_at__gte=timezone.now() - timedelta(days=days))
+        .first()
+    )
+    if t is None:
+        return None
+    t.used = True
+    t.save(update_fields=["used"])
+    return t.user
+
+
 class VerifyEmailView(APIView):
     permission_classes = []
     def post(self, request):
@@ -89,21 +118,22 @@ class VerifyEmailView(APIView):
         ser.is_valid(raise_exception=True)
 
         token = ser.validated_data["token"]
-        try:
-            t = EmailVerificationToken.objects.select_related("user").get(token=token, used=False)
-        except EmailVerificationToken.DoesNotExist:
-            return Response({"detail":"Invalid/expired token"}, status=400)
+        with transaction.atomic():
+            if is_signed_token(token):
+                user = check_signed_token(token, VERIFY_EMAIL, for_update=True)
+            else:
+                user = _legacy_token_user(EmailVerificationToken, token, "EMAIL_TOKEN_RETENTION_DAYS", 7, lock=True)
+            if user is None:
+                return Response({"detail":"Invalid/expired token"}, status=400)
 
-        t.used = True
-        t.save(update_fields=["used"])
-        t.user.is_verified = True
-        t.user.save(update_fields=["is_verified"])
+            user.is_verified = True
+            user.save(update_fields=["is_verified", "updated_at"])
 
         return Response({"detail":"Email verified successfully. You can login now."})
 
 
 # ✅ Verified-only JWT
-class VerifiedTokenSerializer(TokenObtainPairSerializer):
+class VerifiedTokenSerializer(RoleClaimsTokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
         user = self.user
@@ -111,13 +141,19 @@ class VerifiedTokenSerializer(TokenObtainPairSerializer):
             raise Exception("Email not verified. Please verify your email first.")
         return data
 
-class VerifiedTokenObtainPairView(TokenObtainPairView):
+class LoginView(TokenObtainPairView):
+    """api/token/: simplejwt's view behind the login throttles."""
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
+
+
+class VerifiedTokenObtainPairView(LoginView):
     serializer_class = VerifiedTokenSerializer
 
 
 # ✅ Forgot / Reset Password
 class ForgotPasswordView(APIView):
     permission_classes = []
+    throttle_classes = [PasswordIPThrottle, PasswordEmailThrottle]
     def post(self, request):
         ser = ForgotPasswordSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -128,15 +164,13 @@ class ForgotPasswordView(APIView):
         if not user:
             return Response({"detail":"If that email exists, a reset link was sent."})
 
-        token = new_token(16)
-        PasswordResetToken.objects.create(user=user, token=token)
-
-        send_reset_email(user, token)
+        send_reset_email(user)
         return Response({"detail":"If that email exists, a reset link was sent."})
 
 
 class ResetPasswordView(APIView):
     permission_classes = []
+    throttle_classes = [PasswordIPThrottle]
     def post(self, request):
         ser = ResetPasswordSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -144,24 +178,23 @@ class ResetPasswordView(APIView):
         token = ser.validated_data["token"]
         new_password = ser.validated_data["new_password"]
 
-        try:
-            t = PasswordResetToken.objects.select_related("user").get(token=token, used=False)
-        except PasswordResetToken.DoesNotExist:
-            return Response({"detail":"Invalid/expired token"}, status=400)
+        with transaction.atomic():
+            if is_signed_token(token):
+                u = check_signed_token(token, RESET_PASSWORD, for_update=True)
+            else:
+                u = _legacy_token_user(PasswordResetToken, token, "RESET_TOKEN_RETENTION_DAYS", 1, lock=True)
+            if u is None:
+                return Response({"detail":"Invalid/expired token"}, status=400)
 
-        t.used = True
-        t.save(update_fields=["used"])
-
-        u = t.user
-        u.set_password(new_password)
-        u.save(update_fields=["password"])
-        
-    
+            # the new hash also retires the token (and any other reset link)
+            u.set_password(new_password)
+            u.save(update_fields=["password", "updated_at"])
 
         return Response({"detail":"Password reset successful. You can login now."})
 class AdminUsersView(APIView):
     permission_classes = [IsAdmin]
 
+    @conditional_get(lambda request: [User.objects.filter(role__in=["INTERN", "SUPERVISOR"])])
     def get(self, request):
         interns = User.objects.filter(role="INTERN").order_by("full_name")
         supervisors = User.objects.filter(role="SUPERVISOR").order_by("full_name")
@@ -180,4 +213,20 @@ class AdminDeleteUserView(APIView):
             return Response({"detail": "You cannot delete yourself"}, status=400)
 
         User.objects.filter(id=user_id).delete()
-        return Response({"detail": "User deleted"})
\ No newline at end of file
+        return Response({"detail": "User deleted"})
+
+
+class AdminThrottleStatsView(APIView):
+    """Allowed/rejected counts per auth throttle scope; POST resets them."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response({
+            "store": getattr(settings, "AUTH_THROTTLE_STORE", "accounts.throttling.CacheStore"),
+            "rates": throttling.rates(),
+            "scopes": throttling.stats(),
+        })
+
+    def post(self, request):
+        throttling.reset_stats()
+        return Response({"detail": "Reset"})
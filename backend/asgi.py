@@ -2,6 +2,8 @@
 ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+/api/events/ (server-sent events, see internships/sse.py) is served by a bare
+ASGI app; everything else goes through Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -13,4 +15,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# needs the app registry loaded by get_asgi_application()
+from internships.sse import sse_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"] == "/api/events/":
+        return await sse_application(scope, receive, send)
+    return await django_application(scope, receive, send)
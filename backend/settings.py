@@ -14,6 +14,7 @@ from pathlib import Path
 from datetime import timedelta
 import os
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
@@ -79,6 +80,13 @@ DATABASES = {
     }
 }
 
+# DB_ENGINE=sqlite for local runs / benchmarks without a MySQL server
+if os.getenv("DB_ENGINE", "mysql") == "sqlite":
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.getenv("SQLITE_PATH", str(BASE_DIR / "db.sqlite3")),
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -87,6 +95,9 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 LANGUAGE_CODE = "en-us"
+# Local day/month buckets are computed by offsetting UTC (internships/localtime.py), which
+# needs no database time zone data as long as this zone has no DST; a DST zone on MySQL
+# needs the server's time zone tables loaded (mysql_tzinfo_to_sql)
 TIME_ZONE = "Asia/Kathmandu"
 USE_I18N = True
 USE_TZ = True
@@ -95,24 +106,76 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 CORS_ALLOW_ALL_ORIGINS = True
+# conditional GETs from api.js (accounts/conditional.py)
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag"]
 
 AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "accounts.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    # Reverse proxies in front of the app. Throttles key on REMOTE_ADDR when 0, else on the
+    # X-Forwarded-For entry that many hops back; left unset, DRF would trust the client's header.
+    # Behind one proxy (nginx, a PaaS router) set NUM_PROXIES=1, or every client shares a bucket.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.RoleClaimsTokenObtainPairSerializer",
 }
 
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # admin list responses (internships/response_cache.py). Local memory is per
+    # process; in production point this at a shared backend, e.g.
+    # RESPONSE_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+    # RESPONSE_CACHE_LOCATION=/var/cache/interntrack  (or .db.DatabaseCache + `manage.py createcachetable`)
+    "responses": {
+        "BACKEND": os.getenv("RESPONSE_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("RESPONSE_CACHE_LOCATION", "interntrack-responses"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))},
+    },
+    # request.user cache (accounts/authentication.py). Saves and deletes clear it only in the
+    # cache they reach, so with several workers this must be shared, e.g.
+    # AUTH_USER_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+    # AUTH_USER_CACHE_LOCATION=/var/cache/interntrack-users  (or .db.DatabaseCache, memcached ...)
+    "auth_users": {
+        "BACKEND": os.getenv("AUTH_USER_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("AUTH_USER_CACHE_LOCATION", "interntrack-users"),
+    },
+    # login / password throttle buckets (accounts/throttling.py); per process unless
+    # THROTTLE_CACHE_BACKEND/LOCATION point at a shared backend like the one above
+    "throttle": {
+        "BACKEND": os.getenv("THROTTLE_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("THROTTLE_CACHE_LOCATION", "interntrack-throttle"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("THROTTLE_CACHE_MAX_ENTRIES", "10000"))},
+    },
+}
+# Seconds an admin list response stays cached (0 disables); writes invalidate it earlier, but
+# only in the cache they reach. Off by default: with a per-process cache the other workers
+# would serve stale lists until the entry expires
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300" if os.getenv("RESPONSE_CACHE_BACKEND") else "0"))
+
+# Authenticated users are cached in CACHES["auth_users"] for this many seconds (0 disables); see
+# accounts/authentication.py. Off by default: a per-process cache would keep deleted or
+# password-reset users signed in on the other workers until the entry expires
+AUTH_USER_CACHE = "auth_users"
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60" if os.getenv("AUTH_USER_CACHE_BACKEND") else "0"))
+# Build request.user from the token's role claims on a cache miss instead of querying
+JWT_TRUST_ROLE_CLAIMS = os.getenv("JWT_TRUST_ROLE_CLAIMS", "0") == "1"
+
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.getenv("EMAIL_HOST")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
@@ -122,3 +185,89 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
 
 FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "http://127.0.0.1:5500")
+
+# Email links carry signed tokens (accounts/tokens.py), valid for this many seconds
+EMAIL_VERIFY_TOKEN_MAX_AGE = int(os.getenv("EMAIL_VERIFY_TOKEN_MAX_AGE", str(3 * 24 * 3600)))
+PASSWORD_RESET_TOKEN_MAX_AGE = int(os.getenv("PASSWORD_RESET_TOKEN_MAX_AGE", str(2 * 3600)))
+# Still honour links mailed before the switch (EmailVerificationToken / PasswordResetToken rows);
+# turn off once EMAIL_TOKEN_RETENTION_DAYS have passed since the deploy
+ACCEPT_LEGACY_DB_TOKENS = os.getenv("ACCEPT_LEGACY_DB_TOKENS", "1") == "1"
+
+# Token buckets for login, signup and the password endpoints ("n/sec|min|hour|day"; empty
+# turns one off), checked before any password hashing; see accounts/throttling.py
+AUTH_THROTTLE_RATES = {
+    "login_ip": os.getenv("THROTTLE_LOGIN_IP", "30/min"),
+    "login_email": os.getenv("THROTTLE_LOGIN_EMAIL", "10/min"),
+    "signup_ip": os.getenv("THROTTLE_SIGNUP_IP", "10/hour"),
+    "password_ip": os.getenv("THROTTLE_PASSWORD_IP", "20/hour"),
+    "password_email": os.getenv("THROTTLE_PASSWORD_EMAIL", "5/hour"),
+}
+# accounts.throttling.InMemoryStore keeps them in this process only
+AUTH_THROTTLE_STORE = os.getenv("AUTH_THROTTLE_STORE", "accounts.throttling.CacheStore")
+AUTH_THROTTLE_CACHE = "throttle"
+
+# Upper bound on tasks per POST /api/internships/supervisor/tasks/bulk/
+TASK_BULK_MAX_ITEMS = int(os.getenv("TASK_BULK_MAX_ITEMS", "500"))
+# Upper bound on rows per POST /api/internships/admin/assignments/bulk/
+ASSIGN_BULK_MAX_ROWS = int(os.getenv("ASSIGN_BULK_MAX_ROWS", "5000"))
+# GET /api/internships/supervisor/progress/monthly/: months shown without ?from=, and the widest ?from=&to=
+PROGRESS_DEFAULT_MONTHS = int(os.getenv("PROGRESS_DEFAULT_MONTHS", "6"))
+PROGRESS_MAX_MONTHS = int(os.getenv("PROGRESS_MAX_MONTHS", "24"))
+
+# Activity log: when buffered, entries go to a local spool and are bulk-inserted in the background
+ACTIVITY_LOG_BUFFERED = os.getenv("ACTIVITY_LOG_BUFFERED", "0") == "1"
+ACTIVITY_LOG_SPOOL_DIR = os.getenv("ACTIVITY_LOG_SPOOL_DIR", "/tmp/interntrack_activity")
+ACTIVITY_LOG_FLUSH_SIZE = int(os.getenv("ACTIVITY_LOG_FLUSH_SIZE", "100"))
+ACTIVITY_LOG_FLUSH_SECONDS = float(os.getenv("ACTIVITY_LOG_FLUSH_SECONDS", "2"))
+
+# Outbound mail queue (drained by `manage.py send_queued_email`)
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("EMAIL_QUEUE_MAX_ATTEMPTS", "5"))
+EMAIL_QUEUE_BACKOFF_SECONDS = float(os.getenv("EMAIL_QUEUE_BACKOFF_SECONDS", "30"))
+EMAIL_QUEUE_BACKOFF_MAX_SECONDS = float(os.getenv("EMAIL_QUEUE_BACKOFF_MAX_SECONDS", "3600"))
+# A claimed batch is retried by the next worker if it is not finished within this many seconds
+EMAIL_QUEUE_LEASE_SECONDS = float(os.getenv("EMAIL_QUEUE_LEASE_SECONDS", "600"))
+
+# Rendered monthly PDF reports, keyed on (year, month, data version)
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", "/tmp/interntrack_reports")
+REPORT_RENDER_WAIT_SECONDS = float(os.getenv("REPORT_RENDER_WAIT_SECONDS", "20"))
+
+# Server-sent events at /api/events/ (ASGI only, see internships/events.py)
+EVENTS_ENABLED = os.getenv("EVENTS_ENABLED", "1") == "1"
+# InMemoryBroker reaches one process only; with several workers use internships.events.DatabaseBroker
+EVENTS_BROKER = os.getenv("EVENTS_BROKER", "internships.events.InMemoryBroker")
+EVENTS_POLL_SECONDS = float(os.getenv("EVENTS_POLL_SECONDS", "1"))
+EVENTS_BACKLOG = int(os.getenv("EVENTS_BACKLOG", "500"))
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "200"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_MAX_STREAM_SECONDS = float(os.getenv("EVENTS_MAX_STREAM_SECONDS", "3600"))
+
+# Raw attendance pings older than this are moved to ATTENDANCE_ARCHIVE_DIR by `manage.py archive_attendance`
+ATTENDANCE_RAW_RETENTION_DAYS = int(os.getenv("ATTENDANCE_RAW_RETENTION_DAYS", "90"))
+ATTENDANCE_ARCHIVE_DIR = os.getenv("ATTENDANCE_ARCHIVE_DIR", str(BASE_DIR / "attendance_archive"))
+
+# `manage.py apply_retention` (internships/retention.py): days kept per table; activity
+# entries past their window are archived to RETENTION_ARCHIVE_DIR ("archive") or just
+# deleted ("delete"); used verification / reset tokens go on the next run whatever their age
+ACTIVITY_LOG_RETENTION_DAYS = int(os.getenv("ACTIVITY_LOG_RETENTION_DAYS", "365"))
+ACTIVITY_LOG_RETENTION_ACTION = os.getenv("ACTIVITY_LOG_RETENTION_ACTION", "archive")
+EMAIL_TOKEN_RETENTION_DAYS = int(os.getenv("EMAIL_TOKEN_RETENTION_DAYS", "7"))
+RESET_TOKEN_RETENTION_DAYS = int(os.getenv("RESET_TOKEN_RETENTION_DAYS", "1"))
+# sent / failed OutboundEmail rows (their bodies are already blank); pending ones are never removed
+EMAIL_QUEUE_RETENTION_DAYS = int(os.getenv("EMAIL_QUEUE_RETENTION_DAYS", "30"))
+# DatabaseBroker rows only serve Last-Event-ID replays
+EVENTS_RETENTION_DAYS = int(os.getenv("EVENTS_RETENTION_DAYS", "1"))
+RETENTION_ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR", str(BASE_DIR / "retention_archive"))
+RETENTION_CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", "1000"))
+ATTENDANCE_RANGE_MAX_DAYS = int(os.getenv("ATTENDANCE_RANGE_MAX_DAYS", "366"))
+
+# Fallback office geofence, used while no active OfficeSite rows exist (admin > Office sites)
+OFFICE_LAT = float(os.getenv("OFFICE_LAT", "0") or 0)
+OFFICE_LNG = float(os.getenv("OFFICE_LNG", "0") or 0)
+OFFICE_RADIUS_M = float(os.getenv("OFFICE_RADIUS_M", "150") or 150)
+# Other workers pick up OfficeSite edits within this many seconds
+GEOFENCE_RELOAD_SECONDS = int(os.getenv("GEOFENCE_RELOAD_SECONDS", "60"))
+
+# Search (internships/search.py): match MySQL's innodb_ft_min_token_size; shorter words use a LIKE scan
+SEARCH_MYSQL_MIN_TOKEN = int(os.getenv("SEARCH_MYSQL_MIN_TOKEN", "3"))
+# Rows ranked in Python when neither FULLTEXT nor FTS5 is available
+SEARCH_PYTHON_SCAN_LIMIT = int(os.getenv("SEARCH_PYTHON_SCAN_LIMIT", "2000"))
@@ -1,5 +1,13 @@
 const API_BASE = "http://127.0.0.1:8000/api";
 
+function readCached(key) {
+  try { return JSON.parse(sessionStorage.getItem(key)); } catch { return null; }
+}
+
+function writeCached(key, value) {
+  try { sessionStorage.setItem(key, JSON.stringify(value)); } catch { /* quota: skip caching */ }
+}
+
 async function apiFetch(path, options = {}) {
   const access = localStorage.getItem("access");
 
@@ -14,17 +22,64 @@ async function apiFetch(path, options = {}) {
 
   if (access) headers["Authorization"] = `Bearer ${access}`;
 
+  // conditional GET: resend the last ETag, serve the stored body on 304
+  const method = (options.method || "GET").toUpperCase();
+  const cacheKey = `etag:${path}`;
+  const cached = method === "GET" ? readCached(cacheKey) : null;
+  if (cached) headers["If-None-Match"] = cached.etag;
+
   const res = await fetch(`${API_BASE}${path}`, { ...options, headers });
 
+  if (cached && res.status === 304) {
+    return new Response(cached.body, { status: 200, headers: { "Content-Type": "application/json" } });
+  }
+  if (method === "GET" && res.ok && res.headers.get("ETag")) {
+    const etag = res.headers.get("ETag");
+    res.clone().text().then(body => writeCached(cacheKey, { etag, body }));
+  }
+
   // ✅ auto-handle expired tokens (401)
   if (res.status === 401) {
     console.warn("401 Unauthorized -> logging out");
     localStorage.removeItem("access");
     localStorage.removeItem("refresh");
     localStorage.removeItem("user");
+    sessionStorage.clear();
     window.location.href = "login.html";
     return res;
   }
 
   return res;
 }
+
+// Server-sent events from /api/events/ (needs the ASGI server).
+// handlers: { "task.assigned": data => ..., ... }. Reconnects with the
+// current access token and resumes after the last event seen.
+function subscribeEvents(handlers) {
+  if (!window.EventSource) return null;
+  let lastId = null;
+  let source = null;
+
+  function open() {
+    const access = localStorage.getItem("access");
+    if (!access) return;
+    let url = `${API_BASE}/events/?token=${encodeURIComponent(access)}`;
+    if (lastId) url += `&last_event_id=${encodeURIComponent(lastId)}`;
+    source = new EventSource(url);
+
+    Object.entries(handlers).forEach(([kind, fn]) => {
+      source.addEventListener(kind, e => {
+        lastId = e.lastEventId || lastId;
+        try { fn(JSON.parse(e.data)); } catch (err) { console.warn("event handler failed", kind, err); }
+      });
+    });
+
+    // the server closes the stream when the token expires; reopen with a fresh one
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) setTimeout(open, 5000);
+    };
+  }
+
+  open();
+  return { close: () => source && source.close() };
+}
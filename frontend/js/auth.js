@@ -55,6 +55,7 @@ function logout() {
   localStorage.removeItem("access");
   localStorage.removeItem("refresh");
   localStorage.removeItem("user");
+  sessionStorage.clear();
   window.location.href = "login.html";
 }
 
@@ -126,6 +127,7 @@ function logout() {
   localStorage.removeItem("access");
   localStorage.removeItem("refresh");
   localStorage.removeItem("user");
+  sessionStorage.clear();
   window.location.href = "login.html";
 }
 
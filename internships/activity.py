@@ -0,0 +1,333 @@
+"""
+ActivityLog writer.
+
+With ACTIVITY_LOG_BUFFERED off (default) every entry is inserted right away.
+With it on, entries are appended to a per-process spool file (one JSON line
+each, no DB round-trip) and a background thread moves them into the table
+with bulk_create once ACTIVITY_LOG_FLUSH_SIZE entries are pending or every
+ACTIVITY_LOG_FLUSH_SECONDS, and once more at interpreter exit.
+
+The spool file is the queue, not an in-memory list, so a worker that is
+killed or restarted leaves its entries on disk; the next process to start
+flushing claims any spool whose owner is gone. Delivery is at-least-once: a
+crash between bulk_create and unlinking the claimed file re-inserts that batch.
+
+Views describe an entry as an event (log_activity(actor, "TASK_RATED",
+target=task, subject=task.intern_id, stars=4)); the display text comes from
+EVENT_TEXT, so the typed columns and `action` always say the same thing.
+parse_action() runs the templates backwards for rows written before the
+typed columns existed (`manage.py backfill_activity_events`).
+"""
+import atexit
+import glob
+import json
+import os
+import re
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import events
+from .response_cache import bump
+from .models import ActivityLog
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# display text per event type; placeholders are payload keys plus
+# target_id and subject (the subject's email)
+EVENT_TEXT = {
+    "TASK_CREATED": "Created task {target_id} for {subject}",
+    "TASK_STATUS": "Updated task {target_id} -> {status}",
+    "TASK_REPORTED": "Submitted report for task {target_id}",
+    "TASK_RATED": "Rated task {target_id} ({stars} stars)",
+    "ATTENDANCE_MARKED": "Marked attendance (in_office={in_office}, validated={validated})",
+    "COMPLAINT_CREATED": "Created complaint {target_id}",
+    "COMPLAINT_STATUS": "Updated complaint {target_id} -> {status}",
+    "INTERN_ASSIGNED": "Assigned {subject} -> {supervisor}",
+    "INTERN_UNASSIGNED": "Unassigned {subject}",
+}
+EVENT_TARGET = {
+    "TASK_CREATED": "task", "TASK_STATUS": "task", "TASK_REPORTED": "task", "TASK_RATED": "task",
+    "ATTENDANCE_MARKED": "attendance", "COMPLAINT_CREATED": "complaint", "COMPLAINT_STATUS": "complaint",
+    "INTERN_ASSIGNED": "user", "INTERN_UNASSIGNED": "user",
+}
+
+
+def entry(event_type, target=None, subject=None, **payload) -> dict:
+    """
+    A log entry, as stored in the spool. target is a model instance; subject
+    a User (needed when the text shows its email) or a user id.
+    """
+    subject_id = getattr(subject, "pk", subject)
+    target_id = getattr(target, "pk", None)
+    text = EVENT_TEXT.get(event_type, "{text}")
+    action = text.format(target_id=target_id, subject=getattr(subject, "email", subject_id), **payload)
+    return {
+        "action": action[:500],
+        "event_type": event_type,
+        "target_model": target._meta.model_name if target is not None else "",
+        "target_id": target_id,
+        "subject_id": subject_id,
+        "payload": payload,
+    }
+
+
+def _template_re(text):
+    pattern = re.sub(r"\\{(\w+)\\}", lambda m: f"(?P<{m.group(1)}>.+?)", re.escape(text))
+    return re.compile(f"^{pattern}$")
+
+
+_PARSERS = [(event_type, _template_re(text)) for event_type, text in EVENT_TEXT.items()]
+
+
+def _coerce(value):
+    if value.isdigit():
+        return int(value)
+    return {"True": True, "False": False}.get(value, value)
+
+
+def parse_action(action):
+    """
+    (event_type, {placeholder: value}) for an action string written from
+    EVENT_TEXT, or ("OTHER", {}). Numbers come back as int, True/False as bool.
+    """
+    for event_type, pattern in _PARSERS:
+        m = pattern.match(action)
+        if m:
+            return event_type, {k: _coerce(v) for k, v in m.groupdict().items()}
+    return "OTHER", {}
+
+
+class SpooledActivityWriter:
+    def __init__(self, spool_dir, flush_size=100, flush_seconds=2.0):
+        self.spool_dir = str(spool_dir)
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.pid = os.getpid()
+        self.path = os.path.join(self.spool_dir, f"activity-{self.pid}.jsonl")
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = 0
+        self._seq = 0
+        self._thread = None
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    # ---------- request path ----------
+    def enqueue(self, actor_id, item: dict, created_at=None):
+        line = json.dumps({
+            "actor_id": actor_id,
+            **item,
+            "created_at": (created_at or timezone.now()).isoformat(),
+        })
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._pending += 1
+            pending = self._pending
+
+        self._ensure_thread()
+        if pending >= self.flush_size:
+            self._wake.set()
+
+    # ---------- flushing ----------
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="activity-log-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            self.recover()
+        except Exception:
+            pass
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # keep the spool on disk; the next tick retries it
+                pass
+
+    def _claim_path(self):
+        with self._lock:
+            self._seq += 1
+            return os.path.join(self.spool_dir, f"activity-{self.pid}-{self._seq}.flushing")
+
+    def _claim_current(self):
+        """Rotate our live spool so new entries go to a fresh file."""
+        with self._lock:
+            if not self._pending or not os.path.exists(self.path):
+                self._pending = 0
+                return None
+            self._seq += 1
+            claimed = os.path.join(self.spool_dir, f"activity-{self.pid}-{self._seq}.flushing")
+            os.replace(self.path, claimed)
+            self._pending = 0
+            return claimed
+
+    def recover(self):
+        """Flush spools left behind by dead processes (and our own failed flushes)."""
+        written = 0
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, "activity-*"))):
+            if path == self.path:
+                continue
+            name = os.path.basename(path)
+            try:
+                owner = int(name.split("-")[1].split(".")[0])
+            except (IndexError, ValueError):
+                continue
+            if owner != self.pid and _pid_alive(owner):
+                continue
+            if owner != self.pid or not name.endswith(".flushing"):
+                claimed = self._claim_path()
+                try:
+                    os.replace(path, claimed)
+                except FileNotFoundError:
+                    continue  # another process claimed it first
+                path = claimed
+            written += self._write_file(path)
+        return written
+
+    def flush(self):
+        with self._flush_lock:
+            claimed = self._claim_current()
+            if claimed:
+                self._write_file(claimed)
+            # retry anything an earlier flush of ours could not write
+            for path in sorted(glob.glob(os.path.join(self.spool_dir, f"activity-{self.pid}-*.flushing"))):
+                if path != claimed and os.path.exists(path):
+                    self._write_file(path)
+
+    def _write_file(self, path):
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # torn last line from a killed process
+        written = write_entries(rows) if rows else 0
+        os.remove(path)
+        return written
+
+    def close(self):
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+
+def _log_row(actor_id, item: dict, created_at) -> ActivityLog:
+    return ActivityLog(
+        actor_id=actor_id,
+        action=item["action"][:500],
+        # spool lines from before the typed columns carry only the action
+        event_type=item.get("event_type") or "OTHER",
+        target_model=item.get("target_model") or "",
+        target_id=item.get("target_id"),
+        subject_id=item.get("subject_id"),
+        payload=item.get("payload") or {},
+        created_at=created_at,
+    )
+
+
+def write_entries(rows, batch_size=500):
+    objs = [_log_row(r["actor_id"], r, parse_datetime(r["created_at"]) or timezone.now()) for r in rows]
+    try:
+        with transaction.atomic():
+            ActivityLog.objects.bulk_create(objs, batch_size=batch_size)
+    except IntegrityError:
+        # an actor was deleted before the flush: drop just those entries;
+        # a deleted subject only blanks the column, as SET_NULL would have
+        from accounts.models import User
+        ids = {o.actor_id for o in objs} | {o.subject_id for o in objs if o.subject_id is not None}
+        existing = set(User.objects.filter(id__in=ids).values_list("id", flat=True))
+        objs = [o for o in objs if o.actor_id in existing]
+        for o in objs:
+            if o.subject_id not in existing:
+                o.subject_id = None
+        with transaction.atomic():
+            ActivityLog.objects.bulk_create(objs, batch_size=batch_size)
+    bump(ActivityLog)
+    return len(objs)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    if _writer is not None and _writer.pid == os.getpid():
+        return _writer
+    with _writer_lock:
+        if _writer is None or _writer.pid != os.getpid():
+            _writer = SpooledActivityWriter(
+                settings.ACTIVITY_LOG_SPOOL_DIR,
+                flush_size=int(getattr(settings, "ACTIVITY_LOG_FLUSH_SIZE", 100) or 100),
+                flush_seconds=float(getattr(settings, "ACTIVITY_LOG_FLUSH_SECONDS", 2) or 2),
+            )
+            atexit.register(_writer.close)
+    return _writer
+
+
+def as_row(log: ActivityLog, actor_email) -> dict:
+    """The API shape of an entry: AdminActivityLogView rows and ACTIVITY_CREATED events."""
+    return {
+        "id": log.pk,
+        "actor": actor_email,
+        "action": log.action,
+        "event_type": log.event_type,
+        "target_model": log.target_model,
+        "target_id": log.target_id,
+        "subject_id": log.subject_id,
+        "payload": log.payload,
+        "created_at": log.created_at.isoformat(),
+    }
+
+
+def log_activity(actor, event_type, target=None, subject=None, **payload):
+    """Record one event by `actor`; see entry() for the arguments."""
+    item = entry(event_type, target, subject, **payload)
+    log = _log_row(actor.id, item, timezone.now())
+    if getattr(settings, "ACTIVITY_LOG_BUFFERED", False):
+        get_writer().enqueue(actor.id, item, log.created_at)  # no id until the flush
+    else:
+        log.save()
+    events.publish_event(events.ACTIVITY_CREATED, as_row(log, actor.email), roles=["ADMIN"])
+
+
+def log_activities(actor, items: list[dict]):
+    """log_activity for many entry() dicts by one actor: a single bulk_create when unbuffered."""
+    now = timezone.now()
+    if getattr(settings, "ACTIVITY_LOG_BUFFERED", False):
+        logs = []
+        for item in items:
+            get_writer().enqueue(actor.id, item, now)
+            logs.append(_log_row(actor.id, item, now))
+    else:
+        logs = ActivityLog.objects.bulk_create([_log_row(actor.id, item, now) for item in items], batch_size=500)
+        bump(ActivityLog)
+    for log in logs:
+        events.publish_event(events.ACTIVITY_CREATED, as_row(log, actor.email), roles=["ADMIN"])
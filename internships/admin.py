@@ -1,8 +1,15 @@
 from django.contrib import admin
-from .models import Task, TaskReport, Attendance, Complaint, ActivityLog
+from .models import Task, TaskReport, Attendance, Complaint, ActivityLog, InternSummary, OfficeSite
 
 admin.site.register(Task)
 admin.site.register(TaskReport)
 admin.site.register(Attendance)
 admin.site.register(Complaint)
 admin.site.register(ActivityLog)
+admin.site.register(InternSummary)
+
+
+@admin.register(OfficeSite)
+class OfficeSiteAdmin(admin.ModelAdmin):
+    list_display = ("name", "lat", "lng", "radius_m", "is_active", "updated_at")
+    list_filter = ("is_active",)
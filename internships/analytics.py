@@ -0,0 +1,198 @@
+"""
+DailyRollup maintenance and queries.
+
+Each Task / Attendance / Complaint counts towards the rollup row of its
+created_at day (local time). Signal handlers apply +1/-1 deltas with F()
+updates as rows are created, change status/rating or are deleted, so the
+dashboard never scans the source tables. Bulk operations skip signals;
+rebuild_days() (via `manage.py rebuild_analytics_rollups`) recomputes days
+from the source tables to correct any drift; attendance comes from
+AttendanceDay, which outlives the archived raw pings.
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .localtime import bucket, local_date
+from .models import Task, Attendance, AttendanceDay, Complaint, DailyRollup
+from .snapshots import FieldSnapshot
+
+TASK_STATUS_FIELD = {"IN_PROGRESS": "tasks_in_progress", "DONE": "tasks_done", "COMPLETED": "tasks_completed"}
+COMPLAINT_STATUS_FIELD = {"OPEN": "complaints_open", "IN_REVIEW": "complaints_in_review", "RESOLVED": "complaints_resolved"}
+COUNTER_FIELDS = [
+    f.name for f in DailyRollup._meta.get_fields()
+    if f.concrete and f.name not in ("id", "day")
+]
+_snapshot = FieldSnapshot("rollup", ("status", "star_rating"), (Task, Complaint))
+
+
+def _rating_field(rating):
+    return f"rating_{rating}" if rating in (1, 2, 3, 4, 5) else None
+
+
+def apply_delta(day, deltas: Counter):
+    deltas = {k: v for k, v in deltas.items() if k and v}
+    if not deltas:
+        return
+    updates = {k: F(k) + v for k, v in deltas.items()}
+    if DailyRollup.objects.filter(day=day).update(**updates):
+        return
+    with transaction.atomic():
+        DailyRollup.objects.get_or_create(day=day)
+        DailyRollup.objects.filter(day=day).update(**updates)
+
+
+def _day(instance):
+    return timezone.localdate(instance.created_at)
+
+
+# ---------- signal handlers ----------
+@receiver(post_save, sender=Task)
+def _task_saved(sender, instance, created, **kwargs):
+    d = Counter()
+    if created:
+        d["tasks_created"] += 1
+        d[TASK_STATUS_FIELD.get(instance.status)] += 1
+        d[_rating_field(instance.star_rating)] += 1
+    else:
+        if _snapshot.changed(instance, "status"):
+            d[TASK_STATUS_FIELD.get(_snapshot.old(instance, "status"))] -= 1
+            d[TASK_STATUS_FIELD.get(instance.status)] += 1
+        if _snapshot.changed(instance, "star_rating"):
+            d[_rating_field(_snapshot.old(instance, "star_rating"))] -= 1
+            d[_rating_field(instance.star_rating)] += 1
+    apply_delta(_day(instance), d)
+    _snapshot.take(instance)
+
+
+@receiver(post_delete, sender=Task)
+def _task_deleted(sender, instance, **kwargs):
+    d = Counter({"tasks_created": -1})
+    d[TASK_STATUS_FIELD.get(_snapshot.old(instance, "status"))] -= 1
+    d[_rating_field(_snapshot.old(instance, "star_rating"))] -= 1
+    apply_delta(_day(instance), d)
+
+
+@receiver(post_save, sender=Attendance)
+def _attendance_saved(sender, instance, created, **kwargs):
+    if created:
+        apply_delta(_day(instance), Counter({
+            "attendance_total": 1,
+            "attendance_validated": 1 if instance.location_validated else 0,
+        }))
+
+
+@receiver(post_delete, sender=Attendance)
+def _attendance_deleted(sender, instance, **kwargs):
+    apply_delta(_day(instance), Counter({
+        "attendance_total": -1,
+        "attendance_validated": -1 if instance.location_validated else 0,
+    }))
+
+
+@receiver(post_save, sender=Complaint)
+def _complaint_saved(sender, instance, created, **kwargs):
+    d = Counter()
+    if created:
+        d["complaints_created"] += 1
+        d[COMPLAINT_STATUS_FIELD.get(instance.status)] += 1
+    elif _snapshot.changed(instance, "status"):
+        d[COMPLAINT_STATUS_FIELD.get(_snapshot.old(instance, "status"))] -= 1
+        d[COMPLAINT_STATUS_FIELD.get(instance.status)] += 1
+    apply_delta(_day(instance), d)
+    _snapshot.take(instance)
+
+
+@receiver(post_delete, sender=Complaint)
+def _complaint_deleted(sender, instance, **kwargs):
+    d = Counter({"complaints_created": -1})
+    d[COMPLAINT_STATUS_FIELD.get(_snapshot.old(instance, "status"))] -= 1
+    apply_delta(_day(instance), d)
+
+
+# ---------- rebuild ----------
+def _local_bounds(first_day, last_day):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def rebuild_days(first_day, last_day) -> int:
+    """Recompute rollups for [first_day, last_day] from the source tables. Returns rows written."""
+    start, end = _local_bounds(first_day, last_day)
+    rows = {}
+
+    def row(day):
+        return rows.setdefault(day, Counter())
+
+    tasks = (
+        Task.objects.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(day=local_date("created_at", start, end))
+        .values("day", "status", "star_rating").annotate(c=Count("id"))
+    )
+    for r in tasks:
+        d = row(bucket(r["day"]))
+        d["tasks_created"] += r["c"]
+        d[TASK_STATUS_FIELD.get(r["status"])] += r["c"]
+        d[_rating_field(r["star_rating"])] += r["c"]
+
+    att = (
+        AttendanceDay.objects.filter(day__gte=first_day, day__lte=last_day)
+        .values("day").annotate(c=Sum("pings"), v=Sum("validated_pings")).order_by()
+    )
+    for r in att:
+        d = row(r["day"])
+        d["attendance_total"] += r["c"]
+        d["attendance_validated"] += r["v"]
+
+    comps = (
+        Complaint.objects.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(day=local_date("created_at", start, end))
+        .values("day", "status").annotate(c=Count("id"))
+    )
+    for r in comps:
+        d = row(bucket(r["day"]))
+        d["complaints_created"] += r["c"]
+        d[COMPLAINT_STATUS_FIELD.get(r["status"])] += r["c"]
+
+    with transaction.atomic():
+        DailyRollup.objects.filter(day__gte=first_day, day__lte=last_day).delete()
+        DailyRollup.objects.bulk_create([
+            DailyRollup(day=day, **{k: v for k, v in counts.items() if k in COUNTER_FIELDS})
+            for day, counts in sorted(rows.items())
+        ])
+    return len(rows)
+
+
+# ---------- queries ----------
+def totals(first_day=None, last_day=None) -> dict:
+    qs = DailyRollup.objects.all()
+    if first_day:
+        qs = qs.filter(day__gte=first_day)
+    if last_day:
+        qs = qs.filter(day__lte=last_day)
+    agg = qs.aggregate(**{k: Sum(k) for k in COUNTER_FIELDS})
+    return {k: v or 0 for k, v in agg.items()}
+
+
+def series(first_day, last_day, group="day") -> list[dict]:
+    qs = DailyRollup.objects.filter(day__gte=first_day, day__lte=last_day).order_by("day")
+    if group == "day":
+        return [
+            {"period": r["day"].isoformat(), **{k: r[k] for k in COUNTER_FIELDS}}
+            for r in qs.values("day", *COUNTER_FIELDS)
+        ]
+
+    buckets = {}
+    for r in qs.values("day", *COUNTER_FIELDS):
+        key = f"{r['day']:%Y-%m}"
+        b = buckets.setdefault(key, Counter())
+        for k in COUNTER_FIELDS:
+            b[k] += r[k]
+    return [{"period": k, **{f: b[f] for f in COUNTER_FIELDS}} for k, b in buckets.items()]
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class InternshipsConfig(AppConfig):
     name = 'internships'
+
+    def ready(self):
+        from . import analytics, attendance, geofence, response_cache, search, summaries  # noqa: F401  (connect signal handlers)
@@ -0,0 +1,203 @@
+"""
+AttendanceDay maintenance and raw ping archival.
+
+Every new Attendance ping is folded into its intern's AttendanceDay row for
+the local day with one F()/Least/Greatest UPDATE (an INSERT for the first ping
+of the day). Range queries on the attendance screens read AttendanceDay, so
+their cost follows interns x days, not pings.
+
+archive_day() writes one local day of raw pings to a gzipped JSON-lines file
+in ATTENDANCE_ARCHIVE_DIR, then deletes them without delete signals: the
+archived pings stay counted in AttendanceDay, DailyRollup and InternSummary.
+"""
+import gzip
+import json
+import os
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .localtime import bucket, local_date
+from .models import Attendance, AttendanceDay
+from .response_cache import bump
+
+
+def _local_bounds(first_day, last_day):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+@receiver(post_save, sender=Attendance)
+def _attendance_saved(sender, instance, created, **kwargs):
+    if created:
+        record_ping(instance)
+
+
+def record_ping(a: Attendance):
+    ts = a.created_at
+    day = timezone.localdate(ts)
+    updates = {
+        "first_check_in": Least(F("first_check_in"), ts),
+        "last_check_in": Greatest(F("last_check_in"), ts),
+        "pings": F("pings") + 1,
+    }
+    if a.location_validated:
+        updates["validated_pings"] = F("validated_pings") + 1
+        updates["validated"] = True
+    if a.in_office:
+        updates["in_office"] = True
+    if a.office_distance_m is not None:
+        updates["min_distance_m"] = Least(Coalesce(F("min_distance_m"), a.office_distance_m), a.office_distance_m)
+
+    rows = AttendanceDay.objects.filter(intern_id=a.intern_id, day=day)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            AttendanceDay.objects.create(
+                intern_id=a.intern_id, day=day, first_check_in=ts, last_check_in=ts, pings=1,
+                validated_pings=1 if a.location_validated else 0, in_office=a.in_office,
+                validated=a.location_validated, min_distance_m=a.office_distance_m,
+            )
+    except IntegrityError:
+        # another request created the day row first
+        rows.update(**updates)
+
+
+def oldest_raw_day():
+    oldest = Attendance.objects.aggregate(m=Min("created_at"))["m"]
+    return timezone.localdate(oldest) if oldest else None
+
+
+def rebuild_days(first_day, last_day) -> int:
+    """
+    Recompute AttendanceDay for [first_day, last_day] from the raw pings.
+    Days older than the oldest raw ping are archived and left untouched.
+    """
+    oldest = oldest_raw_day()
+    if oldest is None:
+        return 0
+    first_day = max(first_day, oldest)
+    if first_day > last_day:
+        return 0
+
+    start, end = _local_bounds(first_day, last_day)
+    rows = (
+        Attendance.objects.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(day=local_date("created_at", start, end))
+        .values("intern_id", "day")
+        .annotate(
+            first=Min("created_at"), last=Max("created_at"), pings=Count("id"),
+            validated_pings=Count("id", filter=Q(location_validated=True)),
+            office=Count("id", filter=Q(in_office=True)), min_distance=Min("office_distance_m"),
+        )
+        .order_by()
+    )
+    days = [
+        AttendanceDay(
+            intern_id=r["intern_id"], day=bucket(r["day"]), first_check_in=r["first"], last_check_in=r["last"],
+            pings=r["pings"], validated_pings=r["validated_pings"], in_office=r["office"] > 0,
+            validated=r["validated_pings"] > 0, min_distance_m=r["min_distance"],
+        )
+        for r in rows
+    ]
+    with transaction.atomic():
+        AttendanceDay.objects.filter(day__gte=first_day, day__lte=last_day).delete()
+        AttendanceDay.objects.bulk_create(days, batch_size=1000)
+        bump(AttendanceDay)
+    return len(days)
+
+
+# ---------- archival ----------
+def archive_dir() -> str:
+    path = str(getattr(settings, "ATTENDANCE_ARCHIVE_DIR", os.path.join(settings.BASE_DIR, "attendance_archive")))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _row(values: dict) -> dict:
+    values["created_at"] = values["created_at"].isoformat()
+    return values
+
+
+def archive_day(day, dry_run=False):
+    """
+    Move one local day of raw pings into a gzip file. Returns (path, rows);
+    path is None when there was nothing to archive.
+    """
+    start, end = _local_bounds(day, day)
+    qs = Attendance.objects.filter(created_at__gte=start, created_at__lt=end)
+    bounds = qs.aggregate(n=Count("id"), lo=Min("id"), hi=Max("id"))
+    if not bounds["n"]:
+        return None, 0
+    path = os.path.join(archive_dir(), f"attendance_{day:%Y-%m-%d}_{bounds['lo']}-{bounds['hi']}.jsonl.gz")
+    if dry_run:
+        return path, bounds["n"]
+
+    # make sure the day row reflects every ping before they go away
+    rebuild_days(day, day)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    written = 0
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        for values in qs.filter(id__lte=bounds["hi"]).order_by("id").values().iterator(chunk_size=2000):
+            f.write(json.dumps(_row(values)) + "\n")
+            written += 1
+    os.replace(tmp, path)
+
+    with transaction.atomic():
+        doomed = Attendance.objects.filter(created_at__gte=start, created_at__lt=end, id__lte=bounds["hi"])
+        # _raw_delete: a plain DELETE without post_delete signals, so the
+        # rollups keep counting the archived pings
+        doomed._raw_delete(doomed.db)
+        bump(Attendance)
+    return path, written
+
+
+def read_archive(path):
+    """Yield the archived pings of one file as dicts (created_at as an aware datetime)."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            values = json.loads(line)
+            values["created_at"] = datetime.fromisoformat(values["created_at"])
+            yield values
+
+
+# ---------- range queries ----------
+def day_range(params):
+    """
+    (first, last) from ?from=YYYY-MM-DD&to=YYYY-MM-DD, or None when neither is
+    given. Raises ValueError for bad dates or a range over ATTENDANCE_RANGE_MAX_DAYS.
+    """
+    if not params.get("from") and not params.get("to"):
+        return None
+    first = datetime.strptime(params.get("from") or "", "%Y-%m-%d").date()
+    last = datetime.strptime(params.get("to") or "", "%Y-%m-%d").date()
+    if last < first:
+        raise ValueError("to is before from")
+    if (last - first).days >= int(getattr(settings, "ATTENDANCE_RANGE_MAX_DAYS", 366)):
+        raise ValueError("range too long")
+    return first, last
+
+
+def day_rows(qs):
+    return [{
+        "intern_id": d.intern_id,
+        "intern": d.intern.full_name,
+        "email": d.intern.email,
+        "day": d.day.isoformat(),
+        "first_check_in": timezone.localtime(d.first_check_in).isoformat(),
+        "last_check_in": timezone.localtime(d.last_check_in).isoformat(),
+        "pings": d.pings,
+        "in_office": d.in_office,
+        "location_validated": d.validated,
+        "min_distance_m": d.min_distance_m,
+    } for d in qs]
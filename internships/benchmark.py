@@ -0,0 +1,307 @@
+"""
+Endpoint benchmark harness used by `manage.py benchmark_endpoints`.
+
+seed() builds a synthetic dataset, run() requests every route of
+internships/urls.py and accounts/urls.py ROUNDS times and records max query
+count, p50/p95 latency and payload size per endpoint, and compare() turns the
+difference against a stored baseline into a list of regressions.
+
+Every route must have an entry in SPECS; a new route without one makes the
+run fail so it cannot silently go unmeasured. internships.tests runs the
+same harness against bench_baseline.json (query counts and payload sizes).
+Re-record the baseline only in a change that means to move those numbers,
+and say which ones moved and why.
+"""
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.tokens import RESET_PASSWORD, VERIFY_EMAIL, make_signed_token
+from .analytics import rebuild_days
+from .attendance import rebuild_days as rebuild_attendance_days
+from .search import rebuild as rebuild_search_index
+from .summaries import rebuild as rebuild_summaries
+from .models import Task, TaskReport, Attendance, Complaint, ActivityLog
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / "bench_baseline.json"
+
+
+def bench_settings() -> dict:
+    """override_settings() kwargs for a run."""
+    return {
+        "EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend",
+        "ACTIVITY_LOG_BUFFERED": False,
+        "PASSWORD_HASHERS": ["django.contrib.auth.hashers.MD5PasswordHasher"],
+        # the deployed setup with shared user and response caches; one process, so local memory is shared
+        "AUTH_USER_CACHE_TTL": 60,
+        "RESPONSE_CACHE_TTL": 300,
+        # every round comes from one client: keep the throttles in the path, never tripped
+        "AUTH_THROTTLE_STORE": "accounts.throttling.InMemoryStore",
+        "AUTH_THROTTLE_RATES": {scope: "1000000/sec" for scope in settings.AUTH_THROTTLE_RATES},
+    }
+
+
+def seed(supervisors=5, interns_per_supervisor=20, tasks_per_intern=10, attendance_per_intern=30, complaints_per_intern=2):
+    password = make_password("bench-pass-123")
+    admin = User.objects.create(email="bench.admin@example.com", full_name="Bench Admin", role="ADMIN",
+                                is_verified=True, password=password)
+
+    User.objects.bulk_create([
+        User(email=f"bench.sup{s}@example.com", full_name=f"Bench Supervisor {s}", role="SUPERVISOR",
+             is_verified=True, password=password)
+        for s in range(supervisors)
+    ])
+    sups = list(User.objects.filter(role="SUPERVISOR", email__startswith="bench.sup").order_by("id"))
+
+    User.objects.bulk_create([
+        User(email=f"bench.intern{s}.{i}@example.com", full_name=f"Bench Intern {s}.{i}", role="INTERN",
+             is_verified=True, password=password, supervisor=sup)
+        for s, sup in enumerate(sups) for i in range(interns_per_supervisor)
+    ])
+    interns = list(User.objects.filter(role="INTERN", email__startswith="bench.intern").order_by("id"))
+
+    statuses = ["IN_PROGRESS", "DONE", "COMPLETED"]
+    Task.objects.bulk_create([
+        Task(supervisor_id=i.supervisor_id, intern=i, title=f"Task {n} for {i.full_name}",
+             description="Synthetic benchmark task " * 4, status=statuses[n % 3],
+             star_rating=(n % 5) + 1 if n % 2 else None)
+        for i in interns for n in range(tasks_per_intern)
+    ], batch_size=1000)
+    tasks = list(Task.objects.values_list("id", "intern_id"))
+    TaskReport.objects.bulk_create([
+        TaskReport(task_id=t, intern_id=i, content="Progress report " * 10) for t, i in tasks
+    ], batch_size=1000)
+
+    Attendance.objects.bulk_create([
+        Attendance(intern=i, in_office=bool(n % 2), lat=27.7, lng=85.3, office_distance_m=float(n),
+                   location_validated=bool(n % 3))
+        for i in interns for n in range(attendance_per_intern)
+    ], batch_size=1000)
+    Complaint.objects.bulk_create([
+        Complaint(intern=i, supervisor_id=i.supervisor_id, subject=f"Complaint {n}", message="Message " * 10)
+        for i in interns for n in range(complaints_per_intern)
+    ], batch_size=1000)
+    ActivityLog.objects.bulk_create([
+        ActivityLog(actor_id=iid, action=f"Updated task {t} -> DONE", event_type="TASK_STATUS",
+                    target_model="task", target_id=t, subject_id=iid, payload={"status": "DONE"})
+        for t, iid in tasks[:2000]
+    ], batch_size=1000)
+
+    # bulk_create skips the rollup / summary signals
+    today = timezone.localdate()
+    rebuild_attendance_days(today, today)
+    rebuild_days(today, today)
+    rebuild_summaries()
+    rebuild_search_index()
+
+    # spare rows that mutating endpoints may change without disturbing the rest
+    spare = User.objects.create(email="bench.spare@example.com", full_name="Bench Spare", role="INTERN",
+                                is_verified=True, password=password, supervisor=sups[0])
+
+    sup = sups[0]
+    intern = next(i for i in interns if i.supervisor_id == sup.id)
+    return {
+        "admin": admin,
+        "supervisor": sup,
+        "intern": intern,
+        "spare": spare,
+        "task_id": Task.objects.filter(intern=intern).values_list("id", flat=True).first(),
+        "complaint_id": Complaint.objects.filter(intern=intern).values_list("id", flat=True).first(),
+        "password": password,
+        "sizes": {
+            "supervisors": supervisors, "interns": len(interns), "tasks": len(tasks),
+            "attendance": len(interns) * attendance_per_intern, "complaints": len(interns) * complaints_per_intern,
+        },
+    }
+
+
+def _now_month():
+    now = timezone.localtime()
+    return {"year": now.year, "month": now.month}
+
+
+def _month_days():
+    today = timezone.localdate()
+    return {"from": f"{today:%Y-%m}-01", "to": today.isoformat()}
+
+
+def _verify_token(ctx, n):
+    u = User.objects.create(email=f"bench.verify{n}@example.com", full_name="Verify", role="INTERN", password=ctx["password"])
+    return {"token": make_signed_token(u, VERIFY_EMAIL)}
+
+
+def _reset_token(ctx, n):
+    u = User.objects.create(email=f"bench.reset{n}@example.com", full_name="Reset", role="INTERN",
+                            is_verified=True, password=ctx["password"])
+    return {"token": make_signed_token(u, RESET_PASSWORD), "new_password": "bench-pass-456"}
+
+
+def _delete_victim(ctx, n):
+    u = User.objects.create(email=f"bench.victim{n}@example.com", full_name="Victim", role="INTERN", password=ctx["password"])
+    return f"admin/delete-user/{u.id}/"
+
+
+def _cohort_csv(ctx, n):
+    rows = User.objects.filter(role="INTERN").values_list("email", "supervisor__email")
+    return {"csv": "\n".join(f"{i},{s or ''}" for i, s in rows), "dry_run": True}
+
+
+# (name, app, route, role, method, path builder, data builder)
+# builders take (ctx, n); their work is done before the timed request.
+SPECS = [
+    ("admin analytics", "internships", "admin/analytics/", "admin", "get", None, None),
+    ("admin analytics range", "internships", "admin/analytics/", "admin", "get", None,
+     lambda ctx, n: {"from": f"{timezone.localdate():%Y-%m}-01", "to": timezone.localdate().isoformat(), "group": "day"}),
+    ("admin activity", "internships", "admin/activity/", "admin", "get", None, None),
+    ("admin activity filtered", "internships", "admin/activity/", "admin", "get", None,
+     lambda ctx, n: {"event_type": "TASK_STATUS", "page_size": 50}),
+    ("admin assignments data", "internships", "admin/assignments/data/", "admin", "get", None, None),
+    ("admin assign", "internships", "admin/assignments/assign/", "admin", "post", None,
+     lambda ctx, n: {"intern_id": ctx["spare"].id, "supervisor_id": ctx["supervisor"].id}),
+    ("admin unassign", "internships", "admin/assignments/unassign/", "admin", "post", None,
+     lambda ctx, n: {"intern_id": ctx["spare"].id}),
+    ("admin bulk assign dry run", "internships", "admin/assignments/bulk/", "admin", "post", None, _cohort_csv),
+    ("admin bulk assign", "internships", "admin/assignments/bulk/", "admin", "post", None,
+     lambda ctx, n: {"assignments": [{"intern": ctx["spare"].id, "supervisor": ctx["supervisor"].id if n % 2 else None}]}),
+    ("admin attendance", "internships", "admin/attendance/", "admin", "get", None, None),
+    ("admin attendance range", "internships", "admin/attendance/", "admin", "get", None, lambda ctx, n: _month_days()),
+    ("admin complaints", "internships", "admin/complaints/", "admin", "get", None, None),
+    ("admin progress", "internships", "admin/progress/", "admin", "get", None, None),
+    ("admin report csv", "internships", "admin/reports/monthly/csv/", "admin", "get", None, lambda ctx, n: _now_month()),
+    ("admin report pdf", "internships", "admin/reports/monthly/pdf/", "admin", "get", None, lambda ctx, n: _now_month()),
+    ("admin cache stats", "internships", "admin/cache/stats/", "admin", "get", None, None),
+
+    ("supervisor interns", "internships", "supervisor/interns/", "supervisor", "get", None, None),
+    ("supervisor roster", "internships", "supervisor/roster/", "supervisor", "get", None, None),
+    ("supervisor task create", "internships", "supervisor/tasks/create/", "supervisor", "post", None,
+     lambda ctx, n: {"intern": ctx["intern"].id, "title": f"Bench task {n}"}),
+    ("supervisor task bulk", "internships", "supervisor/tasks/bulk/", "supervisor", "post", None,
+     lambda ctx, n: {"template": {"title": f"bench bulk {n}", "description": "x"}, "interns": "all"}),
+    ("supervisor tasks", "internships", "supervisor/tasks/", "supervisor", "get", None, None),
+    ("supervisor tasks page", "internships", "supervisor/tasks/", "supervisor", "get", None, lambda ctx, n: {"page_size": 50}),
+    ("supervisor rate task", "internships", "supervisor/tasks/<int:task_id>/rate/", "supervisor", "post",
+     lambda ctx, n: f"supervisor/tasks/{ctx['task_id']}/rate/", lambda ctx, n: {"star_rating": n % 5 + 1}),
+    ("supervisor monthly progress", "internships", "supervisor/progress/monthly/", "supervisor", "get", None, None),
+    ("supervisor attendance", "internships", "supervisor/attendance/", "supervisor", "get", None, None),
+    ("supervisor attendance range", "internships", "supervisor/attendance/", "supervisor", "get", None, lambda ctx, n: _month_days()),
+    ("supervisor reports", "internships", "supervisor/reports/", "supervisor", "get", None, None),
+    ("supervisor complaints", "internships", "supervisor/complaints/", "supervisor", "get", None, None),
+    ("supervisor complaint status", "internships", "supervisor/complaints/<int:complaint_id>/status/", "supervisor", "post",
+     lambda ctx, n: f"supervisor/complaints/{ctx['complaint_id']}/status/", lambda ctx, n: {"status": "IN_REVIEW"}),
+
+    ("intern supervisor", "internships", "intern/supervisor/", "intern", "get", None, None),
+    ("intern tasks", "internships", "intern/tasks/", "intern", "get", None, None),
+    ("intern tasks page", "internships", "intern/tasks/", "intern", "get", None, lambda ctx, n: {"page_size": 50}),
+    ("intern task status", "internships", "intern/tasks/<int:task_id>/status/", "intern", "post",
+     lambda ctx, n: f"intern/tasks/{ctx['task_id']}/status/", lambda ctx, n: {"status": "DONE"}),
+    ("intern task report", "internships", "intern/tasks/<int:task_id>/report/", "intern", "post",
+     lambda ctx, n: f"intern/tasks/{ctx['task_id']}/report/", lambda ctx, n: {"content": "Bench report"}),
+    ("intern mark attendance", "internships", "intern/attendance/mark/", "intern", "post", None,
+     lambda ctx, n: {"in_office": True, "lat": 27.7, "lng": 85.3}),
+    ("intern complaints", "internships", "intern/complaints/", "intern", "get", None, None),
+    ("intern complaint create", "internships", "intern/complaints/", "intern", "post", None,
+     lambda ctx, n: {"subject": f"Bench {n}", "message": "Bench complaint"}),
+
+    ("search admin", "internships", "search/", "admin", "get", None, lambda ctx, n: {"q": "task 1"}),
+    ("search supervisor", "internships", "search/", "supervisor", "get", None,
+     lambda ctx, n: {"q": "complaint", "kind": "complaint,report"}),
+
+    ("me", "accounts", "me/", "intern", "get", None, None),
+    ("signup", "accounts", "signup/", None, "post", None,
+     lambda ctx, n: {"email": f"bench.signup{n}@example.com", "full_name": "Signup", "password": "bench-pass-123", "role": "INTERN"}),
+    ("verify email", "accounts", "verify-email/", None, "post", None, _verify_token),
+    ("forgot password", "accounts", "forgot-password/", None, "post", None,
+     lambda ctx, n: {"email": ctx["intern"].email}),
+    ("reset password", "accounts", "reset-password/", None, "post", None, _reset_token),
+    ("admin users", "accounts", "admin/users/", "admin", "get", None, None),
+    ("admin delete user", "accounts", "admin/delete-user/<int:user_id>/", "admin", "delete", _delete_victim, None),
+    ("admin throttle stats", "accounts", "admin/throttle/stats/", "admin", "get", None, None),
+]
+
+URL_PREFIX = {"internships": "/api/internships/", "accounts": "/api/accounts/"}
+
+
+def missing_specs() -> list[str]:
+    from accounts.urls import urlpatterns as account_urls
+    from .urls import urlpatterns as internship_urls
+
+    covered = {(app, route) for _, app, route, *_ in SPECS}
+    routes = [("internships", str(p.pattern)) for p in internship_urls] + [("accounts", str(p.pattern)) for p in account_urls]
+    return [f"{app}:{route}" for app, route in routes if (app, route) not in covered]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    k = (len(values) - 1) * pct
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def run(ctx, rounds=10, only=None) -> dict:
+    clients = {None: APIClient()}
+    for role in ("admin", "supervisor", "intern"):
+        c = APIClient()
+        c.force_authenticate(ctx[role])
+        clients[role] = c
+
+    results = {}
+    for name, app, route, role, method, path_fn, data_fn in SPECS:
+        if only and name not in only:
+            continue
+        client = clients[role]
+        timings, queries, sizes, statuses = [], [], [], set()
+        for n in range(rounds):
+            path = path_fn(ctx, n) if path_fn else route
+            data = data_fn(ctx, n) if data_fn else None
+            url = URL_PREFIX[app] + path
+
+            with CaptureQueriesContext(connection) as q:
+                started = time.perf_counter()
+                if method == "get":
+                    resp = client.get(url, data)
+                else:
+                    resp = getattr(client, method)(url, data, format="json")
+                body = b"".join(resp.streaming_content) if resp.streaming else resp.content
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(q))
+            sizes.append(len(body))
+            statuses.add(resp.status_code)
+
+        results[name] = {
+            "queries": max(queries),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(_percentile(timings, 0.95), 2),
+            "bytes": max(sizes),
+            "status": sorted(statuses),
+        }
+    return results
+
+
+def compare(current: dict, baseline: dict, latency_tolerance=0.5, size_tolerance=0.1, min_latency_ms=5.0, check_latency=True):
+    problems = []
+    for name, cur in current.items():
+        if any(s >= 400 for s in cur["status"]):
+            problems.append(f"{name}: HTTP {cur['status']}")
+        base = baseline.get(name)
+        if not base:
+            continue
+        if cur["queries"] > base["queries"]:
+            problems.append(f"{name}: queries {base['queries']} -> {cur['queries']}")
+        if cur["bytes"] > base["bytes"] * (1 + size_tolerance):
+            problems.append(f"{name}: payload {base['bytes']}B -> {cur['bytes']}B")
+        if check_latency:
+            limit = max(base["p95_ms"] * (1 + latency_tolerance), base["p95_ms"] + min_latency_ms)
+            if cur["p95_ms"] > limit:
+                problems.append(f"{name}: p95 {base['p95_ms']}ms -> {cur['p95_ms']}ms")
+    return problems
+
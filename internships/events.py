@@ -0,0 +1,288 @@
+"""
+Push events for the dashboards.
+
+Views call publish_event() after a change; every open /api/events/ stream
+(internships/sse.py) whose user matches one of the target channels gets the
+event. Channels are "user:<id>" and "role:<ROLE>".
+
+The broker is EVENTS_BROKER (dotted path to a Broker subclass). The default
+InMemoryBroker only reaches streams served by the same process, which is the
+single-process setup (runserver, one uvicorn worker). DatabaseBroker goes
+through the PushEvent table, so any number of worker processes share it;
+a broker on real pub/sub would implement the same publish()/subscribe() pair.
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+
+TASK_ASSIGNED = "task.assigned"
+TASK_STATUS = "task.status"
+TASK_RATED = "task.rated"
+COMPLAINT_CREATED = "complaint.created"
+COMPLAINT_STATUS = "complaint.status"
+ACTIVITY_CREATED = "activity.created"
+
+
+def user_channel(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def role_channel(role) -> str:
+    return f"role:{role}"
+
+
+class Subscription:
+    """One open stream. The broker feeds it, the SSE app drains it."""
+
+    def __init__(self, broker, channels, maxsize):
+        self.broker = broker
+        self.channels = frozenset(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def _put(self, event):
+        # runs on the subscriber's loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # a client this far behind is cut off and catches up from the
+            # backlog when it reconnects with Last-Event-ID
+            self.overflowed = True
+
+    def deliver(self, event):
+        """Thread-safe: called from whatever thread published."""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    async def next(self, timeout):
+        """The next event, or None after `timeout` seconds without one (or once overflowed)."""
+        if self.overflowed:
+            return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    def publish(self, channels, kind: str, data) -> dict:
+        raise NotImplementedError
+
+    def subscribe(self, channels, last_id=None) -> Subscription:
+        """Must be called from the event loop that will drain the subscription."""
+        raise NotImplementedError
+
+    def unsubscribe(self, sub: Subscription):
+        raise NotImplementedError
+
+
+class InMemoryBroker(Broker):
+    """
+    Process-local fan-out. Keeps the last EVENTS_BACKLOG events so a client
+    reconnecting with Last-Event-ID is replayed what it missed.
+    """
+
+    def __init__(self, backlog=None, queue_size=None):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._subs = {}
+        self._backlog = deque(maxlen=backlog or getattr(settings, "EVENTS_BACKLOG", 500))
+        self._queue_size = queue_size or getattr(settings, "EVENTS_QUEUE_SIZE", 200)
+
+    def publish(self, channels, kind, data):
+        channels = set(channels)
+        with self._lock:
+            event = {"id": next(self._ids), "event": kind, "data": json.dumps(data, default=str)}
+            self._backlog.append((channels, event))
+            targets = {s for c in channels for s in self._subs.get(c, ())}
+        for sub in targets:
+            try:
+                sub.deliver(event)
+            except RuntimeError:
+                # loop already closed; the stream is gone
+                self.unsubscribe(sub)
+        return event
+
+    def subscribe(self, channels, last_id=None):
+        sub = Subscription(self, channels, self._queue_size)
+        with self._lock:
+            for c in sub.channels:
+                self._subs.setdefault(c, set()).add(sub)
+            if last_id is not None:
+                for chans, event in self._backlog:
+                    if event["id"] > last_id and chans & sub.channels:
+                        sub._put(event)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            for c in sub.channels:
+                subs = self._subs.get(c)
+                if subs:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subs[c]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len({s for subs in self._subs.values() for s in subs})
+
+
+class DatabaseBroker(InMemoryBroker):
+    """
+    Cross-process fan-out through the PushEvent table, driven by one thread
+    per process that ticks every EVENTS_POLL_SECONDS. publish() only queues
+    the event in memory, so a request never waits on an extra INSERT; each
+    tick writes the queued events with one bulk_create and then, while this
+    process has streams open, reads the rows past the last id it has seen
+    and delivers them. Event ids are the row ids, so Last-Event-ID replays
+    from the table whichever worker the client reconnects to. subscribe()
+    runs on the event loop and never queries; the poller does the replay on
+    its next tick.
+
+    Events still queued when a process dies are lost, and a row that commits
+    after a higher id has already been polled is not delivered live (two
+    processes writing within one poll); both only cost a live update the
+    client picks up on its next refetch. At most EVENTS_BACKLOG events wait
+    in memory while the database is unreachable. PushEvent rows are pruned
+    by the push_events retention policy.
+    """
+
+    def __init__(self, backlog=None, queue_size=None):
+        super().__init__(backlog, queue_size)
+        self._poll_seconds = float(getattr(settings, "EVENTS_POLL_SECONDS", 1))
+        self._replays = []  # (subscription, last_id) for the next tick
+        self._pending = deque(maxlen=self._backlog.maxlen)  # PushEvents for the next tick
+        self._last_id = None
+        self._thread = None
+
+    def publish(self, channels, kind, data):
+        """Queues the event for the poller; the id is only known once it is written, so returns None."""
+        from .models import PushEvent
+
+        row = PushEvent(channels=sorted(set(channels)), kind=kind, data=json.dumps(data, default=str))
+        with self._lock:
+            self._pending.append(row)
+        self._ensure_thread()
+
+    def subscribe(self, channels, last_id=None):
+        sub = Subscription(self, channels, self._queue_size)
+        with self._lock:
+            for c in sub.channels:
+                self._subs.setdefault(c, set()).add(sub)
+            if last_id is not None:
+                self._replays.append((sub, last_id))
+        self._ensure_thread()
+        return sub
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="events-poller", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.flush()
+                self.poll()
+            except Exception:
+                pass  # the database is unreachable; the next tick retries the same rows and id
+            finally:
+                close_old_connections()
+            time.sleep(self._poll_seconds)
+
+    def flush(self):
+        """Write the events published in this process since the last tick."""
+        from .models import PushEvent
+
+        with self._lock:
+            rows = list(self._pending)
+            self._pending.clear()
+        if not rows:
+            return
+        try:
+            PushEvent.objects.bulk_create(rows, batch_size=500)
+        except Exception:
+            with self._lock:
+                self._pending.extendleft(reversed(rows))
+            raise
+
+    def poll(self):
+        """One tick: replays for new subscriptions, then the rows published since the last tick."""
+        from .models import PushEvent
+
+        with self._lock:
+            idle = not self._subs and not self._replays
+        if idle:
+            self._last_id = None  # nothing to deliver; start at the tail once a stream opens
+            return
+        if self._last_id is None:
+            # start at the tail: earlier events only go to clients that ask with Last-Event-ID
+            self._last_id = PushEvent.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        with self._lock:
+            replays, self._replays = self._replays, []
+        for sub, last_id in replays:
+            rows = (
+                PushEvent.objects.filter(id__gt=max(last_id, self._last_id - self._backlog.maxlen),
+                                         id__lte=self._last_id)
+                .order_by("id")
+            )
+            try:
+                for row in rows:
+                    if sub.channels.intersection(row.channels):
+                        sub.deliver(self._event(row))
+            except RuntimeError:
+                self.unsubscribe(sub)
+
+        rows = list(PushEvent.objects.filter(id__gt=self._last_id).order_by("id")[:1000])
+        for row in rows:
+            with self._lock:
+                targets = {s for c in row.channels for s in self._subs.get(c, ())}
+            event = self._event(row)
+            for sub in targets:
+                try:
+                    sub.deliver(event)
+                except RuntimeError:
+                    self.unsubscribe(sub)
+        if rows:
+            self._last_id = rows[-1].id
+
+    @staticmethod
+    def _event(row) -> dict:
+        return {"id": row.id, "event": row.kind, "data": row.data}
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> Broker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, "EVENTS_BROKER", "internships.events.InMemoryBroker")
+                _broker = import_string(path)()
+    return _broker
+
+
+def publish_event(kind: str, data, users=(), roles=()):
+    """Send `data` to the given user ids / roles once the current transaction commits."""
+    channels = [user_channel(u) for u in users if u] + [role_channel(r) for r in roles]
+    if not channels or not getattr(settings, "EVENTS_ENABLED", True):
+        return
+    transaction.on_commit(lambda: get_broker().publish(channels, kind, data))
@@ -0,0 +1,152 @@
+"""
+Attendance geofence.
+
+The active OfficeSite rows (or, when there are none, the single
+OFFICE_LAT/OFFICE_LNG/OFFICE_RADIUS_M site from settings) are loaded once into
+NumPy arrays and reused until a site changes or GEOFENCE_RELOAD_SECONDS pass.
+
+check() works on whole arrays of points:
+  * bounding boxes (radius converted to degrees) pick the (point, site) pairs
+    that can possibly be inside a fence; only those get an exact haversine
+    for the validated flag;
+  * the nearest site is chosen with an equirectangular approximation (no
+    per-pair trig) and only that one distance is computed exactly.
+A point inside a fence is reported against the closest site whose fence it
+is in (which need not be the nearest site when radii differ); any other
+point against the nearest site. That site's distance is what
+office_distance_m stores.
+
+The single-ping path in InternMarkAttendance and the bulk
+`manage.py revalidate_attendance` both go through it.
+"""
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import OfficeSite
+
+EARTH_RADIUS_M = 6371000.0
+M_PER_DEG = EARTH_RADIUS_M * np.pi / 180
+# the boxes only pick candidates for the exact check, so they err on the large side
+BOX_SLACK = 1.01
+
+
+class Geofence:
+    def __init__(self, sites):
+        self.names = [s["name"] for s in sites]
+        lat = np.array([s["lat"] for s in sites], dtype=np.float64)
+        lng = np.array([s["lng"] for s in sites], dtype=np.float64)
+        self.radius = np.array([s["radius_m"] for s in sites], dtype=np.float64)
+
+        self.lat_r = np.radians(lat)
+        self.lng_r = np.radians(lng)
+        self.cos_lat = np.cos(self.lat_r)
+
+        dlat = self.radius * BOX_SLACK / M_PER_DEG
+        dlng = self.radius * BOX_SLACK / (M_PER_DEG * np.maximum(self.cos_lat, 1e-6))
+        self.box = (lat - dlat, lat + dlat, lng - dlng, lng + dlng)
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def _haversine(lat1_r, lng1_r, lat2_r, lng2_r, cos1, cos2):
+        a = np.sin((lat2_r - lat1_r) / 2) ** 2 + cos1 * cos2 * np.sin((lng2_r - lng1_r) / 2) ** 2
+        return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def check(self, lats, lngs):
+        """
+        -> (distance_m, validated, site index) arrays; the site is the one
+        that accepted the point, or the nearest one if none did.
+        Points must be finite; callers drop rows without coordinates first.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        n = lats.shape[0]
+        if not len(self) or not n:
+            return np.full(n, np.nan), np.zeros(n, dtype=bool), np.full(n, -1)
+
+        p_lat = np.radians(lats)
+        p_lng = np.radians(lngs)
+        p_cos = np.cos(p_lat)
+
+        # nearest site: planar distance on the sites' own latitude scale
+        dy = p_lat[:, None] - self.lat_r[None, :]
+        dx = (p_lng[:, None] - self.lng_r[None, :]) * self.cos_lat[None, :]
+        nearest = np.argmin(dx * dx + dy * dy, axis=1)
+        distance = self._haversine(
+            p_lat, p_lng, self.lat_r[nearest], self.lng_r[nearest], p_cos, self.cos_lat[nearest],
+        )
+
+        # validated: exact check only where a point falls inside a site's box
+        lat_lo, lat_hi, lng_lo, lng_hi = self.box
+        in_box = (
+            (lats[:, None] >= lat_lo) & (lats[:, None] <= lat_hi)
+            & (lngs[:, None] >= lng_lo) & (lngs[:, None] <= lng_hi)
+        )
+        validated = np.zeros(n, dtype=bool)
+        pi, si = np.nonzero(in_box)
+        if pi.size:
+            d = self._haversine(p_lat[pi], p_lng[pi], self.lat_r[si], self.lng_r[si], p_cos[pi], self.cos_lat[si])
+            inside = d <= self.radius[si]
+            validated[pi[inside]] = True
+            # report the accepting site; farthest first, so the closest one is written last
+            order = np.argsort(d[inside])[::-1]
+            nearest[pi[inside][order]] = si[inside][order]
+            distance[pi[inside][order]] = d[inside][order]
+        return distance, validated, nearest
+
+    def check_one(self, lat, lng):
+        """-> (distance_m, validated, site index or None) for a single point."""
+        distance, validated, site = self.check([lat], [lng])
+        if site[0] < 0:
+            return None, False, None
+        return float(distance[0]), bool(validated[0]), int(site[0])
+
+
+def load_sites() -> list[dict]:
+    sites = list(OfficeSite.objects.filter(is_active=True).order_by("id").values("name", "lat", "lng", "radius_m"))
+    if sites:
+        return sites
+    lat = float(getattr(settings, "OFFICE_LAT", 0) or 0)
+    lng = float(getattr(settings, "OFFICE_LNG", 0) or 0)
+    if lat and lng:
+        return [{"name": "office", "lat": lat, "lng": lng,
+                 "radius_m": float(getattr(settings, "OFFICE_RADIUS_M", 150) or 150)}]
+    return []
+
+
+_fence = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def get_geofence() -> Geofence:
+    global _fence, _loaded_at
+    ttl = float(getattr(settings, "GEOFENCE_RELOAD_SECONDS", 60))
+    if _fence is None or time.monotonic() - _loaded_at > ttl:
+        with _lock:
+            if _fence is None or time.monotonic() - _loaded_at > ttl:
+                _fence = Geofence(load_sites())
+                _loaded_at = time.monotonic()
+    return _fence
+
+
+@receiver(post_save, sender=OfficeSite)
+@receiver(post_delete, sender=OfficeSite)
+def _sites_changed(sender, **kwargs):
+    # this process reloads on next use; others within GEOFENCE_RELOAD_SECONDS
+    global _fence
+    _fence = None
+
+
+@receiver(setting_changed)
+def _settings_changed(setting, **kwargs):
+    global _fence
+    if setting.startswith(("OFFICE_", "GEOFENCE_")):
+        _fence = None
@@ -0,0 +1,62 @@
+"""
+Local-day / local-month buckets in SQL that do not depend on the database's
+time zone data.
+
+Datetimes are stored in UTC. TruncDate / TruncMonth(tzinfo=...) have the
+database convert them, and MySQL's CONVERT_TZ returns NULL unless the
+server's time zone tables are loaded (mysql_tzinfo_to_sql), which nothing
+else here needs. TIME_ZONE (Asia/Kathmandu, +05:45) has no DST, so for a
+range over which the offset does not change these add the offset to the UTC
+value and truncate that as UTC, which every database does on its own.
+
+Only a zone whose offset changes inside the range falls back to
+TruncDate / TruncMonth(tzinfo=...); on MySQL that needs the time zone
+tables, and bucket() raises ImproperlyConfigured for the NULLs it returns
+without them instead of letting them through as day or month keys.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import DateTimeField, ExpressionWrapper, F
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+
+def fixed_offset(start, end):
+    """The current time zone's UTC offset if it is the same all through [start, end], else None."""
+    tz = timezone.get_current_timezone()
+    offset = end.astimezone(tz).utcoffset()
+    t = start
+    while t < end:
+        if t.astimezone(tz).utcoffset() != offset:
+            return None
+        t += timedelta(days=1)
+    return offset
+
+
+def _truncate(trunc, field, start, end):
+    offset = fixed_offset(start, end)
+    if offset is None:
+        return trunc(field, tzinfo=timezone.get_current_timezone())
+    shifted = ExpressionWrapper(F(field) + offset, output_field=DateTimeField())
+    return trunc(shifted, tzinfo=dt_timezone.utc)
+
+
+def local_date(field, start, end):
+    """TruncDate(field) in the current time zone, for rows with start <= field < end."""
+    return _truncate(TruncDate, field, start, end)
+
+
+def local_month(field, start, end):
+    """TruncMonth(field) in the current time zone (a datetime at the month start), for start <= field < end."""
+    return _truncate(TruncMonth, field, start, end)
+
+
+def bucket(value):
+    """A day or month read back from local_date() / local_month()."""
+    if value is None:
+        raise ImproperlyConfigured(
+            "The database returned NULL converting to TIME_ZONE; on MySQL, load the time zone "
+            "tables (mysql_tzinfo_to_sql) when TIME_ZONE observes DST."
+        )
+    return value
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from internships.retention import ARCHIVE, DELETE, POLICIES, apply
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete or archive expired ActivityLog entries and auth tokens (internships/retention.py policies) "
+        "in small chunked transactions, reporting rows/second per table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", nargs="*", help="Policy names to run (default: all)")
+        parser.add_argument("--chunk-size", type=int, default=0, help="Rows per transaction (default RETENTION_CHUNK_SIZE)")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between chunks")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the expired rows")
+
+    def handle(self, *args, **opts):
+        if opts["chunk_size"] < 0:
+            raise CommandError("--chunk-size must be positive")
+        names = [p.name for p in POLICIES]
+        unknown = set(opts["only"] or []) - set(names)
+        if unknown:
+            raise CommandError(f"Unknown policy: {', '.join(sorted(unknown))} (have: {', '.join(names)})")
+
+        for policy in POLICIES:
+            if opts["only"] and policy.name not in opts["only"]:
+                continue
+            if policy.action not in (ARCHIVE, DELETE):
+                raise CommandError(f"{policy.name}: action must be {ARCHIVE} or {DELETE}, not {policy.action!r}")
+            r = apply(policy, chunk_size=opts["chunk_size"] or None, pause=opts["pause"], dry_run=opts["dry_run"])
+            label = f"{policy.name} (older than {policy.keep_days}d, {policy.action})"
+            if opts["dry_run"]:
+                self.stdout.write(f"{label}: {r['rows']} rows would go")
+            elif not r["rows"]:
+                self.stdout.write(f"{label}: nothing expired")
+            else:
+                verb = "archived" if r["path"] else "deleted"
+                self.stdout.write(self.style.SUCCESS(
+                    f"{label}: {r['rows']} rows {verb} in {r['seconds']:.1f}s ({r['rows_per_second']:.0f}/s)"
+                    + (f" -> {r['path']}" if r["path"] else "")
+                ))
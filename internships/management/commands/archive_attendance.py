@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from internships.attendance import archive_day, oldest_raw_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Move raw attendance pings older than the retention window into gzipped JSON-lines files, "
+        "one local day at a time. AttendanceDay keeps the per-day history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int,
+                            default=getattr(settings, "ATTENDANCE_RAW_RETENTION_DAYS", 90),
+                            help="Keep this many days of raw pings (default ATTENDANCE_RAW_RETENTION_DAYS)")
+        parser.add_argument("--max-days", type=int, default=0, help="Archive at most N days per run (0 = no limit)")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be archived")
+
+    def handle(self, *args, **opts):
+        if opts["older_than_days"] < 1:
+            raise CommandError("--older-than-days must be at least 1")
+
+        cutoff = timezone.localdate() - timedelta(days=opts["older_than_days"])
+        day = oldest_raw_day()
+        if day is None or day >= cutoff:
+            self.stdout.write("Nothing to archive.")
+            return
+
+        days = rows = 0
+        while day < cutoff:
+            path, n = archive_day(day, dry_run=opts["dry_run"])
+            if path:
+                days += 1
+                rows += n
+                self.stdout.write(f"{day}: {n} pings -> {path}")
+                if opts["max_days"] and days >= opts["max_days"]:
+                    break
+            day += timedelta(days=1)
+
+        verb = "Would archive" if opts["dry_run"] else "Archived"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {rows} pings from {days} day(s) before {cutoff}"))
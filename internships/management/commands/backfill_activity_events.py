@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Lower
+
+from accounts.models import User
+from internships.activity import EVENT_TARGET, parse_action
+from internships.models import ActivityLog, Complaint, Task
+from internships.response_cache import bump
+
+# events whose actor is the intern they are about
+ACTOR_IS_SUBJECT = {"TASK_STATUS", "TASK_REPORTED", "ATTENDANCE_MARKED", "COMPLAINT_CREATED"}
+# events whose text has no intern: the subject is the target row's intern
+SUBJECT_FROM_TARGET = {"TASK_RATED": Task, "COMPLAINT_STATUS": Complaint}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill event_type, target, subject and payload of ActivityLog rows written before those columns "
+        "existed, by parsing their action text. Rows whose text matches no event stay OTHER; "
+        "safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be filled in")
+
+    def handle(self, *args, **opts):
+        if opts["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        qs = ActivityLog.objects.filter(event_type="OTHER").order_by("id")
+        last_id, scanned, filled = 0, 0, 0
+        while True:
+            rows = list(qs.filter(id__gt=last_id).only("id", "actor_id", "action")[:opts["batch_size"]])
+            if not rows:
+                break
+            last_id = rows[-1].id
+            scanned += len(rows)
+            changed = self._fill(rows)
+            filled += len(changed)
+            if changed and not opts["dry_run"]:
+                ActivityLog.objects.bulk_update(
+                    changed, ["event_type", "target_model", "target_id", "subject", "payload"], batch_size=500,
+                )
+        if filled and not opts["dry_run"]:
+            bump(ActivityLog)  # bulk_update skips the cache signals
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} untyped entries, {filled} {'would be filled' if opts['dry_run'] else 'filled'}"
+        ))
+
+    def _fill(self, rows):
+        parsed = [(log, *parse_action(log.action)) for log in rows]
+        parsed = [p for p in parsed if p[1] != "OTHER"]
+
+        emails = {v[k].lower() for _, _, v in parsed for k in ("subject", "supervisor") if k in v}
+        users = dict(
+            User.objects.annotate(email_lower=Lower("email")).filter(email_lower__in=emails)
+            .values_list("email_lower", "id")
+        ) if emails else {}
+        interns = {}
+        for event_type, model in SUBJECT_FROM_TARGET.items():
+            ids = {v.get("target_id") for _, e, v in parsed if e == event_type}
+            if ids:
+                interns[event_type] = dict(model.objects.filter(id__in=ids).values_list("id", "intern_id"))
+
+        changed = []
+        for log, event_type, values in parsed:
+            payload = {k: v for k, v in values.items() if k not in ("target_id", "subject")}
+            subject_id = None
+            if event_type in ACTOR_IS_SUBJECT:
+                subject_id = log.actor_id
+            elif event_type in SUBJECT_FROM_TARGET:
+                subject_id = interns[event_type].get(values.get("target_id"))
+            elif "subject" in values:
+                subject_id = users.get(str(values["subject"]).lower())
+            if "supervisor" in payload:
+                payload["supervisor_id"] = users.get(str(payload["supervisor"]).lower())
+
+            log.event_type = event_type
+            log.target_model = EVENT_TARGET.get(event_type, "")
+            # assignments target the intern, whose id is only known via the email
+            log.target_id = subject_id if log.target_model == "user" else values.get("target_id")
+            log.subject_id = subject_id
+            log.payload = payload
+            changed.append(log)
+        return changed
@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.test.runner import DiscoverRunner
+
+from internships import benchmark
+
+DEFAULT_BASELINE = benchmark.BASELINE_PATH
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database, hit every API route and compare query counts, "
+        "p50/p95 latency and payload size against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--supervisors", type=int, default=5)
+        parser.add_argument("--interns-per-supervisor", type=int, default=20)
+        parser.add_argument("--tasks-per-intern", type=int, default=10)
+        parser.add_argument("--attendance-per-intern", type=int, default=30)
+        parser.add_argument("--rounds", type=int, default=10, help="Requests per endpoint")
+        parser.add_argument("--only", nargs="*", help="Endpoint names to run (default: all)")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+        parser.add_argument("--latency-tolerance", type=float, default=0.5, help="Allowed p95 growth, 0.5 = +50%%")
+        parser.add_argument("--size-tolerance", type=float, default=0.1, help="Allowed payload growth, 0.1 = +10%%")
+        parser.add_argument("--no-latency", action="store_true", help="Only gate on query counts and payload size")
+        parser.add_argument("--json", action="store_true", help="Print raw results as JSON")
+
+    def handle(self, *args, **opts):
+        missing = benchmark.missing_specs()
+        if missing:
+            raise CommandError(f"No benchmark spec for route(s): {', '.join(missing)} (add them to internships/benchmark.SPECS)")
+
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(**benchmark.bench_settings()):
+                ctx = benchmark.seed(
+                    supervisors=opts["supervisors"],
+                    interns_per_supervisor=opts["interns_per_supervisor"],
+                    tasks_per_intern=opts["tasks_per_intern"],
+                    attendance_per_intern=opts["attendance_per_intern"],
+                )
+                self.stdout.write("dataset: " + ", ".join(f"{k}={v}" for k, v in ctx["sizes"].items()))
+                results = benchmark.run(ctx, rounds=opts["rounds"], only=opts["only"])
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        if opts["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.stdout.write(f"{'endpoint':32} {'queries':>7} {'p50 ms':>9} {'p95 ms':>9} {'bytes':>10}  status")
+            for name, r in results.items():
+                self.stdout.write(
+                    f"{name:32} {r['queries']:>7} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['bytes']:>10}  {r['status']}"
+                )
+
+        path = Path(opts["baseline"])
+        if opts["update_baseline"]:
+            baseline = json.loads(path.read_text()) if path.exists() and opts["only"] else {}
+            baseline.update(results)
+            path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {path}"))
+            return
+
+        baseline = json.loads(path.read_text()) if path.exists() else {}
+        if not baseline:
+            self.stdout.write(self.style.WARNING(f"No baseline at {path}; run with --update-baseline to create one."))
+
+        problems = benchmark.compare(
+            results, baseline,
+            latency_tolerance=opts["latency_tolerance"],
+            size_tolerance=opts["size_tolerance"],
+            check_latency=not opts["no_latency"],
+        )
+        for p in problems:
+            self.stdout.write(self.style.ERROR(f"REGRESSION {p}"))
+        if problems:
+            raise CommandError(f"{len(problems)} benchmark regression(s)")
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+
+from accounts.renderers import FastJSONRenderer
+from internships import benchmark
+from internships.models import Task
+from internships.serializers import TASK_ROWS, TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and time the task list hot path: TaskSerializer + JSONRenderer "
+        "against TASK_ROWS + FastJSONRenderer. Fails if the two produce different bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--supervisors", type=int, default=5)
+        parser.add_argument("--interns-per-supervisor", type=int, default=20)
+        parser.add_argument("--tasks-per-intern", type=int, default=10)
+        parser.add_argument("--rounds", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(
+                EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                ACTIVITY_LOG_BUFFERED=False,
+                PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+            ):
+                benchmark.seed(
+                    supervisors=opts["supervisors"],
+                    interns_per_supervisor=opts["interns_per_supervisor"],
+                    tasks_per_intern=opts["tasks_per_intern"],
+                    attendance_per_intern=0,
+                    complaints_per_intern=0,
+                )
+                results = self._run(opts["rounds"])
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'path':28} {'best ms':>9} {'bytes':>10}")
+        for name, (ms, size) in results.items():
+            self.stdout.write(f"{name:28} {ms:>9.1f} {size:>10}")
+        old, new = results["TaskSerializer"][0], results["TASK_ROWS"][0]
+        self.stdout.write(self.style.SUCCESS(f"speedup: {old / max(new, 1e-6):.1f}x"))
+
+    def _run(self, rounds):
+        qs = Task.objects.order_by("-created_at")
+
+        def slow():
+            return JSONRenderer().render(TaskSerializer(qs.select_related("intern", "supervisor"), many=True).data)
+
+        def fast():
+            return FastJSONRenderer().render(TASK_ROWS.rows(qs))
+
+        if slow() != fast():
+            raise CommandError("TASK_ROWS + FastJSONRenderer output differs from TaskSerializer + JSONRenderer")
+
+        results = {}
+        for name, fn in (("TaskSerializer", slow), ("TASK_ROWS", fast)):
+            best, body = None, b""
+            for _ in range(max(rounds, 1)):
+                started = time.perf_counter()
+                body = fn()
+                elapsed = (time.perf_counter() - started) * 1000
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = (best, len(body))
+        return results
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from internships.query_plans import hot_querysets, plan_problems
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN every hot endpoint queryset and fail if a full table scan or filesort shows up."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plan for every query")
+
+    def handle(self, *args, **opts):
+        failures = []
+        for name, qs, allow_sort in hot_querysets():
+            checked = plan_problems(qs, allow_sort)
+            if checked is None:
+                raise CommandError(f"No plan rules for database vendor '{connection.vendor}'")
+            problems, plan = checked
+
+            if problems:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"FAIL {name}: {', '.join(problems)}"))
+            else:
+                self.stdout.write(f"ok   {name}")
+
+            if problems or opts["verbose_plans"]:
+                for line in plan.splitlines():
+                    self.stdout.write(f"       {line}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} query plan regression(s): {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All query plans use indexes."))
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from internships.activity import SpooledActivityWriter
+
+
+class Command(BaseCommand):
+    help = "Write any spooled ActivityLog entries left by stopped workers into the database."
+
+    def handle(self, *args, **opts):
+        writer = SpooledActivityWriter(settings.ACTIVITY_LOG_SPOOL_DIR)
+        written = writer.recover()
+        self.stdout.write(self.style.SUCCESS(f"Flushed {written} activity entries from {writer.spool_dir}"))
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from internships import attendance
+from internships.analytics import rebuild_days
+from internships.models import Task, AttendanceDay, Complaint
+
+
+def _parse_day(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = "Recompute AttendanceDay and DailyRollup rows from tasks, attendance and complaints (default: the last 2 days)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="first", help="First day (YYYY-MM-DD)")
+        parser.add_argument("--to", dest="last", help="Last day (YYYY-MM-DD), default today")
+        parser.add_argument("--days", type=int, default=2, help="Rebuild the last N days when --from is not given")
+        parser.add_argument("--all", action="store_true", help="Rebuild every day since the oldest row")
+        parser.add_argument("--batch-days", type=int, default=31, help="Days recomputed per transaction")
+
+    def handle(self, *args, **opts):
+        last = _parse_day(opts["last"]) if opts["last"] else timezone.localdate()
+        if opts["all"]:
+            oldest = [
+                m.objects.aggregate(m=Min("created_at"))["m"] for m in (Task, Complaint)
+            ]
+            oldest = [timezone.localdate(o) for o in oldest if o]
+            first_att_day = AttendanceDay.objects.aggregate(m=Min("day"))["m"]
+            if first_att_day:
+                oldest.append(first_att_day)
+            first = min(oldest) if oldest else last
+        elif opts["first"]:
+            first = _parse_day(opts["first"])
+        else:
+            first = last - timedelta(days=max(opts["days"], 1) - 1)
+
+        if first > last:
+            raise CommandError("--from is after --to")
+
+        written = 0
+        day = first
+        step = timedelta(days=max(opts["batch_days"], 1))
+        while day <= last:
+            chunk_end = min(day + step - timedelta(days=1), last)
+            # attendance rollups read AttendanceDay; refresh it from any raw pings first
+            attendance.rebuild_days(day, chunk_end)
+            written += rebuild_days(day, chunk_end)
+            day = chunk_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {first}..{last}: {written} day rows"))
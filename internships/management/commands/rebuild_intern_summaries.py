@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from internships.summaries import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute InternSummary rows from tasks, attendance and complaints (default: every intern)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--intern", type=int, nargs="*", dest="interns", help="Only these intern ids")
+        parser.add_argument("--batch-size", type=int, default=500, help="Interns recomputed per transaction")
+
+    def handle(self, *args, **opts):
+        written = rebuild(opts["interns"], batch_size=max(opts["batch_size"], 1))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} intern summaries"))
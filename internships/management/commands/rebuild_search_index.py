@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from internships.search import backend, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rewrite every SearchDocument (tasks, task reports, complaints) from the source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk insert")
+
+    def handle(self, *args, **opts):
+        written = rebuild(batch_size=max(opts["batch_size"], 1))
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} documents ({backend()} backend)"))
@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from internships import analytics, attendance, summaries
+from internships.geofence import Geofence, load_sites
+from internships.models import Attendance
+from internships.response_cache import bump
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-check location_validated / office_distance_m of in-office attendance pings against the current "
+        "office sites, in id batches, then rebuild the day rows, rollups and summaries that changed. "
+        "Archived pings are not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=20000)
+        parser.add_argument("--from-id", type=int, default=0, help="Start at this Attendance id")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the pings that would change")
+
+    def handle(self, *args, **opts):
+        if opts["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        fence = Geofence(load_sites())
+        if not len(fence):
+            raise CommandError("No active office sites (and no OFFICE_LAT/OFFICE_LNG fallback) to validate against")
+
+        qs = Attendance.objects.filter(in_office=True, lat__isnull=False, lng__isnull=False).order_by("id")
+        last_id = opts["from_id"] - 1
+        scanned = changed = 0
+        days, interns = set(), set()
+        started = time.monotonic()
+
+        while True:
+            rows = list(
+                qs.filter(id__gt=last_id)
+                .values_list("id", "intern_id", "created_at", "lat", "lng", "location_validated", "office_distance_m")
+                [:opts["batch_size"]]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            scanned += len(rows)
+
+            ids, intern_ids, created, lats, lngs, old_valid, old_dist = zip(*rows)
+            distance, validated, _ = fence.check(lats, lngs)
+            old_dist = np.array([np.nan if d is None else d for d in old_dist], dtype=np.float64)
+            moved = ~(np.abs(distance - old_dist) < 0.01)  # NaN (no stored distance) counts as moved
+            dirty = np.nonzero((validated != np.array(old_valid, dtype=bool)) | moved)[0]
+            if not dirty.size:
+                continue
+
+            changed += dirty.size
+            for i in dirty:
+                days.add(timezone.localdate(created[i]))
+                interns.add(intern_ids[i])
+            if not opts["dry_run"]:
+                Attendance.objects.bulk_update(
+                    [
+                        Attendance(id=ids[i], location_validated=bool(validated[i]),
+                                   office_distance_m=float(distance[i]))
+                        for i in dirty
+                    ],
+                    ["location_validated", "office_distance_m"],
+                    batch_size=1000,
+                )
+                bump(Attendance)
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            f"Scanned {scanned} pings in {elapsed:.1f}s ({scanned / elapsed:.0f}/s), "
+            f"{changed} {'would change' if opts['dry_run'] else 'changed'}"
+        )
+        if opts["dry_run"] or not changed:
+            return
+
+        # bulk_update skips signals; recompute what the changed pings feed
+        first, last = min(days), max(days)
+        with transaction.atomic():
+            attendance.rebuild_days(first, last)
+            analytics.rebuild_days(first, last)
+            summaries.rebuild(intern_ids=sorted(interns))
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt attendance days and rollups {first}..{last} and {len(interns)} intern summaries"
+        ))
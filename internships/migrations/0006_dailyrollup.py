@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0005_activitylog_created_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('tasks_created', models.IntegerField(default=0)),
+                ('tasks_in_progress', models.IntegerField(default=0)),
+                ('tasks_done', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+                ('attendance_total', models.IntegerField(default=0)),
+                ('attendance_validated', models.IntegerField(default=0)),
+                ('complaints_created', models.IntegerField(default=0)),
+                ('complaints_open', models.IntegerField(default=0)),
+                ('complaints_in_review', models.IntegerField(default=0)),
+                ('complaints_resolved', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_updated_at'),
+        ('internships', '0007_complaint_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InternSummary',
+            fields=[
+                ('intern', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('tasks_open', models.IntegerField(default=0)),
+                ('tasks_done', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('attendance_total', models.IntegerField(default=0)),
+                ('attendance_validated', models.IntegerField(default=0)),
+                ('last_attendance_at', models.DateTimeField(blank=True, null=True)),
+                ('complaints_open', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+
+from internships.localtime import bucket, local_date
+
+
+def backfill(apps, schema_editor):
+    Attendance = apps.get_model("internships", "Attendance")
+    AttendanceDay = apps.get_model("internships", "AttendanceDay")
+    span = Attendance.objects.aggregate(lo=Min("created_at"), hi=Max("created_at"))
+    if span["lo"] is None:
+        return
+    rows = (
+        Attendance.objects
+        .annotate(day=local_date("created_at", span["lo"], span["hi"]))
+        .values("intern_id", "day")
+        .annotate(
+            first=Min("created_at"), last=Max("created_at"), pings=Count("id"),
+            validated_pings=Count("id", filter=Q(location_validated=True)),
+            office=Count("id", filter=Q(in_office=True)), min_distance=Min("office_distance_m"),
+        )
+        .order_by()
+    )
+    batch = []
+    for r in rows.iterator():
+        batch.append(AttendanceDay(
+            intern_id=r["intern_id"], day=bucket(r["day"]), first_check_in=r["first"], last_check_in=r["last"],
+            pings=r["pings"], validated_pings=r["validated_pings"], in_office=r["office"] > 0,
+            validated=r["validated_pings"] > 0, min_distance_m=r["min_distance"],
+        ))
+        if len(batch) >= 1000:
+            AttendanceDay.objects.bulk_create(batch)
+            batch = []
+    AttendanceDay.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0008_internsummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('first_check_in', models.DateTimeField()),
+                ('last_check_in', models.DateTimeField()),
+                ('pings', models.IntegerField(default=0)),
+                ('validated_pings', models.IntegerField(default=0)),
+                ('in_office', models.BooleanField(default=False)),
+                ('validated', models.BooleanField(default=False)),
+                ('min_distance_m', models.FloatField(blank=True, null=True)),
+                ('intern', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_days', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='attday_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('intern', 'day'), name='attday_intern_day_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0009_attendanceday'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfficeSite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120)),
+                ('lat', models.FloatField()),
+                ('lng', models.FloatField()),
+                ('radius_m', models.FloatField(default=150)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
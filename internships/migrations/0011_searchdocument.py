@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import OperationalError, migrations, models
+
+FTS_TABLE = "internships_searchdocument_fts"
+DOC_TABLE = "internships_searchdocument"
+
+SQLITE_FTS = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, body, content='{DOC_TABLE}', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOC_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOC_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOC_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+
+def backfill(apps, schema_editor):
+    SearchDocument = apps.get_model("internships", "SearchDocument")
+    sources = [
+        ("task", apps.get_model("internships", "Task").objects.order_by("id"),
+         lambda t: (t.intern_id, t.supervisor_id, t.title, t.description)),
+        ("report", apps.get_model("internships", "TaskReport").objects.select_related("task").order_by("id"),
+         lambda r: (r.intern_id, r.task.supervisor_id, r.task.title, r.content)),
+        ("complaint", apps.get_model("internships", "Complaint").objects.order_by("id"),
+         lambda c: (c.intern_id, c.supervisor_id, c.subject, c.message)),
+    ]
+    for kind, qs, fields in sources:
+        batch = []
+        for obj in qs.iterator(chunk_size=1000):
+            intern_id, supervisor_id, title, body = fields(obj)
+            batch.append(SearchDocument(kind=kind, object_id=obj.pk, intern_id=intern_id, supervisor_id=supervisor_id,
+                                        title=title, body=body, created_at=obj.created_at))
+            if len(batch) >= 1000:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+
+
+def create_fulltext(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "mysql":
+        # after the backfill: building the index once beats maintaining it row by row
+        schema_editor.execute(f"ALTER TABLE {DOC_TABLE} ADD FULLTEXT INDEX searchdoc_fulltext (title, body)")
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(SQLITE_FTS[0])
+        except OperationalError:
+            return  # SQLite built without FTS5: internships.search falls back to its python backend
+        for sql in SQLITE_FTS[1:]:
+            schema_editor.execute(sql)
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_fulltext(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "mysql":
+        schema_editor.execute(f"ALTER TABLE {DOC_TABLE} DROP INDEX searchdoc_fulltext")
+    elif vendor == "sqlite":
+        for suffix in ("_ai", "_ad", "_au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0010_officesite'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('report', 'Task report'), ('complaint', 'Complaint')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('body', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField()),
+                ('intern', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('supervisor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['intern', 'kind'], name='searchdoc_intern_kind_idx'), models.Index(fields=['supervisor', 'kind'], name='searchdoc_sup_kind_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='searchdoc_kind_object_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(create_fulltext, drop_fulltext),
+    ]
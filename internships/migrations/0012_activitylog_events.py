@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0011_searchdocument'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='activity_created_idx',
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='event_type',
+            field=models.CharField(choices=[('TASK_CREATED', 'Task created'), ('TASK_STATUS', 'Task status changed'), ('TASK_REPORTED', 'Task report submitted'), ('TASK_RATED', 'Task rated'), ('ATTENDANCE_MARKED', 'Attendance marked'), ('COMPLAINT_CREATED', 'Complaint created'), ('COMPLAINT_STATUS', 'Complaint status changed'), ('INTERN_ASSIGNED', 'Intern assigned'), ('INTERN_UNASSIGNED', 'Intern unassigned'), ('OTHER', 'Other')], default='OTHER', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='payload',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='subject',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_about', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='target_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='target_model',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-created_at', '-id'], name='activity_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['event_type', '-created_at', '-id'], name='activity_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['target_model', 'target_id', '-created_at', '-id'], name='activity_target_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['subject', '-created_at', '-id'], name='activity_subject_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0013_pushevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='batch',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -16,6 +17,17 @@ class Task(models.Model):
     supervisor_feedback = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # shared by the rows of one bulk create, so they can be read back where
+    # bulk_create returns no ids (MySQL)
+    batch = models.UUIDField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["supervisor", "-created_at", "-id"], name="task_sup_created_idx"),
+            models.Index(fields=["intern", "-created_at", "-id"], name="task_intern_created_idx"),
+            models.Index(fields=["status", "-created_at"], name="task_status_created_idx"),
+            models.Index(fields=["created_at"], name="task_created_idx"),
+        ]
 
 class TaskReport(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="reports")
@@ -23,6 +35,13 @@ class TaskReport(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "-created_at"], name="report_task_created_idx"),
+            models.Index(fields=["intern", "-created_at"], name="report_intern_created_idx"),
+            models.Index(fields=["-created_at"], name="report_created_idx"),
+        ]
+
 class Attendance(models.Model):
     intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="attendance")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -32,6 +51,49 @@ class Attendance(models.Model):
     office_distance_m = models.FloatField(null=True, blank=True)
     location_validated = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["intern", "-created_at"], name="att_intern_created_idx"),
+            models.Index(fields=["-created_at"], name="att_created_idx"),
+        ]
+
+class AttendanceDay(models.Model):
+    """
+    One row per intern per local (Asia/Kathmandu) day, folded from the raw
+    Attendance pings by internships.attendance as they arrive. Raw pings older
+    than ATTENDANCE_RAW_RETENTION_DAYS are moved to compressed archive files
+    (`manage.py archive_attendance`); these rows stay as the history.
+    """
+    intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="attendance_days")
+    day = models.DateField()
+    first_check_in = models.DateTimeField()
+    last_check_in = models.DateTimeField()
+    pings = models.IntegerField(default=0)
+    validated_pings = models.IntegerField(default=0)
+    in_office = models.BooleanField(default=False)  # any ping claimed in office
+    validated = models.BooleanField(default=False)  # any ping passed the geofence
+    min_distance_m = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["intern", "day"], name="attday_intern_day_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["day"], name="attday_day_idx"),
+        ]
+
+class OfficeSite(models.Model):
+    """A geofence for attendance: pings within radius_m of any active site are location-validated."""
+    name = models.CharField(max_length=120)
+    lat = models.FloatField()
+    lng = models.FloatField()
+    radius_m = models.FloatField(default=150)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
 class Complaint(models.Model):
     STATUS_CHOICES = [("OPEN","Open"),("IN_REVIEW","In Review"),("RESOLVED","Resolved")]
     intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="complaints_made")
@@ -40,8 +102,148 @@ class Complaint(models.Model):
     message = models.TextField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="OPEN")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["supervisor", "-created_at"], name="complaint_sup_created_idx"),
+            models.Index(fields=["intern", "-created_at"], name="complaint_intern_created_idx"),
+            models.Index(fields=["status"], name="complaint_status_idx"),
+            models.Index(fields=["-created_at"], name="complaint_created_idx"),
+        ]
+
+class SearchDocument(models.Model):
+    """
+    Denormalized text of one Task, TaskReport or Complaint for search.
+    Kept current on write by internships.search; the full-text index on
+    (title, body) is MySQL FULLTEXT or an SQLite FTS5 table (migration 0011).
+    """
+    KIND_CHOICES = [("task", "Task"), ("report", "Task report"), ("complaint", "Complaint")]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    supervisor = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    title = models.CharField(max_length=255, blank=True, default="")
+    body = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="searchdoc_kind_object_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["intern", "kind"], name="searchdoc_intern_kind_idx"),
+            models.Index(fields=["supervisor", "kind"], name="searchdoc_sup_kind_idx"),
+        ]
 
 class ActivityLog(models.Model):
+    """
+    One audit entry. `action` is the display text; event_type, target and
+    subject carry the same facts as indexed columns (internships.activity
+    writes both), so filters never need a LIKE over action.
+    """
+    EVENT_CHOICES = [
+        ("TASK_CREATED", "Task created"),
+        ("TASK_STATUS", "Task status changed"),
+        ("TASK_REPORTED", "Task report submitted"),
+        ("TASK_RATED", "Task rated"),
+        ("ATTENDANCE_MARKED", "Attendance marked"),
+        ("COMPLAINT_CREATED", "Complaint created"),
+        ("COMPLAINT_STATUS", "Complaint status changed"),
+        ("INTERN_ASSIGNED", "Intern assigned"),
+        ("INTERN_UNASSIGNED", "Intern unassigned"),
+        ("OTHER", "Other"),
+    ]
     actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="activity_logs")
     action = models.CharField(max_length=500)
-    created_at = models.DateTimeField(auto_now_add=True)
+    event_type = models.CharField(max_length=32, choices=EVENT_CHOICES, default="OTHER")
+    # the row acted on: its model_name ("task", "complaint", "user", ...) and pk
+    target_model = models.CharField(max_length=32, blank=True, default="")
+    target_id = models.PositiveBigIntegerField(null=True, blank=True)
+    # the intern the entry is about; kept (as null) when that user is deleted
+    subject = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="activity_about",
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    # not auto_now_add: buffered entries keep the time of the request, not of the flush
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="activity_created_idx"),
+            models.Index(fields=["actor", "-created_at"], name="activity_actor_created_idx"),
+            models.Index(fields=["event_type", "-created_at", "-id"], name="activity_event_created_idx"),
+            models.Index(fields=["target_model", "target_id", "-created_at", "-id"], name="activity_target_created_idx"),
+            models.Index(fields=["subject", "-created_at", "-id"], name="activity_subject_created_idx"),
+        ]
+
+class DailyRollup(models.Model):
+    """
+    Per-day (Asia/Kathmandu) aggregates for the admin dashboard, bucketed by
+    each row's created_at. Kept current by internships.analytics signal
+    handlers; `manage.py rebuild_analytics_rollups` recomputes from scratch.
+    """
+    day = models.DateField(unique=True)
+
+    tasks_created = models.IntegerField(default=0)
+    tasks_in_progress = models.IntegerField(default=0)
+    tasks_done = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+
+    attendance_total = models.IntegerField(default=0)
+    attendance_validated = models.IntegerField(default=0)
+
+    complaints_created = models.IntegerField(default=0)
+    complaints_open = models.IntegerField(default=0)
+    complaints_in_review = models.IntegerField(default=0)
+    complaints_resolved = models.IntegerField(default=0)
+
+
+class InternSummary(models.Model):
+    """
+    Per-intern counters for the supervisor/admin screens. Kept current by the
+    internships.summaries signal handlers in the same transaction as the
+    Task / Attendance / Complaint change; `manage.py rebuild_intern_summaries`
+    recomputes from the source tables.
+    """
+    intern = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="summary")
+
+    tasks_open = models.IntegerField(default=0)
+    tasks_done = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+
+    attendance_total = models.IntegerField(default=0)
+    attendance_validated = models.IntegerField(default=0)
+    last_attendance_at = models.DateTimeField(null=True, blank=True)
+
+    complaints_open = models.IntegerField(default=0)  # OPEN + IN_REVIEW
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def avg_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+    @property
+    def validated_ratio(self):
+        return self.attendance_validated / self.attendance_total if self.attendance_total else None
+
+
+class PushEvent(models.Model):
+    """
+    An event published through internships.events.DatabaseBroker. Every
+    process polls this table for rows past the last id it has seen, so a
+    stream gets events published by any worker; the id is the SSE event id.
+    """
+    channels = models.JSONField(default=list)
+    kind = models.CharField(max_length=64)
+    data = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
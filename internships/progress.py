@@ -0,0 +1,111 @@
+"""
+Per-intern monthly task progress for the supervisor progress page.
+
+One grouped query over the supervisor's tasks: bucketed by intern and the
+local (Asia/Kathmandu) month of Task.created_at (see localtime.py), with a count per status,
+the rated-task count and average star_rating, and the number of reports on
+those tasks. Reports are counted with a correlated subquery per task and
+summed, not joined, so a task with several reports still counts once in
+the status counts and the average.
+"""
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db.models import Avg, Count, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .analytics import TASK_STATUS_FIELD
+from .localtime import bucket, local_month
+from .models import Task, TaskReport
+
+COUNTER_FIELDS = ["tasks", *TASK_STATUS_FIELD.values(), "rated", "reports"]
+
+
+def _parse_month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def _add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(params):
+    """
+    (first, last) month starts from ?from=YYYY-MM&to=YYYY-MM; either may be
+    omitted (to defaults to the current month, from to PROGRESS_DEFAULT_MONTHS
+    before it). Raises ValueError for bad months or a range over
+    PROGRESS_MAX_MONTHS.
+    """
+    today = timezone.localdate()
+    last = _parse_month(params["to"]) if params.get("to") else today.replace(day=1)
+    if params.get("from"):
+        first = _parse_month(params["from"])
+    else:
+        first = _add_months(last, 1 - int(getattr(settings, "PROGRESS_DEFAULT_MONTHS", 6)))
+    if last < first:
+        raise ValueError("to is before from")
+    months = (last.year - first.year) * 12 + last.month - first.month + 1
+    if months > int(getattr(settings, "PROGRESS_MAX_MONTHS", 24)):
+        raise ValueError("range too long")
+    return first, last
+
+
+def monthly_rows(supervisor, first: date, last: date):
+    """The grouped queryset: one row per (intern, local month)."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first, time.min), tz)
+    end = timezone.make_aware(datetime.combine(_add_months(last, 1), time.min), tz)
+
+    reports = (
+        TaskReport.objects.filter(task=OuterRef("pk")).order_by()
+        .values("task").annotate(c=Count("id")).values("c")
+    )
+    rows = (
+        Task.objects.filter(supervisor=supervisor, created_at__gte=start, created_at__lt=end)
+        .annotate(month=local_month("created_at", start, end),
+                  report_count=Coalesce(Subquery(reports, output_field=IntegerField()), 0))
+        .values("intern_id", "intern__full_name", "intern__email", "month")
+        .annotate(
+            tasks=Count("id"),
+            **{field: Count("id", filter=Q(status=status)) for status, field in TASK_STATUS_FIELD.items()},
+            rated=Count("star_rating"),
+            avg_rating=Avg("star_rating"),
+            reports=Sum("report_count"),
+        )
+        .order_by("intern__full_name", "intern_id", "month")
+    )
+    return rows
+
+
+def monthly_progress(supervisor, first: date, last: date) -> list[dict]:
+    interns = {}
+    for r in monthly_rows(supervisor, first, last):
+        entry = interns.get(r["intern_id"])
+        if entry is None:
+            entry = interns[r["intern_id"]] = {
+                "intern_id": r["intern_id"],
+                "intern_name": r["intern__full_name"],
+                "intern_email": r["intern__email"],
+                "months": [],
+                "totals": dict.fromkeys(COUNTER_FIELDS, 0),
+                "_rating_sum": 0.0,
+            }
+        entry["months"].append({
+            "month": f"{bucket(r['month']):%Y-%m}",
+            **{k: r[k] or 0 for k in COUNTER_FIELDS},
+            "avg_rating": round(r["avg_rating"], 2) if r["avg_rating"] is not None else None,
+        })
+        for k in COUNTER_FIELDS:
+            entry["totals"][k] += r[k] or 0
+        if r["avg_rating"] is not None:
+            entry["_rating_sum"] += r["avg_rating"] * r["rated"]
+
+    out = []
+    for entry in interns.values():
+        rating_sum = entry.pop("_rating_sum")
+        rated = entry["totals"]["rated"]
+        entry["totals"]["avg_rating"] = round(rating_sum / rated, 2) if rated else None
+        out.append(entry)
+    return out
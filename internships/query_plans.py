@@ -0,0 +1,76 @@
+"""
+EXPLAIN checks for the hot list endpoints.
+
+hot_querysets() mirrors the filter + order of each endpoint; plan_problems()
+explains one and reports a full table scan or a filesort. Run by
+`manage.py check_query_plans` and by internships.tests.QueryPlanTests.
+"""
+import re
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from accounts.models import User
+from .progress import monthly_rows
+from .models import Task, TaskReport, Attendance, AttendanceDay, Complaint, ActivityLog, SearchDocument
+
+# (vendor) -> (full scan pattern, sort pattern)
+PLAN_RULES = {
+    "sqlite": (re.compile(r"\bSCAN \S+\s*$", re.M), re.compile(r"USE TEMP B-TREE FOR ORDER BY")),
+    "mysql": (re.compile(r"\bALL\b"), re.compile(r"Using filesort")),
+}
+
+
+def hot_querysets():
+    """
+    The filter + order of every hot list endpoint, mirrored from the views.
+
+    allow_sort marks plans whose ORDER BY spans a join (e.g. all attendance of a
+    supervisor's interns): those can't be served in index order, the sort is
+    bounded by one roster's rows instead.
+    """
+    sup_id = User.objects.filter(role="SUPERVISOR").values_list("id", flat=True).first() or 0
+    intern_id = User.objects.filter(role="INTERN").values_list("id", flat=True).first() or 0
+    end = timezone.now()
+    start = end - timedelta(days=31)
+
+    return [
+        ("supervisor/tasks", Task.objects.filter(supervisor_id=sup_id).order_by("-created_at", "-id")[:51], False),
+        ("supervisor/roster", User.objects.filter(role="INTERN", supervisor_id=sup_id).select_related("summary").order_by("full_name"), True),
+        ("intern/tasks", Task.objects.filter(intern_id=intern_id).order_by("-created_at", "-id")[:51], False),
+        ("supervisor/attendance", Attendance.objects.select_related("intern").filter(intern__supervisor_id=sup_id).order_by("-created_at")[:300], True),
+        ("supervisor/reports", TaskReport.objects.select_related("task", "intern").filter(task__supervisor_id=sup_id).order_by("-created_at")[:300], True),
+        ("supervisor/complaints", Complaint.objects.select_related("intern").filter(supervisor_id=sup_id).order_by("-created_at")[:200], False),
+        ("intern/complaints", Complaint.objects.filter(intern_id=intern_id).order_by("-created_at")[:200], False),
+        ("admin/attendance", Attendance.objects.select_related("intern").order_by("-created_at")[:300], False),
+        ("admin/attendance range", AttendanceDay.objects.select_related("intern").filter(day__gte=start.date(), day__lte=end.date()).order_by("-day", "intern__full_name"), True),
+        ("supervisor/attendance range", AttendanceDay.objects.select_related("intern").filter(intern__supervisor_id=sup_id, day__gte=start.date(), day__lte=end.date()).order_by("-day", "intern__full_name"), True),
+        ("admin/complaints", Complaint.objects.select_related("intern", "supervisor").order_by("-created_at")[:200], False),
+        ("admin/progress", Task.objects.select_related("intern", "supervisor").order_by("-created_at")[:300], False),
+        ("admin/activity", ActivityLog.objects.select_related("actor").order_by("-created_at", "-id")[:200], False),
+        ("admin/activity event_type", ActivityLog.objects.select_related("actor").filter(event_type__in=["TASK_RATED"]).order_by("-created_at", "-id")[:51], False),
+        ("admin/activity target", ActivityLog.objects.select_related("actor").filter(target_model="task", target_id=1).order_by("-created_at", "-id")[:51], False),
+        ("admin/activity subject", ActivityLog.objects.select_related("actor").filter(subject_id=intern_id).order_by("-created_at", "-id")[:51], False),
+        ("admin/analytics complaints_open", Complaint.objects.filter(status="OPEN"), False),
+        ("search supervisor scope", SearchDocument.objects.filter(supervisor_id=sup_id, kind__in=["task", "report"]).values("id"), False),
+        ("search intern scope", SearchDocument.objects.filter(intern_id=intern_id, kind="complaint").values("id"), False),
+        ("supervisor/progress/monthly", monthly_rows(sup_id, start.date().replace(day=1), end.date().replace(day=1)), True),
+        ("admin/reports/monthly", Task.objects.filter(created_at__gte=start, created_at__lt=end).order_by("created_at", "id").values_list("id", "intern__email", "supervisor__email"), False),
+    ]
+
+
+
+def plan_problems(qs, allow_sort=False):
+    """(problems, plan) for one queryset on the current database; None if there are no rules for it."""
+    rules = PLAN_RULES.get(connection.vendor)
+    if not rules:
+        return None
+    scan_re, sort_re = rules
+    plan = qs.explain()
+    problems = []
+    if scan_re.search(plan):
+        problems.append("full scan")
+    if not allow_sort and sort_re.search(plan):
+        problems.append("filesort")
+    return problems, plan
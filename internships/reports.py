@@ -0,0 +1,207 @@
+"""
+Monthly PDF report.
+
+Rendering runs on a small background pool and the result is written to
+REPORT_CACHE_DIR as monthly_<year>_<month>_<version>.pdf, where <version> is
+a digest of row counts / max ids / max updated_at for the month (validated
+check-ins too), including the interns in it and their supervisors. A finished month keeps the same
+version, so repeat downloads are served from disk; any edit to that month's
+rows or to those users changes the version and triggers one re-render.
+"""
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Avg, Count, F, Max, Q, Sum
+from django.utils import timezone
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from accounts.models import User
+from .models import Task, AttendanceDay, Complaint
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-render")
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def cache_dir() -> str:
+    path = str(getattr(settings, "REPORT_CACHE_DIR", "/tmp/interntrack_reports"))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _attendance_days(start, end):
+    # start/end are local midnights, so whole AttendanceDay rows cover the range
+    return AttendanceDay.objects.filter(day__gte=timezone.localdate(start), day__lt=timezone.localdate(end))
+
+
+def data_version(start, end) -> str:
+    """Cheap fingerprint of everything the report reads for [start, end)."""
+    task = Task.objects.filter(created_at__gte=start, created_at__lt=end).aggregate(
+        n=Count("id"), m=Max("id"), u=Max("updated_at"),
+    )
+    # revalidate_attendance / rebuild_days rewrite validated_pings in place; the
+    # id-weighted sum also catches a count moving from one intern to another
+    att = _attendance_days(start, end).aggregate(
+        n=Sum("pings"), m=Max("last_check_in"), v=Sum("validated_pings"),
+        vi=Sum(F("validated_pings") * F("intern_id")),
+    )
+    comp = Complaint.objects.filter(created_at__gte=start, created_at__lt=end).aggregate(n=Count("id"), m=Max("id"))
+    # the report prints intern and supervisor names: renames, reassignments
+    # and deleted supervisors (SET_NULL, no updated_at) must change it too
+    users = User.objects.filter(
+        Q(id__in=Task.objects.filter(created_at__gte=start, created_at__lt=end).values("intern_id"))
+        | Q(id__in=_attendance_days(start, end).values("intern_id"))
+        | Q(id__in=Complaint.objects.filter(created_at__gte=start, created_at__lt=end).values("intern_id"))
+    ).aggregate(u=Max("updated_at"), su=Max("supervisor__updated_at"), sn=Count("supervisor_id"), ss=Sum("supervisor_id"))
+    raw = "|".join(str(v) for v in (
+        task["n"], task["m"], task["u"], att["n"], att["m"], att["v"], att["vi"], comp["n"], comp["m"],
+        users["u"], users["su"], users["sn"], users["ss"],
+    ))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def _intern_rows(start, end):
+    tasks = Task.objects.filter(created_at__gte=start, created_at__lt=end)
+    task_stats = {
+        r["intern_id"]: r for r in tasks.values("intern_id").annotate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status="COMPLETED")),
+            done=Count("id", filter=Q(status="DONE")),
+            avg_rating=Avg("star_rating"),
+        )
+    }
+    att_stats = {
+        r["intern_id"]: r for r in _attendance_days(start, end)
+        .values("intern_id").annotate(total=Sum("pings"), validated=Sum("validated_pings")).order_by()
+    }
+    comp_stats = dict(
+        Complaint.objects.filter(created_at__gte=start, created_at__lt=end)
+        .values("intern_id").annotate(c=Count("id")).values_list("intern_id", "c")
+    )
+
+    ids = set(task_stats) | set(att_stats) | set(comp_stats)
+    interns = User.objects.filter(id__in=ids).select_related("supervisor").order_by("full_name")
+
+    task_list = {}
+    for t in tasks.order_by("created_at").values("intern_id", "title", "status", "star_rating"):
+        task_list.setdefault(t["intern_id"], []).append(t)
+
+    for i in interns:
+        ts = task_stats.get(i.id, {})
+        at = att_stats.get(i.id, {})
+        yield {
+            "intern": i,
+            "tasks": ts.get("total", 0),
+            "completed": ts.get("completed", 0) + ts.get("done", 0),
+            "avg_rating": ts.get("avg_rating"),
+            "attendance": at.get("total", 0),
+            "validated_rate": (at["validated"] / at["total"]) if at.get("total") else None,
+            "complaints": comp_stats.get(i.id, 0),
+            "task_list": task_list.get(i.id, []),
+        }
+
+
+def render_monthly_pdf(year: int, month: int, start, end) -> bytes:
+    styles = getSampleStyleSheet()
+    buf = BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=15 * mm, rightMargin=15 * mm, topMargin=15 * mm, bottomMargin=15 * mm,
+                            title=f"Monthly report {year}-{month:02d}")
+    grid = TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.grey),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e8edf5")),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ])
+
+    story = [
+        Paragraph(f"Codavatar InternTrack - Monthly Report {year}-{month:02d}", styles["Title"]),
+        Paragraph(f"Generated {timezone.localtime():%Y-%m-%d %H:%M}", styles["Normal"]),
+        Spacer(1, 6 * mm),
+    ]
+
+    rows = list(_intern_rows(start, end))
+    summary = [["Intern", "Supervisor", "Tasks", "Done", "Avg stars", "Attendance", "Validated", "Complaints"]]
+    for r in rows:
+        i = r["intern"]
+        summary.append([
+            Paragraph(escape(i.full_name or i.email), styles["BodyText"]),
+            i.supervisor.full_name if i.supervisor else "-",
+            r["tasks"],
+            r["completed"],
+            f"{r['avg_rating']:.1f}" if r["avg_rating"] is not None else "-",
+            r["attendance"],
+            f"{r['validated_rate']:.0%}" if r["validated_rate"] is not None else "-",
+            r["complaints"],
+        ])
+    if len(summary) == 1:
+        story.append(Paragraph("No activity recorded for this month.", styles["Normal"]))
+    else:
+        t = Table(summary, repeatRows=1, colWidths=[45 * mm, 35 * mm, 14 * mm, 14 * mm, 18 * mm, 20 * mm, 18 * mm, 18 * mm])
+        t.setStyle(grid)
+        story.append(t)
+
+    for r in rows:
+        if not r["task_list"]:
+            continue
+        i = r["intern"]
+        story += [Spacer(1, 6 * mm), Paragraph(escape(f"{i.full_name} ({i.email})"), styles["Heading3"])]
+        data = [["Task", "Status", "Stars"]] + [
+            [Paragraph(escape(t["title"]), styles["BodyText"]), t["status"], t["star_rating"] or "-"] for t in r["task_list"]
+        ]
+        t = Table(data, repeatRows=1, colWidths=[120 * mm, 35 * mm, 20 * mm])
+        t.setStyle(grid)
+        story.append(t)
+
+    doc.build(story)
+    return buf.getvalue()
+
+
+def _render_to_cache(year, month, start, end, path):
+    try:
+        pdf = render_monthly_pdf(year, month, start, end)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp, path)
+
+        # older versions of the same month are dead now
+        prefix = f"monthly_{year}_{month}_"
+        for name in os.listdir(os.path.dirname(path)):
+            if name.startswith(prefix) and name.endswith(".pdf") and os.path.join(os.path.dirname(path), name) != path:
+                try:
+                    os.remove(os.path.join(os.path.dirname(path), name))
+                except FileNotFoundError:
+                    pass
+        return path
+    finally:
+        connection.close()
+        with _inflight_lock:
+            _inflight.pop(path, None)
+
+
+def monthly_pdf(year: int, month: int, start, end):
+    """
+    Return (path, future): path is set when a cached file is ready, otherwise
+    future resolves to the path once the background render finishes.
+    """
+    path = os.path.join(cache_dir(), f"monthly_{year}_{month}_{data_version(start, end)}.pdf")
+    if os.path.exists(path):
+        return path, None
+
+    with _inflight_lock:
+        future = _inflight.get(path)
+        if future is None:
+            future = _executor.submit(_render_to_cache, year, month, start, end, path)
+            _inflight[path] = future
+    return None, future
@@ -0,0 +1,164 @@
+"""
+Shared response cache for the admin list endpoints.
+
+@cached_response(name, tables) wraps an APIView.get. The 200 payload is kept
+in the "responses" cache (CACHES in settings: a file or database cache in
+production so every worker shares it), keyed on the caller's role, the full
+path with its query string, and the current generation of every table the
+payload reads. RESPONSE_CACHE_TTL is 0 (off) unless RESPONSE_CACHE_BACKEND
+is set: bump() only reaches the cache of the process that wrote.
+
+Invalidation is by generation, not by deleting keys: a committed write to a
+table bumps its generation counter (post_save / post_delete below), so every entry
+built from the old generation is simply never looked up again and ages out
+with RESPONSE_CACHE_TTL. Bulk writes send no signals; their callers use
+bump() directly.
+
+Hits and misses are counted per endpoint in the same cache, so all workers
+add to one set of numbers; AdminResponseCacheStatsView reports them.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.response import Response
+
+from accounts.models import User
+from .models import Task, Attendance, AttendanceDay, Complaint, ActivityLog
+
+# the endpoints wrapped with @cached_response, for the stats view
+ENDPOINTS = []
+
+
+def get_cache():
+    return caches["responses"]
+
+
+def _gen_key(table) -> str:
+    return f"resp:gen:{table}"
+
+
+def _stat_key(name, what) -> str:
+    return f"resp:stat:{name}:{what}"
+
+
+def _label(model) -> str:
+    return model._meta.label_lower
+
+
+def generations(tables) -> list:
+    cache = get_cache()
+    keys = [_gen_key(_label(t)) for t in tables]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # start from the clock, not 0: an evicted counter must not come
+            # back at a value that old entries were stored under
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[k] for k in keys]
+
+
+def bump(*models):
+    """
+    New generation for these tables once the current transaction commits
+    (right away outside one). Bumping earlier would let a concurrent reader
+    cache the pre-commit rows under the new generation.
+    """
+    transaction.on_commit(lambda: _bump_now(models))
+
+
+def _bump_now(models):
+    cache = get_cache()
+    for model in models:
+        key = _gen_key(_label(model))
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def _count(name, what):
+    cache = get_cache()
+    key = _stat_key(name, what)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def stats() -> dict:
+    cache = get_cache()
+    keys = [_stat_key(n, w) for n in ENDPOINTS for w in ("hit", "miss")]
+    found = cache.get_many(keys)
+    out = {}
+    for name in ENDPOINTS:
+        hits = found.get(_stat_key(name, "hit"), 0)
+        misses = found.get(_stat_key(name, "miss"), 0)
+        total = hits + misses
+        out[name] = {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 3) if total else None}
+    return out
+
+
+def reset_stats():
+    get_cache().delete_many([_stat_key(n, w) for n in ENDPOINTS for w in ("hit", "miss")])
+
+
+def cached_response(name, tables):
+    ENDPOINTS.append(name)
+
+    def decorator(get):
+        @wraps(get)
+        def wrapper(self, request, *args, **kwargs):
+            ttl = int(getattr(settings, "RESPONSE_CACHE_TTL", 300))
+            if ttl <= 0:
+                return get(self, request, *args, **kwargs)
+
+            cache = get_cache()
+            parts = [name, request.user.role, request.get_full_path()] + [str(g) for g in generations(tables)]
+            key = "resp:%s:%s" % (name, hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest())
+            data = cache.get(key)
+            if data is not None:
+                _count(name, "hit")
+                resp = Response(data)
+                resp["X-Cache"] = "HIT"
+                return resp
+
+            _count(name, "miss")
+            resp = get(self, request, *args, **kwargs)
+            if resp.status_code == 200:
+                cache.set(key, resp.data, ttl)
+            resp["X-Cache"] = "MISS"
+            return resp
+        return wrapper
+    return decorator
+
+
+# ---------- invalidation ----------
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Attendance)
+@receiver(post_save, sender=AttendanceDay)
+@receiver(post_save, sender=Complaint)
+@receiver(post_save, sender=ActivityLog)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Attendance)
+@receiver(post_delete, sender=AttendanceDay)
+@receiver(post_delete, sender=Complaint)
+@receiver(post_delete, sender=ActivityLog)
+def _table_written(sender, **kwargs):
+    bump(sender)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _user_written(sender, update_fields=None, **kwargs):
+    # a login only touches last_login, which no cached payload shows
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    bump(User)
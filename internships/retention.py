@@ -0,0 +1,161 @@
+"""
+Retention for tables that only ever grow.
+
+Each Policy names a model, which of its rows have expired and what happens
+to them: "delete", or "archive" (written to a gzipped JSON-lines file in
+RETENTION_ARCHIVE_DIR first, then deleted). `manage.py apply_retention`
+runs every policy.
+
+Rows go in chunks of RETENTION_CHUNK_SIZE, walked by id: one short SELECT
+and one DELETE transaction per chunk, so no lock is held for long. An
+archive run appends each chunk to <name>_<timestamp>.jsonl.gz.part and
+flushes it before the chunk is deleted; the file is renamed to .jsonl.gz
+when the run finishes. A run that dies leaves the .part file readable up to
+its last chunk, and any chunk that was written but not deleted is archived
+again by the next run (at-least-once, like the activity spool).
+
+Deletes skip signals (_raw_delete): none of these models has dependents,
+and the response cache is bumped once per run instead of once per row.
+"""
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import EmailVerificationToken, OutboundEmail, PasswordResetToken
+from .models import ActivityLog, PushEvent
+from .response_cache import bump
+
+DELETE = "delete"
+ARCHIVE = "archive"
+
+
+class Policy:
+    def __init__(self, name, model, days_setting, default_days, action_setting=None, default_action=DELETE,
+                 expired_also=None, only=None):
+        """
+        Rows with created_at older than `days_setting` days expire; so does
+        anything matching expired_also (a Q), whatever its age. `only` (a Q)
+        limits both to the rows that may go at all.
+        """
+        self.name = name
+        self.model = model
+        self.days_setting = days_setting
+        self.default_days = default_days
+        self.action_setting = action_setting
+        self.default_action = default_action
+        self.expired_also = expired_also
+        self.only = only
+
+    @property
+    def keep_days(self) -> int:
+        return int(getattr(settings, self.days_setting, self.default_days))
+
+    @property
+    def action(self) -> str:
+        if not self.action_setting:
+            return self.default_action
+        return getattr(settings, self.action_setting, self.default_action)
+
+    def expired(self, now=None):
+        cutoff = (now or timezone.now()) - timedelta(days=self.keep_days)
+        q = Q(created_at__lt=cutoff)
+        if self.expired_also is not None:
+            q |= self.expired_also
+        if self.only is not None:
+            q &= self.only
+        return self.model.objects.filter(q)
+
+
+POLICIES = [
+    Policy("activity_log", ActivityLog, "ACTIVITY_LOG_RETENTION_DAYS", 365,
+           action_setting="ACTIVITY_LOG_RETENTION_ACTION", default_action=ARCHIVE),
+    # a used token can never be used again
+    Policy("email_verification_tokens", EmailVerificationToken, "EMAIL_TOKEN_RETENTION_DAYS", 7,
+           expired_also=Q(used=True)),
+    Policy("password_reset_tokens", PasswordResetToken, "RESET_TOKEN_RETENTION_DAYS", 1,
+           expired_also=Q(used=True)),
+    # still-pending mail is never dropped
+    Policy("outbound_emails", OutboundEmail, "EMAIL_QUEUE_RETENTION_DAYS", 30,
+           only=Q(status__in=["SENT", "FAILED"])),
+    Policy("push_events", PushEvent, "EVENTS_RETENTION_DAYS", 1),
+]
+
+
+def archive_dir() -> str:
+    path = str(getattr(settings, "RETENTION_ARCHIVE_DIR", os.path.join(settings.BASE_DIR, "retention_archive")))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _json_row(values: dict) -> dict:
+    return {k: v.isoformat() if hasattr(v, "isoformat") else v for k, v in values.items()}
+
+
+def apply(policy: Policy, chunk_size=None, pause=0.0, dry_run=False) -> dict:
+    """
+    Run one policy. Returns {"rows", "seconds", "rows_per_second", "path"};
+    path is the archive file, or None.
+    """
+    chunk_size = chunk_size or int(getattr(settings, "RETENTION_CHUNK_SIZE", 1000))
+    qs = policy.expired()  # the cutoff is fixed for the whole run
+    started = time.monotonic()
+    if dry_run:
+        rows = qs.count()
+        return {"rows": rows, "seconds": 0.0, "rows_per_second": None, "path": None}
+
+    archive = policy.action == ARCHIVE
+    path = out = None
+    if archive:
+        path = os.path.join(archive_dir(), f"{policy.name}_{timezone.now():%Y%m%dT%H%M%S}.jsonl.gz")
+        out = gzip.open(f"{path}.part", "wt", encoding="utf-8")
+
+    rows, last_id = 0, 0
+    try:
+        while True:
+            chunk = qs.filter(id__gt=last_id).order_by("id")
+            if archive:
+                values = list(chunk.values()[:chunk_size])
+                ids = [v["id"] for v in values]
+                for v in values:
+                    out.write(json.dumps(_json_row(v)) + "\n")
+                out.flush()  # on disk before the rows go
+            else:
+                ids = list(chunk.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                doomed = policy.model.objects.filter(id__in=ids)
+                doomed._raw_delete(doomed.db)
+            rows += len(ids)
+            last_id = ids[-1]
+            if pause:
+                time.sleep(pause)
+    finally:
+        if out is not None:
+            out.close()
+        if rows:
+            bump(policy.model)
+
+    if archive:
+        if rows:
+            os.replace(f"{path}.part", path)
+        else:
+            os.remove(f"{path}.part")
+            path = None
+
+    seconds = time.monotonic() - started
+    return {"rows": rows, "seconds": seconds, "rows_per_second": rows / max(seconds, 1e-6), "path": path}
+
+
+def read_archive(path):
+    """Yield the rows of one archive file as dicts (datetimes left as ISO strings)."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
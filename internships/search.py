@@ -0,0 +1,222 @@
+"""
+Full-text search over tasks, task reports and complaints.
+
+Every Task / TaskReport / Complaint has one SearchDocument row (title +
+body plus the intern/supervisor it belongs to), written by the signal
+handlers below as the source row is created or its text changes. Bulk
+inserts skip signals and call index_tasks() / rebuild() themselves.
+
+The inverted index behind SearchDocument depends on the database:
+  * MySQL: a FULLTEXT index on (title, body), queried in boolean mode with
+    every term required and prefix-matched; ranked by MATCH() relevance;
+  * SQLite with FTS5: an external-content FTS5 table kept in sync by
+    triggers (migration 0011); ranked by bm25 with the title weighted 2x;
+  * anything else: the "python" backend, an icontains AND-filter over the
+    scoped rows, ranked here by term counts (local and test use only).
+
+Results are always limited to what the caller may see: admins everything,
+supervisors the documents they are the supervisor on, interns their own.
+"""
+import re
+from math import log
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from .models import Task, TaskReport, Complaint, SearchDocument
+
+FTS_TABLE = "internships_searchdocument_fts"
+MAX_TERMS = 8
+SNIPPET_CHARS = 160
+
+_has_fts5 = None
+
+
+def backend() -> str:
+    global _has_fts5
+    if connection.vendor == "mysql":
+        return "mysql"
+    if connection.vendor == "sqlite":
+        if _has_fts5 is None:
+            with connection.cursor() as c:
+                c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+                _has_fts5 = c.fetchone() is not None
+        if _has_fts5:
+            return "fts5"
+    return "python"
+
+
+def terms(q: str) -> list[str]:
+    return re.findall(r"\w+", (q or "").lower())[:MAX_TERMS]
+
+
+# ---------- indexing ----------
+def _task_doc(t: Task) -> dict:
+    return {"intern_id": t.intern_id, "supervisor_id": t.supervisor_id, "title": t.title,
+            "body": t.description, "created_at": t.created_at}
+
+
+def _report_doc(r: TaskReport) -> dict:
+    # the title is the task's, so "Week 2 audit" also finds the reports on it
+    return {"intern_id": r.intern_id, "supervisor_id": r.task.supervisor_id, "title": r.task.title,
+            "body": r.content, "created_at": r.created_at}
+
+
+def _complaint_doc(c: Complaint) -> dict:
+    return {"intern_id": c.intern_id, "supervisor_id": c.supervisor_id, "title": c.subject,
+            "body": c.message, "created_at": c.created_at}
+
+
+def upsert(kind, object_id, fields: dict, created=False):
+    if created:
+        # a brand-new source row has no document yet
+        SearchDocument.objects.create(kind=kind, object_id=object_id, **fields)
+        return
+    rows = SearchDocument.objects.filter(kind=kind, object_id=object_id)
+    if rows.update(**fields):
+        return
+    try:
+        with transaction.atomic():
+            SearchDocument.objects.create(kind=kind, object_id=object_id, **fields)
+    except IntegrityError:
+        rows.update(**fields)
+
+
+def index_tasks(tasks):
+    """For Task.objects.bulk_create() callers."""
+    SearchDocument.objects.bulk_create(
+        [SearchDocument(kind="task", object_id=t.pk, **_task_doc(t)) for t in tasks], batch_size=500,
+    )
+
+
+def _text_changed(update_fields, text_fields):
+    return update_fields is None or bool(set(update_fields) & text_fields)
+
+
+@receiver(post_save, sender=Task)
+def _task_saved(sender, instance, created, update_fields=None, **kwargs):
+    # status / rating saves pass update_fields without the text
+    if created or _text_changed(update_fields, {"title", "description"}):
+        upsert("task", instance.pk, _task_doc(instance), created)
+
+
+@receiver(post_save, sender=TaskReport)
+def _report_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or _text_changed(update_fields, {"content"}):
+        upsert("report", instance.pk, _report_doc(instance), created)
+
+
+@receiver(post_save, sender=Complaint)
+def _complaint_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or _text_changed(update_fields, {"subject", "message"}):
+        upsert("complaint", instance.pk, _complaint_doc(instance), created)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=TaskReport)
+@receiver(post_delete, sender=Complaint)
+def _deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, User) and origin.pk == instance.intern_id:
+        return  # the intern's documents go with the intern (FK cascade)
+    kind = {Task: "task", TaskReport: "report", Complaint: "complaint"}[sender]
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def rebuild(batch_size=1000) -> int:
+    """Rewrite every SearchDocument from the source tables. Returns rows written."""
+    written = 0
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        sources = [
+            ("task", Task.objects.order_by("id"), _task_doc),
+            ("report", TaskReport.objects.select_related("task").order_by("id"), _report_doc),
+            ("complaint", Complaint.objects.order_by("id"), _complaint_doc),
+        ]
+        for kind, qs, doc in sources:
+            batch = []
+            for obj in qs.iterator(chunk_size=batch_size):
+                batch.append(SearchDocument(kind=kind, object_id=obj.pk, **doc(obj)))
+                if len(batch) >= batch_size:
+                    SearchDocument.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            SearchDocument.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+# ---------- querying ----------
+def scope_for(user):
+    qs = SearchDocument.objects.all()
+    if user.role == "ADMIN":
+        return qs
+    if user.role == "SUPERVISOR":
+        return qs.filter(supervisor=user)
+    if user.role == "INTERN":
+        return qs.filter(intern=user)
+    return qs.none()
+
+
+def _mysql(qs, words, offset, limit):
+    long_words = [w for w in words if len(w) >= int(getattr(settings, "SEARCH_MYSQL_MIN_TOKEN", 3))]
+    if not long_words:
+        # all below innodb_ft_min_token_size: the FULLTEXT index has no entries for them
+        return _python(qs, words, offset, limit)
+    against = " ".join(f"+{w}*" for w in long_words)
+    match = RawSQL("MATCH (title, body) AGAINST (%s IN BOOLEAN MODE)", (against,))
+    rows = qs.annotate(score=match).filter(score__gt=0).order_by("-score", "-created_at")[offset:offset + limit]
+    return [(d, float(d.score)) for d in rows]
+
+
+def _fts5(qs, words, offset, limit):
+    expr = " ".join(f'"{w}"*' for w in words)
+    scope_sql, scope_params = qs.values("id").query.sql_with_params()
+    # "+rowid": keeps SQLite from handing the IN to FTS5 as a rowid lookup
+    # (one MATCH per candidate row) instead of running the MATCH once
+    with connection.cursor() as c:
+        c.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, 2.0, 1.0) AS rank FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND +rowid IN ({scope_sql}) ORDER BY rank LIMIT %s OFFSET %s",
+            [expr, *scope_params, limit, offset],
+        )
+        hits = c.fetchall()
+    docs = SearchDocument.objects.in_bulk([pk for pk, _ in hits])
+    return [(docs[pk], -rank) for pk, rank in hits if pk in docs]
+
+
+def _python(qs, words, offset, limit):
+    for w in words:
+        qs = qs.filter(Q(title__icontains=w) | Q(body__icontains=w))
+    scan = int(getattr(settings, "SEARCH_PYTHON_SCAN_LIMIT", 2000))
+    scored = []
+    for d in qs.order_by("-created_at")[:scan]:
+        title, body = d.title.lower(), d.body.lower()
+        tf = sum(2 * title.count(w) + body.count(w) for w in words)
+        scored.append((d, tf / log(len(body) + len(title) + 2)))
+    scored.sort(key=lambda x: -x[1])
+    return scored[offset:offset + limit]
+
+
+def search(user, q, kinds=None, offset=0, limit=20):
+    """-> [(SearchDocument, score)] best first; empty for a query with no words."""
+    words = terms(q)
+    if not words:
+        return []
+    qs = scope_for(user)
+    if kinds:
+        qs = qs.filter(kind__in=kinds)
+    run = {"mysql": _mysql, "fts5": _fts5}.get(backend(), _python)
+    return run(qs, words, offset, limit)
+
+
+def snippet(text: str, words: list[str]) -> str:
+    low = text.lower()
+    hits = [i for i in (low.find(w) for w in words) if i >= 0]
+    start = max(0, min(hits) - SNIPPET_CHARS // 4) if hits else 0
+    out = text[start:start + SNIPPET_CHARS].strip()
+    return ("…" if start else "") + out + ("…" if start + SNIPPET_CHARS < len(text) else "")
@@ -1,3 +1,4 @@
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Task
 
@@ -8,7 +9,7 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = "__all__"
+        exclude = ["batch"]
 
 class TaskCreateSerializer(serializers.Serializer):
     intern = serializers.IntegerField()
@@ -36,3 +37,104 @@ class ComplaintCreateSerializer(serializers.Serializer):
 
 class ComplaintStatusSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=["OPEN","IN_REVIEW","RESOLVED"])
+
+
+# ---------- fast list rows ----------
+# List endpoints skip the serializer machinery: a RowSpec fetches only its
+# columns with values_list() (joins for the dotted lookups, no model
+# instances) and builds each dict with dict(zip()), formatting only the
+# datetime columns.
+ISO = "iso"  # value.isoformat(), what the hand-written list views returned
+DRF_DATETIME = "drf"  # what serializers.DateTimeField returns: current timezone, "Z" for UTC
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _drf_datetime(tz):
+    def fmt(value):
+        if not value:
+            return None
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    return fmt
+
+
+class RowSpec:
+    def __init__(self, name, *fields):
+        """fields: (output key, values_list lookup[, ISO | DRF_DATETIME])"""
+        self.name = name
+        self.keys = [f[0] for f in fields]
+        self.lookups = [f[1] for f in fields]
+        self.index = {lookup: i for i, lookup in enumerate(self.lookups)}
+        # (output key, column) of the formatted columns
+        self.iso = [(f[0], i) for i, f in enumerate(fields) if f[2:] == (ISO,)]
+        self.drf = [(f[0], i) for i, f in enumerate(fields) if f[2:] == (DRF_DATETIME,)]
+
+    def values(self, qs):
+        return qs.values_list(*self.lookups)
+
+    def build(self, tuples) -> list[dict]:
+        keys = self.keys
+        drf = _drf_datetime(timezone.get_current_timezone())
+        formats = [(key, i, _iso) for key, i in self.iso] + [(key, i, drf) for key, i in self.drf]
+        rows = []
+        for r in tuples:
+            row = dict(zip(keys, r))
+            for key, i, fmt in formats:
+                row[key] = fmt(r[i])  # the key is already there, so the order holds
+            rows.append(row)
+        return rows
+
+    def rows(self, qs) -> list[dict]:
+        return self.build(self.values(qs))
+
+    def cursor_key(self, r):
+        """(created_at, id) of a fetched tuple, for pagination.cursor_page."""
+        return r[self.index["created_at"]], r[self.index["id"]]
+
+
+# same keys, order and formatting as TaskSerializer
+TASK_ROWS = RowSpec(
+    "task",
+    ("id", "id"), ("intern_name", "intern__full_name"), ("supervisor_name", "supervisor__full_name"),
+    ("intern_email", "intern__email"), ("title", "title"), ("description", "description"),
+    ("status", "status"), ("star_rating", "star_rating"), ("supervisor_feedback", "supervisor_feedback"),
+    ("created_at", "created_at", DRF_DATETIME), ("updated_at", "updated_at", DRF_DATETIME),
+    ("supervisor", "supervisor"), ("intern", "intern"),
+)
+
+REPORT_ROWS = RowSpec(
+    "report",
+    ("id", "id"), ("task_id", "task_id"), ("task_title", "task__title"), ("intern", "intern__email"),
+    ("content", "content"), ("created_at", "created_at", ISO),
+)
+
+ATTENDANCE_ROWS = RowSpec(
+    "attendance",
+    ("id", "id"), ("intern", "intern__full_name"), ("email", "intern__email"), ("in_office", "in_office"),
+    ("location_validated", "location_validated"), ("distance_m", "office_distance_m"),
+    ("created_at", "created_at", ISO),
+)
+
+# admin view: both parties
+COMPLAINT_ROWS = RowSpec(
+    "complaint",
+    ("id", "id"), ("intern", "intern__email"), ("supervisor", "supervisor__email"), ("subject", "subject"),
+    ("status", "status"), ("created_at", "created_at", ISO),
+)
+
+# supervisor view: the intern and the message
+SUPERVISOR_COMPLAINT_ROWS = RowSpec(
+    "supervisor complaint",
+    ("id", "id"), ("intern", "intern__email"), ("subject", "subject"), ("message", "message"),
+    ("status", "status"), ("created_at", "created_at", ISO),
+)
+
+# intern view: their own complaints
+INTERN_COMPLAINT_ROWS = RowSpec(
+    "intern complaint",
+    ("id", "id"), ("subject", "subject"), ("message", "message"), ("status", "status"),
+    ("created_at", "created_at", ISO),
+)
@@ -0,0 +1,29 @@
+"""
+Loaded-from-the-database values of the fields that the signal-maintained
+counters (analytics.py, summaries.py) diff against.
+
+A post_init receiver records the fields as they were loaded. post_save
+handlers compare against that record, then call take() again so that a
+second save() of the same instance diffs against the first. Each counter
+module gets its own FieldSnapshot, stored in its own attribute, so the
+order in which their post_save handlers run does not matter.
+"""
+from django.db.models.signals import post_init
+
+
+class FieldSnapshot:
+    def __init__(self, name, fields, senders):
+        self.attr = f"_{name}_snapshot"
+        self.fields = tuple(fields)
+        for sender in senders:
+            post_init.connect(self.take, sender=sender, weak=False, dispatch_uid=(self.attr, sender))
+
+    def take(self, instance, **kwargs):
+        # __dict__ so deferred fields (.only()) are not fetched one row at a time
+        setattr(instance, self.attr, {f: instance.__dict__.get(f) for f in self.fields})
+
+    def old(self, instance, field):
+        return getattr(instance, self.attr)[field]
+
+    def changed(self, instance, field) -> bool:
+        return getattr(instance, field) != self.old(instance, field)
@@ -0,0 +1,108 @@
+"""
+/api/events/ — text/event-stream of internships.events for the signed-in user.
+
+This is a bare ASGI app mounted in backend/asgi.py ahead of Django, so an idle
+stream holds no worker thread or middleware stack. EventSource can't send an
+Authorization header, so the access token comes as ?token=; the stream ends
+when that token expires and the client reconnects with a fresh one.
+"""
+import asyncio
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from accounts.authentication import CachedJWTAuthentication
+from .events import get_broker, role_channel, user_channel
+
+
+def _authenticate(raw_token):
+    auth = CachedJWTAuthentication()
+    token = auth.get_validated_token(raw_token)
+    return auth.get_user(token), token.get("exp")
+
+
+def _cors_headers(scope):
+    origin = dict(scope.get("headers") or []).get(b"origin")
+    if not origin:
+        return []
+    allowed = getattr(settings, "CORS_ALLOW_ALL_ORIGINS", False) or \
+        origin.decode("latin-1") in getattr(settings, "CORS_ALLOWED_ORIGINS", [])
+    return [(b"access-control-allow-origin", origin), (b"vary", b"Origin")] if allowed else []
+
+
+async def _reply(send, status, body, extra=()):
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"), *extra]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _wait_for_disconnect(receive):
+    # a GET still delivers its (empty) http.request first
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+def _frame(event) -> bytes:
+    lines = [f"id: {event['id']}", f"event: {event['event']}"]
+    lines += [f"data: {line}" for line in event["data"].splitlines() or [""]]
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def sse_application(scope, receive, send):
+    cors = _cors_headers(scope)
+    if scope["method"] != "GET":
+        return await _reply(send, 405, b'{"detail": "Method not allowed"}', cors)
+
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    headers = dict(scope.get("headers") or [])
+    raw = (query.get("token") or [""])[0]
+    if not raw and headers.get(b"authorization", b"").startswith(b"Bearer "):
+        raw = headers[b"authorization"][7:].decode("latin-1")
+    if not raw:
+        return await _reply(send, 401, b'{"detail": "token required"}', cors)
+    try:
+        user, exp = await sync_to_async(_authenticate)(raw)
+    except (InvalidToken, AuthenticationFailed):
+        return await _reply(send, 401, b'{"detail": "Invalid or expired token"}', cors)
+
+    last_id = (headers.get(b"last-event-id") or b"").decode("latin-1") or (query.get("last_event_id") or [""])[0]
+    last_id = int(last_id) if last_id.isdigit() else None
+
+    heartbeat = float(getattr(settings, "EVENTS_HEARTBEAT_SECONDS", 15))
+    deadline = min(exp or float("inf"), time.time() + float(getattr(settings, "EVENTS_MAX_STREAM_SECONDS", 3600)))
+
+    sub = get_broker().subscribe([user_channel(user.id), role_channel(user.role)], last_id=last_id)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    started = False
+    try:
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+            *cors,
+        ]})
+        started = True
+        await send({"type": "http.response.body", "body": b"retry: 3000\n\n", "more_body": True})
+
+        while time.time() < deadline:
+            pending = asyncio.ensure_future(sub.next(min(heartbeat, max(deadline - time.time(), 0.1))))
+            await asyncio.wait([pending, disconnected], return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                pending.cancel()
+                break
+            event = pending.result()
+            if sub.overflowed:
+                break
+            body = _frame(event) if event else b": ping\n\n"
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+    finally:
+        sub.close()
+        disconnected.cancel()
+        if started:
+            try:
+                await send({"type": "http.response.body", "body": b""})
+            except OSError:
+                pass  # the client is already gone
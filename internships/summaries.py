@@ -0,0 +1,181 @@
+"""
+InternSummary maintenance.
+
+Same scheme as analytics.py, keyed by intern instead of day: signal handlers
+turn every Task / Attendance / Complaint create, status or rating change and
+delete into F() deltas on the intern's summary row, so it commits or rolls
+back together with the change itself when the caller is inside
+transaction.atomic() (the intern/supervisor views are). Bulk operations skip
+signals; rebuild() (via `manage.py rebuild_intern_summaries`) recomputes from
+the source tables.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import User
+from .models import Task, Attendance, AttendanceDay, Complaint, InternSummary
+from .snapshots import FieldSnapshot
+
+TASK_STATUS_FIELD = {"IN_PROGRESS": "tasks_open", "DONE": "tasks_done", "COMPLETED": "tasks_completed"}
+UNRESOLVED = ("OPEN", "IN_REVIEW")
+_snapshot = FieldSnapshot("summary", ("status", "star_rating"), (Task, Complaint))
+
+
+def apply_delta(intern_id, deltas: Counter, create=True, **extra):
+    """
+    create=False for deletes: the intern may be going away in the same
+    cascade, and a missing row has nothing to decrement anyway.
+    """
+    deltas = {k: v for k, v in deltas.items() if k and v}
+    if not deltas and not extra:
+        return
+    updates = {k: F(k) + v for k, v in deltas.items()}
+    updates.update(extra, updated_at=timezone.now())
+    if InternSummary.objects.filter(intern_id=intern_id).update(**updates) or not create:
+        return
+    with transaction.atomic():
+        InternSummary.objects.get_or_create(intern_id=intern_id)
+        InternSummary.objects.filter(intern_id=intern_id).update(**updates)
+
+
+def apply_field_deltas(field, per_intern: Counter):
+    """
+    For bulk writes (which skip signals): add per_intern[id] to `field` with
+    one UPDATE per distinct delta rather than one per intern.
+    """
+    by_delta = defaultdict(list)
+    for intern_id, n in per_intern.items():
+        if n:
+            by_delta[n].append(intern_id)
+    if not by_delta:
+        return
+    InternSummary.objects.bulk_create(
+        [InternSummary(intern_id=pk) for ids in by_delta.values() for pk in ids], ignore_conflicts=True,
+    )
+    now = timezone.now()
+    for n, ids in by_delta.items():
+        InternSummary.objects.filter(intern_id__in=ids).update(**{field: F(field) + n}, updated_at=now)
+
+
+def _rating_delta(d: Counter, rating, sign):
+    if rating:
+        d["rating_sum"] += sign * rating
+        d["rating_count"] += sign
+
+
+# ---------- signal handlers ----------
+@receiver(post_save, sender=Task)
+def _task_saved(sender, instance, created, **kwargs):
+    d = Counter()
+    if created:
+        d[TASK_STATUS_FIELD.get(instance.status)] += 1
+        _rating_delta(d, instance.star_rating, 1)
+    else:
+        if _snapshot.changed(instance, "status"):
+            d[TASK_STATUS_FIELD.get(_snapshot.old(instance, "status"))] -= 1
+            d[TASK_STATUS_FIELD.get(instance.status)] += 1
+        if _snapshot.changed(instance, "star_rating"):
+            _rating_delta(d, _snapshot.old(instance, "star_rating"), -1)
+            _rating_delta(d, instance.star_rating, 1)
+    apply_delta(instance.intern_id, d)
+    _snapshot.take(instance)
+
+
+@receiver(post_delete, sender=Task)
+def _task_deleted(sender, instance, **kwargs):
+    d = Counter()
+    d[TASK_STATUS_FIELD.get(_snapshot.old(instance, "status"))] -= 1
+    _rating_delta(d, _snapshot.old(instance, "star_rating"), -1)
+    apply_delta(instance.intern_id, d, create=False)
+
+
+@receiver(post_save, sender=Attendance)
+def _attendance_saved(sender, instance, created, **kwargs):
+    if created:
+        apply_delta(
+            instance.intern_id,
+            Counter({"attendance_total": 1, "attendance_validated": 1 if instance.location_validated else 0}),
+            last_attendance_at=Greatest(Coalesce(F("last_attendance_at"), instance.created_at), instance.created_at),
+        )
+
+
+@receiver(post_delete, sender=Attendance)
+def _attendance_deleted(sender, instance, **kwargs):
+    latest = Attendance.objects.filter(intern_id=OuterRef("intern_id")).order_by("-created_at").values("created_at")[:1]
+    apply_delta(
+        instance.intern_id,
+        Counter({"attendance_total": -1, "attendance_validated": -1 if instance.location_validated else 0}),
+        create=False,
+        last_attendance_at=Subquery(latest),
+    )
+
+
+@receiver(post_save, sender=Complaint)
+def _complaint_saved(sender, instance, created, **kwargs):
+    was_open = not created and _snapshot.old(instance, "status") in UNRESOLVED
+    now_open = instance.status in UNRESOLVED
+    if was_open != now_open:
+        apply_delta(instance.intern_id, Counter({"complaints_open": 1 if now_open else -1}))
+    _snapshot.take(instance)
+
+
+@receiver(post_delete, sender=Complaint)
+def _complaint_deleted(sender, instance, **kwargs):
+    if _snapshot.old(instance, "status") in UNRESOLVED:
+        apply_delta(instance.intern_id, Counter({"complaints_open": -1}), create=False)
+
+
+# ---------- rebuild ----------
+def rebuild(intern_ids=None, batch_size=500) -> int:
+    """Recompute summaries for `intern_ids` (default: every intern). Returns rows written."""
+    interns = User.objects.filter(role="INTERN").order_by("id")
+    if intern_ids is not None:
+        interns = interns.filter(id__in=intern_ids)
+    ids = list(interns.values_list("id", flat=True))
+
+    written = 0
+    for i in range(0, len(ids), batch_size):
+        batch = ids[i:i + batch_size]
+        rows = {pk: InternSummary(intern_id=pk) for pk in batch}
+
+        tasks = (
+            Task.objects.filter(intern_id__in=batch).values("intern_id")
+            .annotate(
+                open=Count("id", filter=Q(status="IN_PROGRESS")),
+                done=Count("id", filter=Q(status="DONE")),
+                completed=Count("id", filter=Q(status="COMPLETED")),
+                rsum=Sum("star_rating"),
+                rcount=Count("star_rating"),
+            )
+        )
+        for r in tasks:
+            s = rows[r["intern_id"]]
+            s.tasks_open, s.tasks_done, s.tasks_completed = r["open"], r["done"], r["completed"]
+            s.rating_sum, s.rating_count = r["rsum"] or 0, r["rcount"]
+
+        att = (
+            AttendanceDay.objects.filter(intern_id__in=batch).values("intern_id")
+            .annotate(total=Sum("pings"), validated=Sum("validated_pings"), last=Max("last_check_in")).order_by()
+        )
+        for r in att:
+            s = rows[r["intern_id"]]
+            s.attendance_total, s.attendance_validated, s.last_attendance_at = r["total"], r["validated"], r["last"]
+
+        comps = (
+            Complaint.objects.filter(intern_id__in=batch, status__in=UNRESOLVED)
+            .values("intern_id").annotate(c=Count("id"))
+        )
+        for r in comps:
+            rows[r["intern_id"]].complaints_open = r["c"]
+
+        with transaction.atomic():
+            InternSummary.objects.filter(intern_id__in=batch).delete()
+            InternSummary.objects.bulk_create(rows.values())
+        written += len(rows)
+    return written
@@ -1,3 +1,300 @@
-from django.test import TestCase
+import json
+import random
+from datetime import date, datetime
+from math import atan2, cos, radians, sin, sqrt
 
-# Create your tests here.
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from accounts.renderers import FastJSONRenderer
+from . import analytics, benchmark, progress
+from .geofence import Geofence
+from .models import ActivityLog, Complaint, DailyRollup, Task, TaskReport
+from .query_plans import hot_querysets, plan_problems
+from .serializers import (
+    COMPLAINT_ROWS, INTERN_COMPLAINT_ROWS, REPORT_ROWS, SUPERVISOR_COMPLAINT_ROWS, TASK_ROWS, TaskSerializer,
+)
+
+
+class QueryPlanTests(TestCase):
+    """Every hot list queryset must be served from an index (see internships/query_plans.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sup = User.objects.create_user(email="plans-sup@example.com", password=None, full_name="Sup", role="SUPERVISOR")
+        User.objects.create_user(email="plans-intern@example.com", password=None, full_name="Intern", role="INTERN",
+                                 supervisor=sup)
+
+    def test_hot_querysets_use_indexes(self):
+        for name, qs, allow_sort in hot_querysets():
+            with self.subTest(name):
+                checked = plan_problems(qs, allow_sort)
+                if checked is None:
+                    self.skipTest("no plan rules for this database")
+                problems, plan = checked
+                self.assertEqual(problems, [], f"{name}:\n{plan}")
+
+
+class LocalTimeBucketTests(TestCase):
+    """Day and month buckets follow TIME_ZONE without the database's time zone data (localtime.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sup = User.objects.create_user(email="tz-sup@example.com", password=None, full_name="Sup", role="SUPERVISOR")
+        intern = User.objects.create_user(email="tz-intern@example.com", password=None, full_name="Intern",
+                                          role="INTERN", supervisor=cls.sup)
+        tz = timezone.get_current_timezone()
+        for ts in (datetime(2026, 9, 30, 23, 59, 59, tzinfo=tz), datetime(2026, 10, 1, 0, 0, tzinfo=tz),
+                   datetime(2026, 10, 31, 23, 59, tzinfo=tz)):
+            task = Task.objects.create(supervisor=cls.sup, intern=intern, title="t")
+            Task.objects.filter(pk=task.pk).update(created_at=ts)
+
+    def test_rollup_days(self):
+        analytics.rebuild_days(date(2026, 9, 30), date(2026, 11, 1))
+        self.assertEqual(
+            list(DailyRollup.objects.order_by("day").values_list("day", "tasks_created")),
+            [(date(2026, 9, 30), 1), (date(2026, 10, 1), 1), (date(2026, 10, 31), 1)],
+        )
+
+    def test_progress_months(self):
+        interns = progress.monthly_progress(self.sup, date(2026, 9, 1), date(2026, 11, 1))
+        self.assertEqual([(m["month"], m["tasks"]) for m in interns[0]["months"]], [("2026-09", 1), ("2026-10", 2)])
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """The scalar distance the attendance check used before internships/geofence.py."""
+    phi1, phi2 = radians(lat1), radians(lat2)
+    a = sin(radians(lat2 - lat1) / 2) ** 2 + cos(phi1) * cos(phi2) * sin(radians(lng2 - lng1) / 2) ** 2
+    return 6371000.0 * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+class GeofenceTests(TestCase):
+    """The vectorized Geofence against a per-site scalar haversine loop."""
+
+    SITES = [
+        {"name": "main", "lat": 27.7172, "lng": 85.3240, "radius_m": 150.0},
+        # overlaps main: a point can be inside both, nearer to one and accepted by the other
+        {"name": "annex", "lat": 27.7182, "lng": 85.3252, "radius_m": 60.0},
+        {"name": "wide", "lat": 27.7190, "lng": 85.3200, "radius_m": 400.0},
+        {"name": "north", "lat": 64.1466, "lng": -21.9426, "radius_m": 200.0},
+    ]
+
+    def reference(self, lat, lng, sites=None):
+        """(validated, site, distance): the closest accepting site, else the nearest one."""
+        sites = sites or self.SITES
+        dist = [haversine_m(lat, lng, s["lat"], s["lng"]) for s in sites]
+        accepting = [i for i, s in enumerate(sites) if dist[i] <= s["radius_m"]]
+        site = min(accepting or range(len(dist)), key=dist.__getitem__)
+        return bool(accepting), site, dist[site]
+
+    def points(self, n=4000):
+        rng = random.Random(7)
+        out = []
+        for _ in range(n):
+            s = rng.choice(self.SITES)
+            # up to 1.5 radii from a site, most of them near a fence edge
+            r = s["radius_m"] * rng.choice([rng.uniform(0, 1.5), rng.uniform(0.97, 1.03)])
+            bearing = rng.uniform(0, 6.283185307179586)
+            out.append((
+                s["lat"] + r * cos(bearing) / 111195.0,
+                s["lng"] + r * sin(bearing) / (111195.0 * cos(radians(s["lat"]))),
+            ))
+        return out
+
+    def test_matches_scalar_haversine(self):
+        fence = Geofence(self.SITES)
+        pts = self.points()
+        distance, validated, site = fence.check([p[0] for p in pts], [p[1] for p in pts])
+        for k, (lat, lng) in enumerate(pts):
+            ok, ref_site, ref_dist = self.reference(lat, lng)
+            with self.subTest(point=(lat, lng)):
+                self.assertEqual(bool(validated[k]), ok)
+                self.assertAlmostEqual(float(distance[k]), haversine_m(lat, lng, self.SITES[site[k]]["lat"],
+                                                                       self.SITES[site[k]]["lng"]), delta=1e-6)
+                if ok:
+                    self.assertEqual(int(site[k]), ref_site)
+                else:
+                    # the nearest site is picked on a planar approximation: allow near-ties
+                    self.assertLessEqual(float(distance[k]), ref_dist * 1.001)
+
+    def test_fence_edges(self):
+        fence = Geofence(self.SITES)
+        for s in self.SITES:
+            for frac in (0.9995, 1.0005):
+                for k in range(16):
+                    bearing = k * 6.283185307179586 / 16
+                    r = s["radius_m"] * frac
+                    lat = s["lat"] + r * cos(bearing) / 111195.0
+                    lng = s["lng"] + r * sin(bearing) / (111195.0 * cos(radians(s["lat"])))
+                    with self.subTest(site=s["name"], frac=frac, bearing=k):
+                        self.assertEqual(fence.check_one(lat, lng)[1], self.reference(lat, lng)[0])
+
+    def test_accepting_site_is_reported_over_a_nearer_one(self):
+        sites = [
+            {"name": "small", "lat": 27.7172, "lng": 85.3240, "radius_m": 20.0},
+            {"name": "large", "lat": 27.7172, "lng": 85.3250, "radius_m": 200.0},
+        ]
+        # ~30 m from small (outside it), ~70 m from large (inside it)
+        lat, lng = 27.7172, 85.3240 + 30 / (111195.0 * cos(radians(27.7172)))
+        distance, validated, site = Geofence(sites).check_one(lat, lng)
+        self.assertEqual((validated, site), (True, 1))
+        self.assertEqual(self.reference(lat, lng, sites)[:2], (True, 1))
+        self.assertAlmostEqual(distance, haversine_m(lat, lng, 27.7172, 85.3250), delta=1e-6)
+
+    def test_no_sites(self):
+        self.assertEqual(Geofence([]).check_one(27.7, 85.3), (None, False, None))
+
+
+class RowSpecTests(TestCase):
+    """The list RowSpecs return exactly what the serializer / hand-written views did."""
+
+    @classmethod
+    def setUpTestData(cls):
+        sup = User.objects.create_user(email="rows-sup@example.com", password=None, full_name="Sup", role="SUPERVISOR")
+        intern = User.objects.create_user(email="rows-intern@example.com", password=None, full_name="Intern",
+                                          role="INTERN", supervisor=sup)
+        done = Task.objects.create(supervisor=sup, intern=intern, title="Rated", description="d", status="DONE",
+                                   star_rating=4, supervisor_feedback="ok")
+        Task.objects.create(supervisor=sup, intern=intern, title="Open")
+        TaskReport.objects.create(task=done, intern=intern, content="report")
+        Complaint.objects.create(intern=intern, supervisor=sup, subject="s", message="m")
+        Complaint.objects.create(intern=intern, supervisor=None, subject="s2", message="m2", status="RESOLVED")
+
+    def assertSameRows(self, rows, expected):
+        # key order too: it is what the JSON looks like
+        self.assertEqual([list(r.items()) for r in rows], [list(e.items()) for e in expected])
+
+    def test_task_rows_match_task_serializer(self):
+        qs = Task.objects.order_by("-created_at")
+        for tz in ("Asia/Kathmandu", "UTC"):
+            with self.subTest(tz), timezone.override(tz):
+                rows = TASK_ROWS.rows(qs)
+                data = TaskSerializer(qs.select_related("intern", "supervisor"), many=True).data
+                self.assertSameRows(rows, data)
+                self.assertEqual(FastJSONRenderer().render(rows), JSONRenderer().render(data))
+
+    def test_report_rows(self):
+        qs = TaskReport.objects.select_related("task", "intern").order_by("-created_at")
+        self.assertSameRows(REPORT_ROWS.rows(qs), [{
+            "id": r.id, "task_id": r.task.id, "task_title": r.task.title, "intern": r.intern.email,
+            "content": r.content, "created_at": r.created_at.isoformat(),
+        } for r in qs])
+
+    def test_complaint_rows(self):
+        qs = Complaint.objects.select_related("intern", "supervisor").order_by("-created_at")
+        self.assertSameRows(COMPLAINT_ROWS.rows(qs), [{
+            "id": c.id, "intern": c.intern.email, "supervisor": c.supervisor.email if c.supervisor else None,
+            "subject": c.subject, "status": c.status, "created_at": c.created_at.isoformat(),
+        } for c in qs])
+        self.assertSameRows(SUPERVISOR_COMPLAINT_ROWS.rows(qs), [{
+            "id": c.id, "intern": c.intern.email, "subject": c.subject, "message": c.message,
+            "status": c.status, "created_at": c.created_at.isoformat(),
+        } for c in qs])
+        self.assertSameRows(INTERN_COMPLAINT_ROWS.rows(qs), [{
+            "id": c.id, "subject": c.subject, "message": c.message, "status": c.status,
+            "created_at": c.created_at.isoformat(),
+        } for c in qs])
+
+
+class AdminBulkAssignTests(TestCase):
+    """POST admin/assignments/bulk/: validate everything, then one UPDATE ... CASE."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="bulk-admin@example.com", password=None, full_name="A", role="ADMIN")
+        cls.sup_a = User.objects.create_user(email="bulk-a@example.com", password=None, full_name="A", role="SUPERVISOR")
+        cls.sup_b = User.objects.create_user(email="bulk-b@example.com", password=None, full_name="B", role="SUPERVISOR")
+        cls.interns = [
+            User.objects.create_user(email=f"bulk-i{n}@example.com", password=None, full_name=f"I{n}", role="INTERN",
+                                     supervisor=cls.sup_a)
+            for n in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def post(self, body, query=""):
+        return self.client.post(f"/api/internships/admin/assignments/bulk/{query}", body, format="json")
+
+    def supervisors(self):
+        return [User.objects.get(pk=i.pk).supervisor_id for i in self.interns]
+
+    def test_dry_run_writes_nothing_and_reports_the_same_diff(self):
+        body = {"assignments": [
+            {"intern": "BULK-I0@example.com", "supervisor": self.sup_b.email},
+            {"intern": self.interns[1].id, "supervisor": self.sup_a.id},
+        ]}
+        dry = self.post(body, "?dry_run=1")
+        self.assertEqual(dry.status_code, 200)
+        self.assertFalse(dry.data["applied"])
+        self.assertEqual(self.supervisors(), [self.sup_a.id] * 3)
+        self.assertFalse(ActivityLog.objects.exists())
+
+        real = self.post(body)
+        self.assertTrue(real.data["applied"])
+        self.assertEqual(real.data["rows"], dry.data["rows"])
+        self.assertEqual((real.data["changes"], real.data["unchanged"], real.data["errors"]), (1, 1, 0))
+        self.assertEqual([r["status"] for r in real.data["rows"]], ["change", "unchanged"])
+        self.assertEqual(self.supervisors(), [self.sup_b.id, self.sup_a.id, self.sup_a.id])
+
+    def test_error_rows_block_the_whole_request(self):
+        resp = self.post({"assignments": [
+            {"intern": self.interns[0].email, "supervisor": self.sup_b.email},
+            {"intern": "nobody@example.com", "supervisor": self.sup_b.email},
+            {"intern": self.sup_a.email, "supervisor": self.sup_b.email},
+            {"intern": self.interns[1].email, "supervisor": "nobody@example.com"},
+            {"intern": self.interns[0].id, "supervisor": None},
+        ]})
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(resp.data["applied"])
+        self.assertEqual(
+            [(r["status"], r.get("detail")) for r in resp.data["rows"]],
+            [("change", None), ("error", "Intern not found"), ("error", "Intern not found"),
+             ("error", "Supervisor not found"), ("error", "Intern listed more than once")],
+        )
+        self.assertEqual(resp.data["errors"], 4)
+        self.assertEqual(self.supervisors(), [self.sup_a.id] * 3)
+
+    def test_each_row_gets_its_own_supervisor(self):
+        csv_body = "intern,supervisor\n" + "\n".join([
+            f"{self.interns[0].email},{self.sup_b.email}",
+            f"{self.interns[1].id},{self.sup_b.id}",
+            f"{self.interns[2].email},",
+        ])
+        resp = self.post({"csv": csv_body})
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(self.supervisors(), [self.sup_b.id, self.sup_b.id, None])
+        self.assertEqual(
+            sorted(ActivityLog.objects.values_list("subject_id", "event_type")),
+            sorted([(self.interns[0].id, "INTERN_ASSIGNED"), (self.interns[1].id, "INTERN_ASSIGNED"),
+                    (self.interns[2].id, "INTERN_UNASSIGNED")]),
+        )
+
+    def test_malformed_bodies(self):
+        for body in ([1, 2], {"assignments": "x"}, {"assignments": [{"intern": True}]}, {}):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
+
+
+class EndpointBenchmarkTests(TransactionTestCase):
+    """
+    Every route against internships/bench_baseline.json: no more queries, no
+    payload more than 10% larger, no error status. Latency is left to
+    `manage.py benchmark_endpoints`. A TransactionTestCase, so on_commit
+    work (cache bumps, events) runs as it does in production.
+    """
+
+    def test_every_route_has_a_spec(self):
+        self.assertEqual(benchmark.missing_specs(), [])
+
+    def test_no_regressions_against_baseline(self):
+        baseline = json.loads(benchmark.BASELINE_PATH.read_text())
+        with override_settings(**benchmark.bench_settings()):
+            ctx = benchmark.seed()
+            results = benchmark.run(ctx, rounds=3)
+        self.assertEqual(sorted(set(results) - set(baseline)), [], "endpoints missing from the baseline")
+        self.assertEqual(benchmark.compare(results, baseline, check_latency=False), [])
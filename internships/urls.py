@@ -2,15 +2,17 @@ from django.urls import path
 
 from .views_admin import (
     AdminAnalyticsView, AdminActivityLogView,
-    AdminAssignmentsData, AdminAssignIntern, AdminUnassignIntern,
+    AdminAssignmentsData, AdminAssignIntern, AdminUnassignIntern, AdminBulkAssign,
     AdminAttendanceView, AdminComplaintsView, AdminProgressView,
-    AdminMonthlyReportCSV, AdminMonthlyReportPDF,
+    AdminMonthlyReportCSV, AdminMonthlyReportPDF, AdminResponseCacheStatsView,
 )
 from .views_supervisor import (
-    SupervisorInternListView, SupervisorTaskCreate, SupervisorTasks, SupervisorRateTask,
+    SupervisorInternListView, SupervisorRosterView, SupervisorTaskCreate, SupervisorTaskBulkCreate, SupervisorTasks, SupervisorRateTask,
+    SupervisorMonthlyProgress,
     SupervisorAttendanceView, SupervisorReportsView,
     SupervisorComplaintList, SupervisorComplaintUpdateStatus,
 )
+from .views_search import SearchView
 from .views_intern import (
     InternMySupervisor, InternMyTasks, InternUpdateTaskStatus, InternSubmitTaskReport,
     InternMarkAttendance, InternComplaints,
@@ -23,17 +25,22 @@ urlpatterns = [
     path("admin/assignments/data/", AdminAssignmentsData.as_view()),
     path("admin/assignments/assign/", AdminAssignIntern.as_view()),
     path("admin/assignments/unassign/", AdminUnassignIntern.as_view()),
+    path("admin/assignments/bulk/", AdminBulkAssign.as_view()),
     path("admin/attendance/", AdminAttendanceView.as_view()),
     path("admin/complaints/", AdminComplaintsView.as_view()),
     path("admin/progress/", AdminProgressView.as_view()),
     path("admin/reports/monthly/csv/", AdminMonthlyReportCSV.as_view()),
     path("admin/reports/monthly/pdf/", AdminMonthlyReportPDF.as_view()),
+    path("admin/cache/stats/", AdminResponseCacheStatsView.as_view()),
 
     # SUPERVISOR
     path("supervisor/interns/", SupervisorInternListView.as_view()),
+    path("supervisor/roster/", SupervisorRosterView.as_view()),
     path("supervisor/tasks/create/", SupervisorTaskCreate.as_view()),
+    path("supervisor/tasks/bulk/", SupervisorTaskBulkCreate.as_view()),
     path("supervisor/tasks/", SupervisorTasks.as_view()),
     path("supervisor/tasks/<int:task_id>/rate/", SupervisorRateTask.as_view()),
+    path("supervisor/progress/monthly/", SupervisorMonthlyProgress.as_view()),
     path("supervisor/attendance/", SupervisorAttendanceView.as_view()),
     path("supervisor/reports/", SupervisorReportsView.as_view()),
     path("supervisor/complaints/", SupervisorComplaintList.as_view()),
@@ -46,4 +53,7 @@ urlpatterns = [
     path("intern/tasks/<int:task_id>/report/", InternSubmitTaskReport.as_view()),
     path("intern/attendance/mark/", InternMarkAttendance.as_view()),
     path("intern/complaints/", InternComplaints.as_view()),
+
+    # ALL ROLES
+    path("search/", SearchView.as_view()),
 ]
@@ -1,12 +0,0 @@
-from math import radians, sin, cos, sqrt, atan2
-
-def haversine_m(lat1, lng1, lat2, lng2):
-    R = 6371000.0
-    phi1 = radians(lat1)
-    phi2 = radians(lat2)
-    dphi = radians(lat2 - lat1)
-    dlambda = radians(lng2 - lng1)
-
-    a = sin(dphi/2)**2 + cos(phi1)*cos(phi2)*sin(dlambda/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
-    return R * c
@@ -1,47 +1,117 @@
-import calendar
-from datetime import datetime
-
-from django.http import HttpResponse
+import csv
+import io
+import itertools
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
 from django.utils.timezone import make_aware
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from accounts.authentication import invalidate_cached_users
+from accounts.conditional import conditional_get
 from accounts.models import User
-from .models import Task, Attendance, Complaint, ActivityLog
+from . import analytics
+from .activity import as_row, entry, log_activities, log_activity
+from .attendance import day_range, day_rows
+from .models import Task, Attendance, AttendanceDay, Complaint, ActivityLog
+from .pagination import InvalidCursor, cursor_page, wants_cursor_page
 from .permissions import IsAdmin
-from .serializers import TaskSerializer
+from .reports import monthly_pdf
+from .response_cache import bump, cached_response, reset_stats, stats as cache_stats
+from .serializers import ATTENDANCE_ROWS, COMPLAINT_ROWS, TASK_ROWS
 
 
 class AdminAnalyticsView(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        return Response({
+        roles = dict(User.objects.values("role").annotate(c=Count("id")).values_list("role", "c"))
+        all_time = analytics.totals()
+        data = {
             "counts": {
-                "interns": User.objects.filter(role="INTERN").count(),
-                "supervisors": User.objects.filter(role="SUPERVISOR").count(),
-                "tasks_total": Task.objects.count(),
-                "complaints_open": Complaint.objects.filter(status="OPEN").count(),
+                "interns": roles.get("INTERN", 0),
+                "supervisors": roles.get("SUPERVISOR", 0),
+                "tasks_total": all_time["tasks_created"],
+                "complaints_open": all_time["complaints_open"],
             }
-        })
+        }
+
+        # optional ?from=YYYY-MM-DD&to=YYYY-MM-DD[&group=day|month] served from DailyRollup
+        first = request.query_params.get("from")
+        last = request.query_params.get("to")
+        if first or last:
+            group = request.query_params.get("group", "day")
+            try:
+                first = datetime.strptime(first or "", "%Y-%m-%d").date()
+                last = datetime.strptime(last or "", "%Y-%m-%d").date()
+            except ValueError:
+                return Response({"detail": "from and to must be YYYY-MM-DD"}, status=400)
+            if group not in ("day", "month"):
+                return Response({"detail": "group must be day or month"}, status=400)
+            data["range"] = {"from": first.isoformat(), "to": last.isoformat(), **analytics.totals(first, last)}
+            data["series"] = analytics.series(first, last, group=group)
+
+        return Response(data)
+
+
+def _activity_filters(params):
+    """
+    ActivityLog filter kwargs from ?event_type=A,B&actor=<id>&subject=<id>
+    &target_model=task&target_id=<id>. Raises ValueError for bad values.
+    """
+    filters = {}
+    if params.get("event_type"):
+        types = params["event_type"].split(",")
+        if not set(types) <= {value for value, _ in ActivityLog.EVENT_CHOICES}:
+            raise ValueError("unknown event_type")
+        filters["event_type__in"] = types
+    for name in ("actor", "subject"):
+        if params.get(name):
+            filters[f"{name}_id"] = int(params[name])
+    if params.get("target_id"):
+        if not params.get("target_model"):
+            raise ValueError("target_id needs target_model")
+        filters["target_id"] = int(params["target_id"])
+    if params.get("target_model"):
+        filters["target_model"] = params["target_model"]
+    return filters
 
 
 class AdminActivityLogView(APIView):
+    """Newest first; filterable (see _activity_filters), cursor-paginated with ?page_size= / ?cursor=."""
     permission_classes = [IsAdmin]
 
+    @cached_response("admin/activity", [ActivityLog, User])
     def get(self, request):
-        logs = ActivityLog.objects.select_related("actor").order_by("-created_at")[:200]
-        return Response([{
-            "id": l.id,
-            "actor": getattr(l.actor, "email", None),
-            "action": l.action,
-            "created_at": l.created_at.isoformat(),
-        } for l in logs])
+        try:
+            qs = ActivityLog.objects.filter(**_activity_filters(request.query_params))
+        except ValueError:
+            return Response({"detail": "event_type must be one of ActivityLog.EVENT_CHOICES; "
+                                       "actor, subject and target_id must be ids; target_id needs target_model"},
+                            status=400)
+        qs = qs.select_related("actor")
+        if wants_cursor_page(request):
+            try:
+                logs, next_cursor = cursor_page(qs, request)
+            except InvalidCursor as e:
+                return Response({"detail": str(e)}, status=400)
+            return Response({"results": [as_row(l, l.actor.email) for l in logs], "next_cursor": next_cursor})
+        logs = qs.order_by("-created_at", "-id")[:200]
+        return Response([as_row(l, l.actor.email) for l in logs])
 
 
 class AdminAssignmentsData(APIView):
     permission_classes = [IsAdmin]
 
+    @conditional_get(lambda request: [User.objects.filter(role__in=["INTERN", "SUPERVISOR"])])
     def get(self, request):
         interns = User.objects.filter(role="INTERN").order_by("full_name")
         supervisors = User.objects.filter(role="SUPERVISOR").order_by("full_name")
@@ -72,9 +142,10 @@ class AdminAssignIntern(APIView):
             return Response({"detail": "Supervisor not found"}, status=404)
 
         intern.supervisor = supervisor
-        intern.save(update_fields=["supervisor"])
+        intern.save(update_fields=["supervisor", "updated_at"])
 
-        ActivityLog.objects.create(actor=request.user, action=f"Assigned {intern.email} -> {supervisor.email}")
+        log_activity(request.user, "INTERN_ASSIGNED", target=intern, subject=intern,
+                     supervisor=supervisor.email, supervisor_id=supervisor.id)
         return Response({"detail": "Assigned"})
 
 
@@ -92,56 +163,276 @@ class AdminUnassignIntern(APIView):
             return Response({"detail": "Intern not found"}, status=404)
 
         intern.supervisor = None
-        intern.save(update_fields=["supervisor"])
+        intern.save(update_fields=["supervisor", "updated_at"])
 
-        ActivityLog.objects.create(actor=request.user, action=f"Unassigned {intern.email}")
+        log_activity(request.user, "INTERN_UNASSIGNED", target=intern, subject=intern)
         return Response({"detail": "Unassigned"})
 
 
+def _user_ref(value):
+    """An id (int) or a lowercased email; None for blank. Raises ValueError for a boolean."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        # True is an int, and would mean user 1
+        raise ValueError("intern and supervisor must be ids or emails")
+    if isinstance(value, int):
+        return value
+    value = str(value).strip()
+    if not value:
+        return None
+    return int(value) if value.isdigit() else value.lower()
+
+
+def _assignment_rows(request):
+    """
+    -> [(intern ref, supervisor ref or None)] from JSON
+    {"assignments": [{"intern": .., "supervisor": ..}, ...]}, a CSV string in
+    {"csv": ".."} or an uploaded "file". CSV columns: intern, supervisor (id or
+    email; an empty supervisor unassigns), optional header row.
+    Raises ValueError for a malformed body.
+    """
+    data = request.data
+    if not isinstance(data, dict):
+        raise ValueError("body must be an object")
+    if "assignments" in data:
+        rows = data.get("assignments")
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise ValueError("assignments must be a list of {intern, supervisor}")
+        return [
+            (_user_ref(r.get("intern", r.get("intern_id"))), _user_ref(r.get("supervisor", r.get("supervisor_id"))))
+            for r in rows
+        ]
+
+    if "file" in request.FILES:
+        text = request.FILES["file"].read().decode("utf-8-sig", errors="replace")
+    elif isinstance(data.get("csv"), str):
+        text = data["csv"]
+    else:
+        raise ValueError("assignments, csv or file required")
+
+    rows = []
+    for n, line in enumerate(csv.reader(io.StringIO(text))):
+        if not line or not any(c.strip() for c in line):
+            continue
+        if n == 0 and line[0].strip().lower() in ("intern", "intern_id", "intern_email"):
+            continue
+        rows.append((_user_ref(line[0]), _user_ref(line[1] if len(line) > 1 else None)))
+    return rows
+
+
+def _users_by_ref(refs, role):
+    ids = {r for r in refs if isinstance(r, int)}
+    emails = {r for r in refs if isinstance(r, str)}
+    if not ids and not emails:
+        return {}
+    # emails are stored lowercased (signup, import) and refs are lowercased by
+    # _user_ref, so a plain IN keeps the email index usable
+    qs = User.objects.filter(Q(id__in=ids) | Q(email__in=emails), role=role)
+    if role == "INTERN":
+        # current supervisor's email for the diff, in the same query
+        qs = qs.select_related("supervisor").only("id", "email", "supervisor__email")
+    else:
+        qs = qs.only("id", "email")
+    found = {}
+    for u in qs:
+        found[u.id] = u
+        found[u.email.lower()] = u
+    return found
+
+
+class AdminBulkAssign(APIView):
+    """
+    Reassign many interns at once. Every row is validated first (interns and
+    supervisors are looked up with one query each); if any row is invalid or
+    ?dry_run=1 / "dry_run": true is given, nothing is written and the diff is
+    returned. Otherwise the changed rows are applied with a single
+    UPDATE ... CASE and logged in bulk.
+    """
+    permission_classes = [IsAdmin]
+
+    def post(self, request):
+        try:
+            rows = _assignment_rows(request)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        if not rows:
+            return Response({"detail": "no assignments given"}, status=400)
+        limit = int(getattr(settings, "ASSIGN_BULK_MAX_ROWS", 5000))
+        if len(rows) > limit:
+            return Response({"detail": f"at most {limit} assignments per request"}, status=400)
+        dry_run = str(request.query_params.get("dry_run", request.data.get("dry_run", ""))).lower() in ("1", "true")
+
+        interns = _users_by_ref([i for i, _ in rows], "INTERN")
+        supervisors = _users_by_ref([s for _, s in rows if s is not None], "SUPERVISOR")
+
+        diff, errors, changes, seen = [], 0, {}, set()
+        for idx, (intern_ref, sup_ref) in enumerate(rows):
+            intern = interns.get(intern_ref)
+            sup = supervisors.get(sup_ref) if sup_ref is not None else None
+            row = {"index": idx, "intern": intern.email if intern else intern_ref}
+            if intern is None:
+                row.update(status="error", detail="Intern not found")
+            elif intern.id in seen:
+                row.update(status="error", detail="Intern listed more than once")
+            elif sup_ref is not None and sup is None:
+                row.update(status="error", detail="Supervisor not found")
+            else:
+                seen.add(intern.id)
+                new_id = sup.id if sup else None
+                row.update(
+                    before=intern.supervisor.email if intern.supervisor_id else None,
+                    after=sup.email if sup else None,
+                    status="unchanged" if intern.supervisor_id == new_id else "change",
+                )
+                if row["status"] == "change":
+                    changes[intern.id] = (intern, new_id, sup)
+            if row["status"] == "error":
+                errors += 1
+            diff.append(row)
+
+        summary = {"changes": len(changes), "unchanged": len(rows) - len(changes) - errors, "errors": errors}
+        if errors or dry_run or not changes:
+            return Response({
+                "applied": False, **summary, "rows": diff,
+            }, status=400 if errors else 200)
+
+        with transaction.atomic():
+            User.objects.filter(id__in=changes).update(
+                supervisor_id=Case(
+                    *[When(id=pk, then=Value(new_id)) for pk, (_, new_id, _) in changes.items()],
+                    output_field=IntegerField(),
+                ),
+                updated_at=timezone.now(),
+            )
+            log_activities(request.user, [
+                entry("INTERN_ASSIGNED", target=intern, subject=intern, supervisor=sup.email, supervisor_id=sup.id)
+                if sup else entry("INTERN_UNASSIGNED", target=intern, subject=intern)
+                for intern, _, sup in changes.values()
+            ])
+        # queryset.update() sends no signals; drop the cached auth copies
+        invalidate_cached_users(list(changes))
+        bump(User)
+        return Response({"applied": True, **summary, "rows": diff})
+
+
 class AdminAttendanceView(APIView):
     permission_classes = [IsAdmin]
 
+    @cached_response("admin/attendance", [Attendance, AttendanceDay, User])
     def get(self, request):
-        qs = Attendance.objects.select_related("intern").order_by("-created_at")[:300]
-        return Response([{
-            "id": a.id,
-            "intern": a.intern.full_name,
-            "email": a.intern.email,
-            "in_office": a.in_office,
-            "location_validated": a.location_validated,
-            "distance_m": a.office_distance_m,
-            "created_at": a.created_at.isoformat(),
-        } for a in qs])
+        # ?from=&to=[&intern=] : one row per intern per day from AttendanceDay
+        try:
+            rng = day_range(request.query_params)
+        except ValueError:
+            return Response({"detail": "from and to must be YYYY-MM-DD, at most ATTENDANCE_RANGE_MAX_DAYS apart"}, status=400)
+        if rng:
+            days = AttendanceDay.objects.select_related("intern").filter(day__gte=rng[0], day__lte=rng[1])
+            if request.query_params.get("intern"):
+                days = days.filter(intern_id=request.query_params["intern"])
+            return Response(day_rows(days.order_by("-day", "intern__full_name")))
+
+        qs = Attendance.objects.order_by("-created_at")[:300]
+        return Response(ATTENDANCE_ROWS.rows(qs))
 
 
 class AdminComplaintsView(APIView):
     permission_classes = [IsAdmin]
 
+    @cached_response("admin/complaints", [Complaint, User])
     def get(self, request):
-        qs = Complaint.objects.select_related("intern", "supervisor").order_by("-created_at")[:200]
-        return Response([{
-            "id": c.id,
-            "intern": c.intern.email,
-            "supervisor": c.supervisor.email if c.supervisor else None,
-            "subject": c.subject,
-            "status": c.status,
-            "created_at": c.created_at.isoformat(),
-        } for c in qs])
+        qs = Complaint.objects.order_by("-created_at")[:200]
+        return Response(COMPLAINT_ROWS.rows(qs))
 
 
 class AdminProgressView(APIView):
     permission_classes = [IsAdmin]
 
+    @cached_response("admin/progress", [Task, User])
     def get(self, request):
-        qs = Task.objects.select_related("intern", "supervisor").order_by("-created_at")[:300]
-        return Response(TaskSerializer(qs, many=True).data)
+        qs = Task.objects.order_by("-created_at")[:300]
+        return Response(TASK_ROWS.rows(qs))
+
+
+class AdminResponseCacheStatsView(APIView):
+    """Hit/miss counters of the admin response cache; POST resets them."""
+    permission_classes = [IsAdmin]
 
+    def get(self, request):
+        return Response({
+            "backend": settings.CACHES["responses"]["BACKEND"],
+            "ttl_seconds": int(getattr(settings, "RESPONSE_CACHE_TTL", 300)),
+            "endpoints": cache_stats(),
+        })
 
-def _month_range(year: int, month: int):
-    last_day = calendar.monthrange(year, month)[1]
-    start = make_aware(datetime(year, month, 1, 0, 0, 0))
-    end = make_aware(datetime(year, month, last_day, 23, 59, 59))
-    return start, end
+    def post(self, request):
+        reset_stats()
+        return Response({"detail": "Reset"})
+
+
+# column name -> Task lookup; the first seven are the historical default
+REPORT_CSV_COLUMNS = {
+    "task_id": "id",
+    "intern_email": "intern__email",
+    "supervisor_email": "supervisor__email",
+    "title": "title",
+    "status": "status",
+    "star_rating": "star_rating",
+    "created_at": "created_at",
+    "intern_name": "intern__full_name",
+    "supervisor_name": "supervisor__full_name",
+    "description": "description",
+    "supervisor_feedback": "supervisor_feedback",
+    "updated_at": "updated_at",
+}
+REPORT_CSV_DEFAULT_COLUMNS = ["task_id", "intern_email", "supervisor_email", "title", "status", "star_rating", "created_at"]
+
+
+def _report_range(params):
+    """
+    (start, end_exclusive, label) from either ?year=&month= or ?start=YYYY-MM-DD&end=YYYY-MM-DD.
+    Raises ValueError when neither form is valid.
+    """
+    if params.get("start") or params.get("end"):
+        start_d = datetime.strptime(params.get("start") or "", "%Y-%m-%d")
+        end_d = datetime.strptime(params.get("end") or "", "%Y-%m-%d")
+        if end_d < start_d:
+            raise ValueError("end before start")
+        label = f"{start_d:%Y%m%d}_{end_d:%Y%m%d}"
+        return make_aware(start_d), make_aware(end_d + timedelta(days=1)), label
+
+    year = int(params.get("year"))
+    month = int(params.get("month"))
+    start = make_aware(datetime(year, month, 1))
+    end = make_aware(datetime(year + month // 12, month % 12 + 1, 1))
+    return start, end, f"{year}_{month}"
+
+
+class _Echo:
+    """csv.writer target that hands each formatted row back instead of buffering it."""
+    def write(self, value):
+        return value
+
+
+async def _in_thread(lines, batch=500):
+    """
+    A sync iterator as an async one, `batch` items per trip to the sync
+    thread. Under ASGI Django collects a sync streaming body into a list
+    before sending anything; an async one goes out as it is produced. Every
+    trip uses the request's thread (thread_sensitive), so a server-side
+    cursor stays on its connection.
+    """
+    take = sync_to_async(lambda: list(itertools.islice(lines, batch)))
+    while part := await take():
+        yield "".join(part)
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
 
 
 class AdminMonthlyReportCSV(APIView):
@@ -149,29 +440,36 @@ class AdminMonthlyReportCSV(APIView):
 
     def get(self, request):
         try:
-            year = int(request.query_params.get("year"))
-            month = int(request.query_params.get("month"))
+            start, end, label = _report_range(request.query_params)
         except (TypeError, ValueError):
-            return Response({"detail": "year and month query params required"}, status=400)
-
-        start, end = _month_range(year, month)
-        tasks = (
-            Task.objects.select_related("intern", "supervisor")
-            .filter(created_at__range=(start, end))
-            .order_by("created_at")
+            return Response({"detail": "year and month (or start and end as YYYY-MM-DD) query params required"}, status=400)
+
+        raw_cols = request.query_params.get("columns")
+        columns = [c.strip() for c in raw_cols.split(",") if c.strip()] if raw_cols else REPORT_CSV_DEFAULT_COLUMNS
+        unknown = [c for c in columns if c not in REPORT_CSV_COLUMNS]
+        if unknown:
+            return Response({"detail": f"unknown columns: {', '.join(unknown)}", "allowed": list(REPORT_CSV_COLUMNS)}, status=400)
+
+        rows = (
+            Task.objects
+            .filter(created_at__gte=start, created_at__lt=end)
+            .order_by("created_at", "id")
+            .values_list(*[REPORT_CSV_COLUMNS[c] for c in columns])
+            .iterator(chunk_size=2000)
         )
 
-        # safe CSV (basic)
-        lines = ["task_id,intern_email,supervisor_email,title,status,star_rating,created_at"]
-        for t in tasks:
-            title = (t.title or "").replace('"', "'")
-            title = f'"{title}"'  # quote title to avoid comma issues
-            lines.append(
-                f"{t.id},{t.intern.email},{t.supervisor.email},{title},{t.status},{t.star_rating or ''},{t.created_at.isoformat()}"
-            )
+        writer = csv.writer(_Echo())
+
+        def stream():
+            yield writer.writerow(columns)
+            for row in rows:
+                yield writer.writerow([_csv_cell(v) for v in row])
 
-        resp = HttpResponse("\n".join(lines), content_type="text/csv; charset=utf-8")
-        resp["Content-Disposition"] = f'attachment; filename="monthly_report_{year}_{month}.csv"'
+        content = stream()
+        if isinstance(request._request, ASGIRequest):
+            content = _in_thread(content)
+        resp = StreamingHttpResponse(content, content_type="text/csv; charset=utf-8")
+        resp["Content-Disposition"] = f'attachment; filename="monthly_report_{label}.csv"'
         return resp
 
 
@@ -179,9 +477,23 @@ class AdminMonthlyReportPDF(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        year = request.query_params.get("year")
-        month = request.query_params.get("month")
-        content = f"Monthly report PDF placeholder - {year}-{month}\nUse CSV export for now."
-        resp = HttpResponse(content.encode("utf-8"), content_type="application/pdf")
-        resp["Content-Disposition"] = f'attachment; filename="monthly_report_{year}_{month}.pdf"'
+        try:
+            year = int(request.query_params.get("year"))
+            month = int(request.query_params.get("month"))
+            start, end, label = _report_range({"year": year, "month": month})
+        except (TypeError, ValueError):
+            return Response({"detail": "year and month query params required"}, status=400)
+
+        path, future = monthly_pdf(year, month, start, end)
+        if path is None:
+            wait = float(getattr(settings, "REPORT_RENDER_WAIT_SECONDS", 20) or 0)
+            try:
+                path = future.result(timeout=wait)
+            except FutureTimeout:
+                resp = Response({"detail": "Report is being generated, try again shortly"}, status=202)
+                resp["Retry-After"] = "5"
+                return resp
+
+        resp = FileResponse(open(path, "rb"), content_type="application/pdf")
+        resp["Content-Disposition"] = f'attachment; filename="monthly_report_{label}.pdf"'
         return resp
@@ -1,23 +1,17 @@
 import math
-from django.conf import settings
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from .models import Task, Attendance, Complaint, TaskReport, ActivityLog
+from accounts.conditional import conditional_get
+from accounts.models import User
+from . import events
+from .activity import log_activity
+from .geofence import get_geofence
+from .models import Task, Attendance, Complaint, TaskReport
+from .pagination import InvalidCursor, cursor_page, wants_cursor_page
 from .permissions import IsIntern
-from .serializers import TaskSerializer
-
-
-def haversine_m(lat1, lon1, lat2, lon2):
-    # meters
-    R = 6371000
-    p1 = math.radians(lat1)
-    p2 = math.radians(lat2)
-    d1 = math.radians(lat2 - lat1)
-    d2 = math.radians(lon2 - lon1)
-    a = math.sin(d1/2)**2 + math.cos(p1)*math.cos(p2)*math.sin(d2/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+from .serializers import INTERN_COMPLAINT_ROWS, TASK_ROWS
 
 
 class InternMySupervisor(APIView):
@@ -33,14 +27,25 @@ class InternMySupervisor(APIView):
 class InternMyTasks(APIView):
     permission_classes = [IsIntern]
 
+    @conditional_get(lambda request: [
+        Task.objects.filter(intern=request.user),
+        User.objects.filter(id__in=[request.user.id, request.user.supervisor_id]),
+    ])
     def get(self, request):
-        qs = Task.objects.filter(intern=request.user).select_related("intern", "supervisor").order_by("-created_at")
-        return Response(TaskSerializer(qs, many=True).data)
+        qs = Task.objects.filter(intern=request.user).order_by("-created_at")
+        if wants_cursor_page(request):
+            try:
+                rows, next_cursor = cursor_page(TASK_ROWS.values(qs), request, key=TASK_ROWS.cursor_key)
+            except InvalidCursor as e:
+                return Response({"detail": str(e)}, status=400)
+            return Response({"results": TASK_ROWS.build(rows), "next_cursor": next_cursor})
+        return Response(TASK_ROWS.rows(qs))
 
 
 class InternUpdateTaskStatus(APIView):
     permission_classes = [IsIntern]
 
+    @transaction.atomic
     def post(self, request, task_id):
         status_val = (request.data.get("status") or "").strip()
         if status_val not in ["DONE", "IN_PROGRESS", "COMPLETED"]:
@@ -52,9 +57,10 @@ class InternUpdateTaskStatus(APIView):
             return Response({"detail": "Task not found"}, status=404)
 
         task.status = status_val
-        task.save(update_fields=["status"])
+        task.save(update_fields=["status", "updated_at"])
 
-        ActivityLog.objects.create(actor=request.user, action=f"Updated task {task.id} -> {status_val}")
+        log_activity(request.user, "TASK_STATUS", target=task, subject=request.user, status=status_val)
+        events.publish_event(events.TASK_STATUS, {"id": task.id, "status": status_val}, users=[task.intern_id, task.supervisor_id])
         return Response({"detail": "Updated"})
 
 
@@ -72,52 +78,59 @@ class InternSubmitTaskReport(APIView):
             return Response({"detail": "Task not found"}, status=404)
 
         r = TaskReport.objects.create(task=task, intern=request.user, content=content)
-        ActivityLog.objects.create(actor=request.user, action=f"Submitted report for task {task.id}")
+        log_activity(request.user, "TASK_REPORTED", target=task, subject=request.user, report_id=r.id)
         return Response({"detail": "Report submitted", "id": r.id})
 
 
 class InternMarkAttendance(APIView):
     permission_classes = [IsIntern]
 
+    @transaction.atomic
     def post(self, request):
         in_office = request.data.get("in_office", False)
         lat = request.data.get("lat", None)
         lng = request.data.get("lng", None)
 
-        # Office config from settings/.env
-        office_lat = float(getattr(settings, "OFFICE_LAT", 0) or 0)
-        office_lng = float(getattr(settings, "OFFICE_LNG", 0) or 0)
-        radius_m = float(getattr(settings, "OFFICE_RADIUS_M", 150) or 150)
-
+        claimed = in_office in [True, "true", "True", 1, "1"]
         location_validated = False
         dist = None
+        site = None
+        radius_m = None
 
-        if in_office in [True, "true", "True", 1, "1"]:
-            # if they claim in office, try validate if lat/lng provided
+        if claimed and lat is not None and lng is not None:
+            # if they claim in office, validate against the office sites; site is
+            # the one that accepted the point, else the nearest
             try:
-                if lat is not None and lng is not None and office_lat and office_lng:
-                    lat = float(lat)
-                    lng = float(lng)
-                    dist = haversine_m(lat, lng, office_lat, office_lng)
-                    location_validated = dist <= radius_m
-            except Exception:
-                location_validated = False
+                lat = float(lat)
+                lng = float(lng)
+            except (TypeError, ValueError):
+                return Response({"detail": "lat and lng must be numbers"}, status=400)
+            if not (math.isfinite(lat) and math.isfinite(lng) and -90 <= lat <= 90 and -180 <= lng <= 180):
+                return Response({"detail": "lat/lng out of range"}, status=400)
+
+            fence = get_geofence()
+            dist, location_validated, idx = fence.check_one(lat, lng)
+            if idx is not None:
+                site = fence.names[idx]
+                radius_m = float(fence.radius[idx])
 
         a = Attendance.objects.create(
             intern=request.user,
-            in_office=bool(in_office in [True, "true", "True", 1, "1"]),
+            in_office=claimed,
             lat=lat if lat is not None else None,
             lng=lng if lng is not None else None,
             location_validated=location_validated,
             office_distance_m=dist,
         )
 
-        ActivityLog.objects.create(actor=request.user, action=f"Marked attendance (in_office={a.in_office}, validated={a.location_validated})")
+        log_activity(request.user, "ATTENDANCE_MARKED", target=a, subject=request.user,
+                     in_office=a.in_office, validated=a.location_validated)
 
         return Response({
             "id": a.id,
             "location_validated": a.location_validated,
             "office_distance_m": a.office_distance_m,
+            "site": site,
             "radius_m": radius_m,
         })
 
@@ -125,16 +138,12 @@ class InternMarkAttendance(APIView):
 class InternComplaints(APIView):
     permission_classes = [IsIntern]
 
+    @conditional_get(lambda request: [Complaint.objects.filter(intern=request.user)])
     def get(self, request):
         qs = Complaint.objects.filter(intern=request.user).order_by("-created_at")[:200]
-        return Response([{
-            "id": c.id,
-            "subject": c.subject,
-            "message": c.message,
-            "status": c.status,
-            "created_at": c.created_at.isoformat(),
-        } for c in qs])
+        return Response(INTERN_COMPLAINT_ROWS.rows(qs))
 
+    @transaction.atomic
     def post(self, request):
         subject = (request.data.get("subject") or "").strip()
         message = (request.data.get("message") or "").strip()
@@ -150,5 +159,13 @@ class InternComplaints(APIView):
             status="OPEN",
         )
 
-        ActivityLog.objects.create(actor=request.user, action=f"Created complaint {c.id}")
+        log_activity(request.user, "COMPLAINT_CREATED", target=c, subject=request.user)
+        events.publish_event(events.COMPLAINT_CREATED, {
+            "id": c.id,
+            "intern": request.user.email,
+            "subject": c.subject,
+            "message": c.message,
+            "status": c.status,
+            "created_at": c.created_at.isoformat(),
+        }, users=[request.user.id, c.supervisor_id])
         return Response({"detail": "Sent", "id": c.id}, status=201)
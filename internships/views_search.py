@@ -0,0 +1,54 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from .models import TaskReport
+from .pagination import page_size_from
+from .search import search, snippet, terms
+
+KINDS = {"task", "report", "complaint"}
+
+
+class SearchView(APIView):
+    """
+    GET ?q=words[&kind=task,report,complaint][&page=N][&page_size=M]
+    Ranked full-text hits within what the caller's role may see.
+    """
+
+    def get(self, request):
+        q = (request.query_params.get("q") or "").strip()
+        if not terms(q):
+            return Response({"detail": "q required"}, status=400)
+
+        kinds = [k for k in (request.query_params.get("kind") or "").split(",") if k]
+        if set(kinds) - KINDS:
+            return Response({"detail": "kind must be task, report and/or complaint"}, status=400)
+
+        try:
+            page = max(1, int(request.query_params.get("page") or 1))
+        except (TypeError, ValueError):
+            return Response({"detail": "page must be a positive integer"}, status=400)
+        size = page_size_from(request)
+
+        # one extra row tells whether there is a next page without a COUNT
+        hits = search(request.user, q, kinds, offset=(page - 1) * size, limit=size + 1)
+        has_more = len(hits) > size
+        hits = hits[:size]
+
+        report_ids = [d.object_id for d, _ in hits if d.kind == "report"]
+        task_of = dict(TaskReport.objects.filter(id__in=report_ids).values_list("id", "task_id")) if report_ids else {}
+
+        words = terms(q)
+        return Response({
+            "results": [{
+                "kind": d.kind,
+                "id": d.object_id,
+                "task_id": d.object_id if d.kind == "task" else task_of.get(d.object_id),
+                "title": d.title,
+                "snippet": snippet(d.body, words),
+                "intern_id": d.intern_id,
+                "created_at": d.created_at.isoformat(),
+                "score": round(score, 6),
+            } for d, score in hits],
+            "page": page,
+            "next_page": page + 1 if has_more else None,
+        })
@@ -1,23 +1,77 @@
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from accounts.conditional import conditional_get
 from accounts.models import User
-from .models import Task, Attendance, Complaint, TaskReport, ActivityLog
+from . import analytics, events, progress, search, summaries
+from .attendance import day_range, day_rows
+from .activity import entry, log_activities, log_activity
+from .models import Task, Attendance, AttendanceDay, Complaint, TaskReport, InternSummary
+from .pagination import InvalidCursor, cursor_page, wants_cursor_page
+from .response_cache import bump
 from .permissions import IsSupervisor
-from .serializers import TaskSerializer
+from .serializers import (
+    ATTENDANCE_ROWS, REPORT_ROWS, SUPERVISOR_COMPLAINT_ROWS, TASK_ROWS, TaskSerializer,
+)
+
+
+def _roster_scope(request):
+    return User.objects.filter(Q(id=request.user.id) | Q(supervisor=request.user))
 
 
 class SupervisorInternListView(APIView):
     permission_classes = [IsSupervisor]
 
+    @conditional_get(lambda request: [User.objects.filter(role="INTERN", supervisor=request.user)])
     def get(self, request):
         interns = User.objects.filter(role="INTERN", supervisor=request.user).order_by("full_name")
         return Response([{"id": i.id, "full_name": i.full_name, "email": i.email} for i in interns])
 
 
+class SupervisorRosterView(APIView):
+    """Every assigned intern with their InternSummary counters, in one query."""
+    permission_classes = [IsSupervisor]
+
+    @conditional_get(lambda request: [
+        User.objects.filter(role="INTERN", supervisor=request.user),
+        InternSummary.objects.filter(intern__supervisor=request.user),
+    ])
+    def get(self, request):
+        interns = (
+            User.objects.filter(role="INTERN", supervisor=request.user)
+            .select_related("summary").order_by("full_name")
+        )
+        rows = []
+        for i in interns:
+            s = getattr(i, "summary", None) or InternSummary(intern_id=i.id)
+            rows.append({
+                "id": i.id,
+                "full_name": i.full_name,
+                "email": i.email,
+                "tasks_open": s.tasks_open,
+                "tasks_done": s.tasks_done,
+                "tasks_completed": s.tasks_completed,
+                "avg_rating": round(s.avg_rating, 2) if s.avg_rating is not None else None,
+                "rated_tasks": s.rating_count,
+                "attendance_total": s.attendance_total,
+                "validated_ratio": round(s.validated_ratio, 3) if s.validated_ratio is not None else None,
+                "last_attendance_at": s.last_attendance_at.isoformat() if s.last_attendance_at else None,
+                "complaints_open": s.complaints_open,
+            })
+        return Response(rows)
+
+
 class SupervisorTaskCreate(APIView):
     permission_classes = [IsSupervisor]
 
+    @transaction.atomic
     def post(self, request):
         intern_id = request.data.get("intern")
         title = (request.data.get("title") or "").strip()
@@ -39,21 +93,180 @@ class SupervisorTaskCreate(APIView):
             status="IN_PROGRESS",  # default
         )
 
-        ActivityLog.objects.create(actor=request.user, action=f"Created task {task.id} for {intern.email}")
-        return Response(TaskSerializer(task).data, status=201)
+        log_activity(request.user, "TASK_CREATED", target=task, subject=intern)
+        data = TaskSerializer(task).data
+        events.publish_event(events.TASK_ASSIGNED, data, users=[intern.id])
+        return Response(data, status=201)
+
+
+def _bulk_task_items(data, supervisor):
+    """
+    -> list of {"intern", "title", "description"} from either
+    {"items": [{intern, title, description}, ...]} or
+    {"template": {title, description}, "interns": [ids] | "all"}.
+    Raises ValueError with a message for a malformed body.
+    """
+    if "items" in data:
+        items = data.get("items")
+        if not isinstance(items, list):
+            raise ValueError("items must be a list")
+        return [
+            {
+                "intern": it.get("intern") if isinstance(it, dict) else None,
+                "title": ((it.get("title") if isinstance(it, dict) else "") or "").strip(),
+                "description": ((it.get("description") if isinstance(it, dict) else "") or "").strip(),
+            }
+            for it in items
+        ]
+
+    template = data.get("template")
+    if not isinstance(template, dict):
+        raise ValueError("items or template required")
+    interns = data.get("interns")
+    if interns == "all":
+        interns = list(
+            User.objects.filter(role="INTERN", supervisor=supervisor).order_by("id").values_list("id", flat=True)
+        )
+    elif not isinstance(interns, list):
+        raise ValueError('interns must be a list of ids or "all"')
+    else:
+        # one task per intern, however often it is listed
+        seen, unique = set(), []
+        for i in interns:
+            if str(i).strip() not in seen:
+                seen.add(str(i).strip())
+                unique.append(i)
+        interns = unique
+    title = (template.get("title") or "").strip()
+    description = (template.get("description") or "").strip()
+    return [{"intern": i, "title": title, "description": description} for i in interns]
+
+
+def _created_tasks(tasks, supervisor, since, batch):
+    """
+    bulk_create sets primary keys only on backends that can return them
+    (not MySQL); there, read this request's rows back by their batch marker,
+    in insertion order.
+    """
+    if all(t.pk for t in tasks):
+        return tasks
+    rows = list(Task.objects.filter(supervisor=supervisor, created_at__gte=since, batch=batch).order_by("id"))
+    for t, row in zip(tasks, rows):
+        # the serializer reads both names; keep the instances already loaded
+        row.intern, row.supervisor = t.intern, supervisor
+    return rows
+
+
+class SupervisorTaskBulkCreate(APIView):
+    """
+    Many tasks in one request: explicit items, or one template fanned out to
+    a list of interns (or "all" of the supervisor's interns). Ownership is
+    checked with one query; valid items are inserted with bulk_create and
+    logged in bulk. Invalid items are reported per index and skipped.
+    """
+    permission_classes = [IsSupervisor]
+
+    @transaction.atomic
+    def post(self, request):
+        try:
+            items = _bulk_task_items(request.data, request.user)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        if not items:
+            return Response({"detail": "no tasks to create"}, status=400)
+        limit = int(getattr(settings, "TASK_BULK_MAX_ITEMS", 500))
+        if len(items) > limit:
+            return Response({"detail": f"at most {limit} tasks per request"}, status=400)
+
+        ids = set()
+        for it in items:
+            try:
+                it["intern"] = int(it["intern"])
+                ids.add(it["intern"])
+            except (TypeError, ValueError):
+                it["intern"] = None
+        owned = User.objects.filter(id__in=ids, role="INTERN", supervisor=request.user).only(
+            "id", "email", "full_name").in_bulk()
+
+        results = [None] * len(items)
+        tasks, slots = [], []
+        batch = uuid.uuid4()
+        for idx, it in enumerate(items):
+            if not it["intern"] or not it["title"]:
+                results[idx] = {"index": idx, "status": 400, "detail": "intern and title required"}
+            elif it["intern"] not in owned:
+                results[idx] = {"index": idx, "status": 404, "detail": "Intern not found / not assigned to you"}
+            else:
+                tasks.append(Task(
+                    supervisor=request.user, intern=owned[it["intern"]], title=it["title"][:255],
+                    description=it["description"], status="IN_PROGRESS", batch=batch,
+                ))
+                slots.append(idx)
+
+        if tasks:
+            since = timezone.now()
+            tasks = _created_tasks(Task.objects.bulk_create(tasks, batch_size=500), request.user, since, batch)
+
+            # bulk_create skips the rollup / summary signal handlers
+            analytics.apply_delta(timezone.localdate(tasks[0].created_at),
+                                  Counter({"tasks_created": len(tasks), "tasks_in_progress": len(tasks)}))
+            summaries.apply_field_deltas("tasks_open", Counter(t.intern_id for t in tasks))
+            search.index_tasks(tasks)
+            bump(Task)
+            log_activities(request.user, [entry("TASK_CREATED", target=t, subject=owned[t.intern_id]) for t in tasks])
+
+            data = TaskSerializer(tasks, many=True).data
+            for idx, t, row in zip(slots, tasks, data):
+                results[idx] = {"index": idx, "status": 201, "task": row}
+                events.publish_event(events.TASK_ASSIGNED, row, users=[t.intern_id])
+
+        return Response({
+            "created": len(tasks),
+            "failed": len(items) - len(tasks),
+            "results": results,
+        }, status=201 if tasks else 400)
 
 
 class SupervisorTasks(APIView):
     permission_classes = [IsSupervisor]
 
+    @conditional_get(lambda request: [Task.objects.filter(supervisor=request.user), _roster_scope(request)])
+    def get(self, request):
+        qs = Task.objects.filter(supervisor=request.user).order_by("-created_at")
+        if wants_cursor_page(request):
+            try:
+                rows, next_cursor = cursor_page(TASK_ROWS.values(qs), request, key=TASK_ROWS.cursor_key)
+            except InvalidCursor as e:
+                return Response({"detail": str(e)}, status=400)
+            return Response({"results": TASK_ROWS.build(rows), "next_cursor": next_cursor})
+        return Response(TASK_ROWS.rows(qs))
+
+
+class SupervisorMonthlyProgress(APIView):
+    """?from=YYYY-MM&to=YYYY-MM : per-intern monthly task counts, ratings and reports."""
+    permission_classes = [IsSupervisor]
+
+    @conditional_get(lambda request: [
+        Task.objects.filter(supervisor=request.user),
+        TaskReport.objects.filter(task__supervisor=request.user),
+        _roster_scope(request),
+    ])
     def get(self, request):
-        qs = Task.objects.filter(supervisor=request.user).select_related("intern", "supervisor").order_by("-created_at")
-        return Response(TaskSerializer(qs, many=True).data)
+        try:
+            first, last = progress.month_range(request.query_params)
+        except ValueError:
+            return Response({"detail": "from and to must be YYYY-MM, at most PROGRESS_MAX_MONTHS apart"}, status=400)
+        return Response({
+            "from": f"{first:%Y-%m}",
+            "to": f"{last:%Y-%m}",
+            "interns": progress.monthly_progress(request.user, first, last),
+        })
 
 
 class SupervisorRateTask(APIView):
     permission_classes = [IsSupervisor]
 
+    @transaction.atomic
     def post(self, request, task_id):
         star_rating = request.data.get("star_rating")
         supervisor_feedback = (request.data.get("supervisor_feedback") or "").strip()
@@ -73,9 +286,12 @@ class SupervisorRateTask(APIView):
 
         task.star_rating = star_rating
         task.supervisor_feedback = supervisor_feedback
-        task.save(update_fields=["star_rating", "supervisor_feedback"])
+        task.save(update_fields=["star_rating", "supervisor_feedback", "updated_at"])
 
-        ActivityLog.objects.create(actor=request.user, action=f"Rated task {task.id} ({star_rating} stars)")
+        log_activity(request.user, "TASK_RATED", target=task, subject=task.intern_id, stars=star_rating)
+        events.publish_event(events.TASK_RATED, {
+            "id": task.id, "star_rating": star_rating, "supervisor_feedback": supervisor_feedback,
+        }, users=[task.intern_id, task.supervisor_id])
         return Response({"detail": "Saved"})
 
 
@@ -83,56 +299,44 @@ class SupervisorAttendanceView(APIView):
     permission_classes = [IsSupervisor]
 
     def get(self, request):
-        qs = Attendance.objects.select_related("intern").filter(intern__supervisor=request.user).order_by("-created_at")[:300]
-        return Response([{
-            "id": a.id,
-            "intern": a.intern.full_name,
-            "email": a.intern.email,
-            "in_office": a.in_office,
-            "location_validated": a.location_validated,
-            "distance_m": a.office_distance_m,
-            "created_at": a.created_at.isoformat(),
-        } for a in qs])
+        # ?from=&to= : one row per intern per day from AttendanceDay
+        try:
+            rng = day_range(request.query_params)
+        except ValueError:
+            return Response({"detail": "from and to must be YYYY-MM-DD, at most ATTENDANCE_RANGE_MAX_DAYS apart"}, status=400)
+        if rng:
+            days = (
+                AttendanceDay.objects.select_related("intern")
+                .filter(intern__supervisor=request.user, day__gte=rng[0], day__lte=rng[1])
+                .order_by("-day", "intern__full_name")
+            )
+            return Response(day_rows(days))
+
+        qs = Attendance.objects.filter(intern__supervisor=request.user).order_by("-created_at")[:300]
+        return Response(ATTENDANCE_ROWS.rows(qs))
 
 
 class SupervisorReportsView(APIView):
     permission_classes = [IsSupervisor]
 
     def get(self, request):
-        qs = (
-            TaskReport.objects
-            .select_related("task", "intern")
-            .filter(task__supervisor=request.user)
-            .order_by("-created_at")[:300]
-        )
-        return Response([{
-            "id": r.id,
-            "task_id": r.task.id,
-            "task_title": r.task.title,
-            "intern": r.intern.email,
-            "content": r.content,
-            "created_at": r.created_at.isoformat(),
-        } for r in qs])
+        qs = TaskReport.objects.filter(task__supervisor=request.user).order_by("-created_at")[:300]
+        return Response(REPORT_ROWS.rows(qs))
 
 
 class SupervisorComplaintList(APIView):
     permission_classes = [IsSupervisor]
 
+    @conditional_get(lambda request: [Complaint.objects.filter(supervisor=request.user), _roster_scope(request)])
     def get(self, request):
-        qs = Complaint.objects.select_related("intern").filter(supervisor=request.user).order_by("-created_at")[:200]
-        return Response([{
-            "id": c.id,
-            "intern": c.intern.email,
-            "subject": c.subject,
-            "message": c.message,
-            "status": c.status,
-            "created_at": c.created_at.isoformat(),
-        } for c in qs])
+        qs = Complaint.objects.filter(supervisor=request.user).order_by("-created_at")[:200]
+        return Response(SUPERVISOR_COMPLAINT_ROWS.rows(qs))
 
 
 class SupervisorComplaintUpdateStatus(APIView):
     permission_classes = [IsSupervisor]
 
+    @transaction.atomic
     def post(self, request, complaint_id):
         status_val = (request.data.get("status") or "").strip()
         if status_val not in ["OPEN", "IN_REVIEW", "RESOLVED"]:
@@ -144,7 +348,8 @@ class SupervisorComplaintUpdateStatus(APIView):
             return Response({"detail": "Complaint not found"}, status=404)
 
         c.status = status_val
-        c.save(update_fields=["status"])
+        c.save(update_fields=["status", "updated_at"])
 
-        ActivityLog.objects.create(actor=request.user, action=f"Updated complaint {c.id} -> {status_val}")
+        log_activity(request.user, "COMPLAINT_STATUS", target=c, subject=c.intern_id, status=status_val)
+        events.publish_event(events.COMPLAINT_STATUS, {"id": c.id, "status": status_val}, users=[c.intern_id, c.supervisor_id])
         return Response({"detail": "Updated"})